@@ -0,0 +1,7 @@
+"""
+Title: Benchmarks Package Init
+Team: Purple Turtles — Gwen Li, Aadya Agarwal, Emma Peng, Noah Hicks
+Date: 2026-10-18
+Summary: Standalone micro-benchmarks; run modules with ``python -m benchmarks.<name>``.
+Disclaimer: This file includes AI-assisted content (GPT-5); reviewed and approved by the Purple Turtles team.
+"""
@@ -0,0 +1,65 @@
+"""
+Title: Scraper Parse Benchmark
+Team: Purple Turtles — Gwen Li, Aadya Agarwal, Emma Peng, Noah Hicks
+Date: 2026-10-18
+Summary: Times the single-pass lxml VisitPittsburgh parser against the BeautifulSoup reference
+        on the saved HTML fixture (and an enlarged copy) and checks both return the same events.
+Disclaimer: This file includes AI-assisted content (GPT-5); reviewed and approved by the Purple Turtles team.
+
+Run: python -m benchmarks.bench_scraper_parse [--repeat 50] [--scale 40]
+"""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+import statistics
+import time
+from typing import Callable, List
+
+from src.services.visitpgh_scraper import parse_events_html, parse_events_html_bs4
+
+
+FIXTURE = Path(__file__).resolve().parent.parent / "tests" / "fixtures" / "visitpgh_this_week.html"
+
+
+def enlarged_page(html: str, scale: int) -> str:
+    """Repeat the fixture's event list ``scale`` times (unique titles) to mimic the live page."""
+    start = html.index('<section class="event-list">')
+    end = html.index("</section>", start) + len("</section>")
+    section = html[start:end]
+    copies = [section.replace("</h3>", f" #{i}</h3>") for i in range(scale)]
+    return html[:start] + "\n".join(copies) + html[end:]
+
+
+def time_parser(parse: Callable[[str], list], html: str, repeat: int) -> List[float]:
+    parse(html)  # warm-up
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        parse(html)
+        samples.append(time.perf_counter() - t0)
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[4])
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--scale", type=int, default=40, help="event-list copies in the large page")
+    args = parser.parse_args()
+
+    base = FIXTURE.read_text(encoding="utf-8")
+    pages = {"fixture": base, f"fixture x{args.scale}": enlarged_page(base, args.scale)}
+    for label, html in pages.items():
+        events = parse_events_html(html)
+        assert events == parse_events_html_bs4(html), f"parser mismatch on {label}"
+        fast = statistics.median(time_parser(parse_events_html, html, args.repeat))
+        ref = statistics.median(time_parser(parse_events_html_bs4, html, args.repeat))
+        print(
+            f"{label:<14} {len(html) / 1024:7.1f} KiB  events={len(events):2d}  "
+            f"lxml={fast * 1e3:7.2f} ms  bs4={ref * 1e3:7.2f} ms  speedup={ref / fast:4.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,266 @@
+"""
+Title: Offline Benchmark Suite
+Team: Purple Turtles — Gwen Li, Aadya Agarwal, Emma Peng, Noah Hicks
+Date: 2026-10-18
+Summary: Replays recorded upstream fixtures (and synthetic scale-ups) through candidate
+        collection, full option building, batch classification, scraper parsing and distance
+        computation; reports ops/sec and peak allocations and fails on baseline regressions.
+        Baseline refreshes keep a slower case's numbers unless the slowdown is accepted.
+Disclaimer: This file includes AI-assisted content (GPT-5); reviewed and approved by the Purple Turtles team.
+
+Run: python -m benchmarks.bench_suite [--only build_options] [--repeat 5] [--tolerance 0.3]
+     python -m benchmarks.bench_suite --update-baseline   # after an intended change
+     python -m benchmarks.bench_suite --update-baseline --accept-slower geo_prefilter_x5000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from benchmarks.bench_scraper_parse import enlarged_page
+from benchmarks.harness import (
+    CONFIRM_RUNS,
+    DEFAULT_TOLERANCE,
+    compare,
+    load_baseline,
+    measure,
+    relative,
+    save_baseline,
+)
+from benchmarks.replay import (
+    Replay,
+    bench_window,
+    replay_upstreams,
+    reset_caches,
+    synthetic_texts,
+    visitpgh_html,
+)
+from src.models.itinerary import ItineraryRequest, Preference
+from src.services import planner
+from src.services.classifier import classify_environment_batch
+from src.services.geo_index import GeoGridIndex
+from src.services.maps_client import distance_matrix_miles
+from src.services.visitpgh_scraper import parse_events_html
+
+
+CITY = "Pittsburgh, PA"
+ORIGIN = {"lat": 40.4442526, "lon": -79.9434272}  # the recorded geocode of the address below
+ADDRESS = "5000 Forbes Ave, Pittsburgh, PA 15213"
+MAX_DISTANCE_MILES = 10.0
+
+Runner = Tuple[Callable[[], Any], Optional[Callable[[], Any]]]
+
+
+class Case(NamedTuple):
+    name: str
+    scale: int  # fixture multiplier (24 Yelp businesses / 24 Ticketmaster events per copy)
+    repeat: int
+    build: Callable[[Replay], Runner]
+    env: Dict[str, str] = {}
+
+
+def _request() -> ItineraryRequest:
+    start, end = bench_window()
+    return ItineraryRequest(
+        city=CITY,
+        start_date=start,
+        end_date=end,
+        preferences=Preference(interests=["food", "music", "museums"]),
+        user_address=ADDRESS,
+        max_distance_miles=MAX_DISTANCE_MILES,
+    )
+
+
+def _destinations(n: int) -> List[Dict[str, float]]:
+    return [
+        {"lat": ORIGIN["lat"] + ((i * 37) % 200 - 100) / 1000.0,
+         "lon": ORIGIN["lon"] + ((i * 53) % 200 - 100) / 1000.0}
+        for i in range(n)
+    ]
+
+
+def _cold(replay: Replay) -> Callable[[], None]:
+    return lambda: reset_caches(replay.database_dir)
+
+
+def collect_cold(replay: Replay) -> Runner:
+    start, end = bench_window()
+    run = lambda: planner._collect_candidates(  # noqa: E731
+        CITY, start, end, ORIGIN, MAX_DISTANCE_MILES
+    )
+    return run, _cold(replay)
+
+
+def collect_warm(replay: Replay) -> Runner:
+    start, end = bench_window()
+    run = lambda: planner._collect_candidates(  # noqa: E731
+        CITY, start, end, ORIGIN, MAX_DISTANCE_MILES
+    )
+    return run, None  # caches and the event store fill on the warm-up call
+
+
+def build_cold(replay: Replay) -> Runner:
+    request = _request()
+    return (lambda: planner.build_itinerary_options(request)), _cold(replay)
+
+
+def build_warm(replay: Replay) -> Runner:
+    request = _request()
+    # Upstream caches stay hot; only the candidate snapshot is dropped between runs
+    return (lambda: planner.build_itinerary_options(request)), planner._SNAPSHOTS.clear
+
+
+def classify_batch(replay: Replay) -> Runner:
+    texts = synthetic_texts(5000)
+    return (lambda: asyncio.run(classify_environment_batch(texts))), None
+
+
+def scraper_parse(replay: Replay) -> Runner:
+    html = enlarged_page(visitpgh_html(), 40)
+    return (lambda: parse_events_html(html)), None
+
+
+def distance_haversine(replay: Replay) -> Runner:
+    destinations = _destinations(5000)
+    return (lambda: distance_matrix_miles([ORIGIN], destinations)), None
+
+
+def distance_google(replay: Replay) -> Runner:
+    destinations = _destinations(500)
+    return (lambda: distance_matrix_miles([ORIGIN], destinations)), None
+
+
+def geo_prefilter(replay: Replay) -> Runner:
+    points = _destinations(5000)
+
+    def run() -> int:
+        index: GeoGridIndex[int] = GeoGridIndex()
+        index.extend((p, i) for i, p in enumerate(points))
+        return len(index.query_radius(ORIGIN, 5.0))
+
+    return run, None
+
+
+CASES: List[Case] = [
+    Case("collect_candidates_cold_x1", 1, 10, collect_cold),
+    Case("collect_candidates_cold_x40", 40, 5, collect_cold),
+    Case("collect_candidates_warm_x40", 40, 10, collect_warm),
+    Case("build_options_cold_x1", 1, 10, build_cold),
+    Case("build_options_cold_x40", 40, 5, build_cold),
+    Case("build_options_warm_x40", 40, 10, build_warm),
+    Case("classify_batch_x5000", 1, 5, classify_batch),
+    Case("scraper_parse_x40", 1, 10, scraper_parse),
+    Case("distance_haversine_x5000", 1, 10, distance_haversine, {"MAPS_PROVIDER": "none"}),
+    Case("distance_google_replay_x500", 1, 10, distance_google),
+    Case("geo_prefilter_x5000", 1, 10, geo_prefilter),
+]
+
+
+def run_cases(cases: List[Case], repeat: Optional[int] = None) -> Dict[str, Dict[str, float]]:
+    results: Dict[str, Dict[str, float]] = {}
+    for case in cases:
+        with replay_upstreams(case.scale, **case.env) as replay:
+            fn, setup = case.build(replay)
+            results[case.name] = measure(fn, repeat=repeat or case.repeat, setup=setup)
+    return results
+
+
+def confirm(
+    cases: List[Case],
+    results: Dict[str, Dict[str, float]],
+    baseline: Dict[str, Any],
+    tolerance: float,
+    repeat: Optional[int] = None,
+) -> List[str]:
+    """Re-measure flagged cases up to CONFIRM_RUNS times, keeping each case's fastest
+    measurement; only regressions that reproduce on every run are returned."""
+    problems = compare(results, baseline, tolerance)
+    for _ in range(CONFIRM_RUNS):
+        flagged = {p.split(":", 1)[0] for p in problems}
+        suspects = [c for c in cases if c.name in flagged]
+        if not suspects:
+            break
+        for name, again in run_cases(suspects, repeat).items():
+            if relative(again) > relative(results[name]):
+                results[name] = {**again, "peak_kib": min(again["peak_kib"],
+                                                          results[name]["peak_kib"])}
+        problems = compare(results, baseline, tolerance)
+    return problems
+
+
+def baseline_update(
+    results: Dict[str, Dict[str, float]],
+    baseline: Dict[str, Any],
+    problems: List[str],
+    accept: str = "",
+) -> Tuple[Dict[str, Dict[str, float]], List[str]]:
+    """New baseline contents and the cases held back from it.
+
+    A case with a confirmed regression keeps its recorded numbers unless ``accept``
+    (comma-separated case names, or ``all``) acknowledges the slowdown; cases not run
+    this time keep theirs too.
+    """
+    accepted = {name.strip() for name in accept.split(",") if name.strip()}
+    regressed = {p.split(":", 1)[0] for p in problems}
+    held = [] if "all" in accepted else sorted(regressed - accepted)
+    merged = {name: dict(entry) for name, entry in baseline.items()}
+    merged.update({name: r for name, r in results.items() if name not in held})
+    return merged, held
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Offline benchmark suite (recorded fixtures)")
+    parser.add_argument("--only", default="", help="run cases whose name contains this text")
+    parser.add_argument("--repeat", type=int, default=None, help="override per-case repeats")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument(
+        "--accept-slower",
+        default="",
+        help="with --update-baseline: comma-separated cases (or 'all') allowed to get slower",
+    )
+    args = parser.parse_args(argv)
+
+    cases = [c for c in CASES if args.only in c.name]
+    results = run_cases(cases, args.repeat)
+    baseline = load_baseline()
+    problems = confirm(cases, results, baseline, args.tolerance, args.repeat)
+
+    print(
+        f"{'case':<30} {'ops/s':>10} {'median ms':>10} {'p90 ms':>9} {'peak KiB':>9} "
+        f"{'vs base':>8}"
+    )
+    for name, r in results.items():
+        base = baseline.get(name)
+        versus = f"{relative(r) / base['relative']:7.0%}" if base else "    new"
+        print(
+            f"{name:<30} {r['ops_per_sec']:10.1f} {r['median_ms']:10.2f} {r['p90_ms']:9.2f} "
+            f"{r['peak_kib']:9.0f} {versus:>8}"
+        )
+
+    if args.update_baseline:
+        merged, held = baseline_update(results, baseline, problems, args.accept_slower)
+        save_baseline(merged)
+        print(f"baseline updated ({len(results) - len(held)} case(s))")
+        if held:
+            # A refresh must never quietly lower the bar; slowdowns are acknowledged by name
+            print("\nKEPT (confirmed slower; pass --accept-slower if intended)", file=sys.stderr)
+            for problem in problems:
+                if problem.split(":", 1)[0] in held:
+                    print(f"  {problem}", file=sys.stderr)
+            return 1
+        return 0
+
+    if problems:
+        print("\nREGRESSION", file=sys.stderr)
+        for problem in problems:
+            print(f"  {problem}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
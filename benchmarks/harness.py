@@ -0,0 +1,138 @@
+"""
+Title: Benchmark Harness
+Team: Purple Turtles — Gwen Li, Aadya Agarwal, Emma Peng, Noah Hicks
+Date: 2026-10-18
+Summary: Times a callable (median and best-run ops/sec over repeats, optional untimed setup
+        per run), measures its peak traced allocation, and compares results with a stored
+        baseline. Speeds are also kept relative to a fixed calibration loop run right before
+        every timed call (median of the per-run ratios), so a baseline recorded on one
+        machine (or a quieter moment) stays meaningful.
+Disclaimer: This file includes AI-assisted content (GPT-5); reviewed and approved by the Purple Turtles team.
+"""
+
+from __future__ import annotations
+
+import gc
+import json
+from pathlib import Path
+import statistics
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional
+
+
+BASELINE = Path(__file__).resolve().parent / "baseline.json"
+
+# Fail when a case runs this much slower (relative ops/sec) or allocates this much more
+DEFAULT_TOLERANCE = 0.30
+# A case flagged as slower is re-measured this many times; it fails only if every run agrees
+CONFIRM_RUNS = 2
+# Peak-allocation noise floor: growth below this many KiB never counts as a regression
+ALLOC_SLACK_KIB = 64.0
+
+
+def _calibration_loop() -> int:
+    total = 0
+    for i in range(200_000):
+        total += (i * 31) % 7
+    return total
+
+
+def measure(
+    fn: Callable[[], Any],
+    repeat: int = 10,
+    setup: Optional[Callable[[], Any]] = None,
+    warmup: int = 1,
+) -> Dict[str, float]:
+    """Wall time of ``fn`` (``setup`` runs untimed before every call) plus the peak memory
+    traced during one extra call.
+
+    Every timed call is paired with a run of the calibration loop right before it, so both
+    see the same machine state; ``relative`` (what the gate compares) is the median of
+    the per-pair speed ratios and ``calibration`` the loop's median ops/sec. ``ops_per_sec``
+    (fastest run, as with ``timeit``), median and p90 are reported alongside. The cyclic
+    GC is paused while timing.
+    """
+    for _ in range(warmup):
+        if setup is not None:
+            setup()
+        fn()
+    samples = []
+    loops = []
+    for _ in range(max(1, repeat)):
+        if setup is not None:
+            setup()
+        gc.collect()
+        gc.disable()
+        try:
+            t0 = time.perf_counter()
+            _calibration_loop()
+            t1 = time.perf_counter()
+            fn()
+            samples.append(time.perf_counter() - t1)
+            loops.append(t1 - t0)
+        finally:
+            gc.enable()
+
+    if setup is not None:
+        setup()
+    tracemalloc.start()
+    try:
+        fn()
+        _current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    median = statistics.median(samples)
+    return {
+        "ops_per_sec": round(1.0 / min(samples), 3),
+        "median_ms": round(median * 1000.0, 3),
+        "p90_ms": round(sorted(samples)[int(0.9 * (len(samples) - 1))] * 1000.0, 3),
+        "peak_kib": round(peak / 1024.0, 1),
+        "calibration": round(1.0 / statistics.median(loops), 3),
+        # Each run against its own calibration loop: drift between runs cancels out
+        "relative": round(statistics.median(c / t for c, t in zip(loops, samples)), 9),
+    }
+
+
+def load_baseline(path: Path = BASELINE) -> Dict[str, Any]:
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def relative(result: Dict[str, float]) -> float:
+    """Speed in units of the calibration loop: the median over timed runs of each run's
+    ops/sec divided by that of the calibration loop just before it."""
+    return result["relative"]
+
+
+def save_baseline(results: Dict[str, Dict[str, float]], path: Path = BASELINE) -> None:
+    payload = {name: dict(r) for name, r in results.items()}
+    path.write_text(json.dumps(dict(sorted(payload.items())), indent=2) + "\n", encoding="utf-8")
+
+
+def compare(
+    results: Dict[str, Dict[str, float]],
+    baseline: Dict[str, Any],
+    tolerance: float = DEFAULT_TOLERANCE,
+) -> List[str]:
+    """Regression messages for cases slower or hungrier than the baseline allows."""
+    problems: List[str] = []
+    for name, r in sorted(results.items()):
+        base = baseline.get(name)
+        if base is None:
+            continue
+        ratio = relative(r) / base["relative"]
+        if ratio < 1.0 - tolerance:
+            problems.append(
+                f"{name}: {ratio:.0%} of baseline speed "
+                f"({r['ops_per_sec']:.1f} ops/s; allowed down to {1.0 - tolerance:.0%})"
+            )
+        ceiling = base["peak_kib"] * (1.0 + tolerance) + ALLOC_SLACK_KIB
+        if r["peak_kib"] > ceiling:
+            problems.append(
+                f"{name}: peak allocation {r['peak_kib']:.0f} KiB exceeds "
+                f"{ceiling:.0f} KiB (baseline {base['peak_kib']:.0f} KiB)"
+            )
+    return problems
@@ -0,0 +1,295 @@
+"""
+Title: Recorded Upstream Replay
+Team: Purple Turtles — Gwen Li, Aadya Agarwal, Emma Peng, Noah Hicks
+Date: 2026-10-18
+Summary: Serves the recorded VisitPgh/Yelp/Ticketmaster/OpenWeather/Google fixtures in place of
+        the network (patched at httpx.Client.send, so every client's parsing code still runs),
+        with synthetic scale-ups to thousands of businesses/events and cold-cache resets.
+        Recorded dates are shifted by whole weeks onto the upcoming weekend so the event store
+        never treats them as expired.
+Disclaimer: This file includes AI-assisted content (GPT-5); reviewed and approved by the Purple Turtles team.
+"""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+import copy
+from datetime import date, datetime, time, timedelta, timezone
+from functools import lru_cache
+import json
+import math
+import os
+from pathlib import Path
+import tempfile
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple
+
+import httpx
+
+from src.core.config import get_settings
+
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+VISITPGH_FIXTURE = (
+    Path(__file__).resolve().parent.parent / "tests" / "fixtures" / "visitpgh_this_week.html"
+)
+
+# The fixtures were recorded for the weekend of Fri 2025-09-12
+RECORDED_FRIDAY = date(2025, 9, 12)
+
+# Keys only need to look configured; the replay never sends them anywhere
+_REPLAY_ENV = {
+    "YELP_API_KEY": "replay",
+    "TICKETMASTER_API_KEY": "replay",
+    "WEATHER_API_KEY": "replay",
+    "MAPS_API_KEY": "replay",
+    "MAPS_PROVIDER": "google",
+    "OPENAI_API_KEY": "changeme-openai-key",  # classification stays on local heuristics
+    "CRAWLER_ENABLED": "false",
+}
+
+
+@lru_cache(maxsize=None)
+def fixture(name: str) -> Any:
+    """Parsed JSON fixture (cached; callers must copy before mutating)."""
+    return json.loads((FIXTURES / name).read_text(encoding="utf-8"))
+
+
+@lru_cache(maxsize=None)
+def visitpgh_html() -> str:
+    return VISITPGH_FIXTURE.read_text(encoding="utf-8")
+
+
+def shift_days(today: Optional[date] = None) -> int:
+    """Whole weeks that move the recorded Friday onto the next Friday (today included)."""
+    today = today or date.today()
+    next_friday = today + timedelta(days=(4 - today.weekday()) % 7)
+    return (next_friday - RECORDED_FRIDAY).days
+
+
+def bench_window(today: Optional[date] = None) -> Tuple[datetime, datetime]:
+    """Saturday 09:00 -> Sunday 21:00 of the replayed weekend."""
+    saturday = RECORDED_FRIDAY + timedelta(days=shift_days(today) + 1)
+    return (
+        datetime.combine(saturday, time(9, 0)),
+        datetime.combine(saturday + timedelta(days=1), time(21, 0)),
+    )
+
+
+@lru_cache(maxsize=4)
+def forecast(days: int) -> Dict[str, Any]:
+    """The recorded OpenWeather feed moved forward by ``days``."""
+    raw = copy.deepcopy(fixture("openweather_forecast.json"))
+    for row in raw["list"]:
+        row["dt"] += days * 86400
+        at = datetime.fromtimestamp(row["dt"], timezone.utc)
+        row["dt_txt"] = at.strftime("%Y-%m-%d %H:%M:%S")
+    return raw
+
+
+def _shift_event(event: Dict[str, Any], days: int) -> None:
+    start = event["dates"]["start"]
+    local = datetime.fromisoformat(f"{start['localDate']}T{start['localTime']}")
+    local += timedelta(days=days)
+    start["localDate"] = local.strftime("%Y-%m-%d")
+    start["localTime"] = local.strftime("%H:%M:%S")
+    utc = datetime.strptime(start["dateTime"], "%Y-%m-%dT%H:%M:%SZ") + timedelta(days=days)
+    start["dateTime"] = utc.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _jitter(i: int, span: float) -> float:
+    # Deterministic spread in [-span, span] so scaled runs are repeatable
+    return ((i * 2654435761) % 1000 / 999.0 * 2.0 - 1.0) * span
+
+
+@lru_cache(maxsize=16)
+def scaled_businesses(scale: int) -> Tuple[Dict[str, Any], ...]:
+    """The recorded Yelp businesses repeated ``scale`` times with unique ids and spread-out
+    coordinates."""
+    base = fixture("yelp_businesses_search.json")["businesses"]
+    out = []
+    for copy_no in range(max(1, scale)):
+        for b in base:
+            item = copy.deepcopy(b)
+            if copy_no:
+                i = len(out)
+                item["id"] = f"{b['id']}-{copy_no}"
+                item["name"] = f"{b['name']} #{copy_no}"
+                item["coordinates"] = {
+                    "latitude": b["coordinates"]["latitude"] + _jitter(i, 0.06),
+                    "longitude": b["coordinates"]["longitude"] + _jitter(i + 7, 0.08),
+                }
+            out.append(item)
+    return tuple(out)
+
+
+@lru_cache(maxsize=16)
+def scaled_events(scale: int, days: int = 0) -> Tuple[Dict[str, Any], ...]:
+    """The recorded Ticketmaster events repeated ``scale`` times (unique ids, shifted venues),
+    moved forward by ``days``."""
+    base = fixture("ticketmaster_events.json")["_embedded"]["events"]
+    out = []
+    for copy_no in range(max(1, scale)):
+        for e in base:
+            item = copy.deepcopy(e)
+            _shift_event(item, days)
+            if copy_no:
+                i = len(out)
+                item["id"] = f"{e['id']}-{copy_no}"
+                item["name"] = f"{e['name']} #{copy_no}"
+                loc = item["_embedded"]["venues"][0]["location"]
+                loc["latitude"] = str(float(loc["latitude"]) + _jitter(i, 0.05))
+                loc["longitude"] = str(float(loc["longitude"]) + _jitter(i + 3, 0.07))
+            out.append(item)
+    return tuple(out)
+
+
+def _haversine_m(a: str, b: str) -> float:
+    lat1, lon1 = (float(x) for x in a.split(","))
+    lat2, lon2 = (float(x) for x in b.split(","))
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    dp, dl = p2 - p1, math.radians(lon2 - lon1)
+    h = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+    return 2 * 6371000.0 * math.asin(math.sqrt(h))
+
+
+def distance_matrix_body(params: Mapping[str, str]) -> Dict[str, Any]:
+    origins = params.get("origins", "").split("|")
+    destinations = params.get("destinations", "").split("|")
+    rows = []
+    for o in origins:
+        elements = []
+        for d in destinations:
+            meters = _haversine_m(o, d) * 1.3  # road distance runs ~30% over straight line
+            elements.append(
+                {
+                    "distance": {"text": f"{meters / 1609.344:.1f} mi", "value": int(meters)},
+                    "duration": {"text": "", "value": int(meters / 11.0)},  # ~25 mph
+                    "status": "OK",
+                }
+            )
+        rows.append({"elements": elements})
+    return {"rows": rows, "status": "OK"}
+
+
+def yelp_search_body(params: Mapping[str, str], scale: int) -> Dict[str, Any]:
+    businesses = scaled_businesses(scale)
+    offset = int(params.get("offset", 0) or 0)
+    limit = int(params.get("limit", 20) or 20)
+    return {"businesses": list(businesses[offset:offset + limit]), "total": len(businesses)}
+
+
+def ticketmaster_page_body(params: Mapping[str, str], scale: int, days: int) -> Dict[str, Any]:
+    events = scaled_events(scale, days)
+    size = int(params.get("size", 20) or 20)
+    page = int(params.get("page", 0) or 0)
+    chunk = list(events[page * size:(page + 1) * size])
+    total_pages = max(1, math.ceil(len(events) / size))
+    return {
+        "_embedded": {"events": chunk},
+        "page": {"size": size, "totalElements": len(events), "totalPages": total_pages,
+                 "number": page},
+    }
+
+
+class Replay:
+    """Routes requests to fixtures; ``calls`` counts requests per upstream host."""
+
+    def __init__(self, scale: int = 1, today: Optional[date] = None) -> None:
+        self.scale = scale
+        self.days = shift_days(today)
+        self.calls: Dict[str, int] = {}
+        self.database_dir: Optional[str] = None  # fresh event-store files go here
+
+    def respond(self, request: httpx.Request) -> httpx.Response:
+        url = request.url
+        self.calls[url.host] = self.calls.get(url.host, 0) + 1
+        params = url.params
+        if url.host == "maps.googleapis.com" and url.path.endswith("/geocode/json"):
+            return httpx.Response(200, json=fixture("google_geocode.json"), request=request)
+        if url.host == "maps.googleapis.com" and url.path.endswith("/distancematrix/json"):
+            return httpx.Response(200, json=distance_matrix_body(params), request=request)
+        if url.host == "api.yelp.com":
+            return httpx.Response(200, json=yelp_search_body(params, self.scale), request=request)
+        if url.host == "app.ticketmaster.com":
+            body = ticketmaster_page_body(params, self.scale, self.days)
+            return httpx.Response(200, json=body, request=request)
+        if url.host == "api.openweathermap.org":
+            return httpx.Response(200, json=forecast(self.days), request=request)
+        if url.host.endswith("visitpittsburgh.com"):
+            return httpx.Response(
+                200,
+                text=visitpgh_html(),
+                headers={"Content-Type": "text/html; charset=utf-8"},
+                request=request,
+            )
+        return httpx.Response(404, text="no recorded fixture", request=request)
+
+
+def reset_caches(database_dir: Optional[str] = None) -> None:
+    """Drop every process cache (and point the event store at a fresh file) for cold runs."""
+    from src.api.response_cache import clear_response_cache
+    from src.services import maps_client, planner
+    from src.services.event_store import reset_event_store
+    from src.services.visitpgh_scraper import reset_page_state
+    from src.services.weather_client import clear_forecast_cache
+    from src.services.yelp_client import clear_food_cache
+
+    clear_forecast_cache()
+    clear_food_cache()
+    reset_page_state()
+    clear_response_cache()
+    maps_client._GEOCODE_CACHE.clear()
+    planner._SNAPSHOTS.clear()
+    reset_event_store()
+    if database_dir is not None:
+        fd, path = tempfile.mkstemp(suffix=".sqlite3", dir=database_dir)
+        os.close(fd)
+        os.environ["DATABASE_URL"] = f"sqlite:///{path}"
+        get_settings.cache_clear()
+
+
+@contextmanager
+def replay_upstreams(scale: int = 1, **env: str) -> Iterator[Replay]:
+    """Serve recorded fixtures for every httpx.Client request; extra ``env`` overrides
+    settings (e.g. ``MAPS_PROVIDER="none"`` for the haversine path)."""
+    replay = Replay(scale)
+    overrides = {**_REPLAY_ENV, **env}
+    saved = {k: os.environ.get(k) for k in list(overrides) + ["DATABASE_URL"]}
+    original_send = httpx.Client.send
+
+    def send(self: httpx.Client, request: httpx.Request, **kwargs: Any) -> httpx.Response:
+        return replay.respond(request)
+
+    with tempfile.TemporaryDirectory(prefix="weekender-bench-") as tmp:
+        os.environ.update(overrides)
+        httpx.Client.send = send  # type: ignore[method-assign]
+        try:
+            reset_caches(tmp)
+            replay.database_dir = tmp
+            yield replay
+        finally:
+            httpx.Client.send = original_send  # type: ignore[method-assign]
+            reset_caches()
+            for k, v in saved.items():
+                if v is None:
+                    os.environ.pop(k, None)
+                else:
+                    os.environ[k] = v
+            get_settings.cache_clear()
+
+
+def synthetic_texts(n: int) -> List[str]:
+    """``n`` event/venue descriptions drawn from the fixtures for classifier batches."""
+    events = scaled_events(max(1, math.ceil(n / 24)))
+    businesses = scaled_businesses(max(1, math.ceil(n / 24)))
+    texts = []
+    for i in range(n):
+        if i % 2:
+            e = events[i % len(events)]
+            venue = e["_embedded"]["venues"][0]["name"]
+            texts.append(f"{e['name']} at {venue}. {e.get('info', '')}")
+        else:
+            b = businesses[i % len(businesses)]
+            cats = ", ".join(c["title"] for c in b["categories"])
+            texts.append(f"{b['name']} ({cats})")
+    return texts
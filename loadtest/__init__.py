@@ -0,0 +1,7 @@
+"""
+Title: Load Test Package Init
+Team: Purple Turtles — Gwen Li, Aadya Agarwal, Emma Peng, Noah Hicks
+Date: 2026-10-18
+Summary: Local upstream stand-ins and load tooling; run modules with ``python -m loadtest.<name>``.
+Disclaimer: This file includes AI-assisted content (GPT-5); reviewed and approved by the Purple Turtles team.
+"""
@@ -0,0 +1,331 @@
+"""
+Title: Load Test Driver
+Team: Purple Turtles — Gwen Li, Aadya Agarwal, Emma Peng, Noah Hicks
+Date: 2026-10-18
+Summary: Closed-loop load generator for /api/itinerary, /api/itinerary/options, /api/plan and
+        /api/weather with a seeded mix of request shapes (default weekend, random addresses,
+        varied preferences). Steps through increasing concurrency and reports RPS, p50/p95/p99
+        latency and error rates per step, plus the concurrency where throughput stops scaling.
+        By default it runs the API and the mock upstreams in-process.
+Disclaimer: This file includes AI-assisted content (GPT-5); reviewed and approved by the Purple Turtles team.
+
+Run: python -m loadtest.driver --levels 1,2,4,8,16 --duration 10
+     python -m loadtest.driver --api-url http://127.0.0.1:8000   # an already running API
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from contextlib import contextmanager
+from datetime import date, timedelta
+import json
+import logging
+import math
+import os
+import random
+import tempfile
+import time
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import httpx
+
+from loadtest.mock_upstream import (
+    DEFAULT_LATENCY,
+    build_profile,
+    create_app,
+    serve_in_thread,
+    upstream_env,
+)
+
+
+ADDRESSES = (
+    "Hamburg Hall, 4800 Forbes Ave, Pittsburgh, PA 15213",
+    "5000 Forbes Ave, Pittsburgh, PA 15213",
+    "100 Art Museum Dr, Pittsburgh, PA 15212",
+    "1001 Liberty Ave, Pittsburgh, PA 15222",
+    "3400 Butler St, Pittsburgh, PA 15201",
+    "1212 E Carson St, Pittsburgh, PA 15203",
+    "5800 Walnut St, Pittsburgh, PA 15232",
+    "4400 Forbes Ave, Pittsburgh, PA 15213",
+    "1 PPG Pl, Pittsburgh, PA 15222",
+    "7101 Hamilton Ave, Pittsburgh, PA 15208",
+)
+INTERESTS = ("food", "museums", "art", "music", "sports", "outdoors", "theater", "family")
+BUDGETS = ("low", "medium", "high")
+MOBILITY = ("walk", "transit", "drive")
+ENVIRONMENTS = ("either", "indoor", "outdoor")
+
+# (shape, weight): most traffic plans weekends; the dashboard polls weather
+DEFAULT_MIX: Tuple[Tuple[str, float], ...] = (
+    ("itinerary_default", 0.25),
+    ("itinerary_custom", 0.15),
+    ("options", 0.30),
+    ("plan", 0.15),
+    ("weather", 0.15),
+)
+
+# A step counts as scaling while it adds at least this much throughput over the last one
+KNEE_MIN_GAIN = 0.10
+
+Shape = Dict[str, Any]  # {kind, method, path, params, json}
+
+
+def _next_saturday(today: Optional[date] = None) -> date:
+    today = today or date.today()
+    return today + timedelta(days=(5 - today.weekday()) % 7 or 7)
+
+
+def _preferences(rnd: random.Random) -> Dict[str, Any]:
+    return {
+        "budget_level": rnd.choice(BUDGETS),
+        "interests": rnd.sample(INTERESTS, rnd.randint(1, 4)),
+        "mobility": rnd.choice(MOBILITY),
+        "environment": rnd.choice(ENVIRONMENTS),
+    }
+
+
+def make_request(rnd: random.Random, kind: str) -> Shape:
+    """One request of ``kind`` with randomized (seeded) parameters."""
+    saturday = _next_saturday()
+    if kind == "itinerary_default":
+        return {"kind": kind, "method": "POST", "path": "/api/itinerary", "json": {}}
+    if kind in ("itinerary_custom", "options"):
+        body: Dict[str, Any] = {
+            "city": "Pittsburgh, PA",
+            "start_date": f"{saturday.isoformat()}T{rnd.choice(('08', '09', '10'))}:00:00",
+            "end_date": f"{(saturday + timedelta(days=1)).isoformat()}T21:00:00",
+            "preferences": _preferences(rnd),
+            "user_address": rnd.choice(ADDRESSES),
+            "max_distance_miles": rnd.choice((2, 5, 10)),
+        }
+        path = "/api/itinerary" if kind == "itinerary_custom" else "/api/itinerary/options"
+        return {"kind": kind, "method": "POST", "path": path, "json": body}
+    if kind == "plan":
+        params = {
+            "start_date": saturday.isoformat(),
+            "address": rnd.choice(ADDRESSES),
+            "days": rnd.choice((1, 2)),
+        }
+        return {"kind": kind, "method": "GET", "path": "/api/plan", "params": params}
+    if kind == "weather":
+        return {"kind": kind, "method": "GET", "path": "/api/weather"}
+    raise ValueError(f"unknown request kind {kind!r}")
+
+
+def choose_kind(rnd: random.Random, mix: Sequence[Tuple[str, float]] = DEFAULT_MIX) -> str:
+    kinds, weights = zip(*mix)
+    return rnd.choices(kinds, weights=weights)[0]
+
+
+def percentile(sorted_values: Sequence[float], q: float) -> float:
+    """Nearest-rank percentile (q in 0..100) of already sorted values."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(q / 100.0 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize(
+    samples: List[Tuple[str, int, float]], concurrency: int, elapsed: float
+) -> Dict[str, Any]:
+    """Step summary from (kind, status, seconds) samples; status 0 = transport error."""
+    latencies = sorted(s[2] for s in samples)
+    errors = sum(1 for _kind, status, _s in samples if status == 0 or status >= 400)
+    shed = sum(1 for _kind, status, _s in samples if status == 503)  # admission control
+    by_kind: Dict[str, Dict[str, Any]] = {}
+    for kind, status, seconds in samples:
+        row = by_kind.setdefault(kind, {"requests": 0, "errors": 0, "latencies": []})
+        row["requests"] += 1
+        row["errors"] += int(status == 0 or status >= 400)
+        row["latencies"].append(seconds)
+    for row in by_kind.values():
+        lat = sorted(row.pop("latencies"))
+        row["p95_ms"] = round(percentile(lat, 95) * 1000.0, 1)
+    return {
+        "concurrency": concurrency,
+        "requests": len(samples),
+        "rps": round(len(samples) / elapsed, 2) if elapsed > 0 else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000.0, 1),
+        "p95_ms": round(percentile(latencies, 95) * 1000.0, 1),
+        "p99_ms": round(percentile(latencies, 99) * 1000.0, 1),
+        "error_rate": round(errors / len(samples), 4) if samples else 0.0,
+        "shed_rate": round(shed / len(samples), 4) if samples else 0.0,
+        "by_kind": by_kind,
+    }
+
+
+def find_knee(steps: Sequence[Dict[str, Any]]) -> Optional[int]:
+    """Concurrency of the last step before throughput stopped growing by KNEE_MIN_GAIN."""
+    for prev, step in zip(steps, steps[1:]):
+        if step["rps"] < prev["rps"] * (1.0 + KNEE_MIN_GAIN):
+            return prev["concurrency"]
+    return None
+
+
+async def run_step(
+    base_url: str,
+    concurrency: int,
+    duration: float,
+    seed: int,
+    mix: Sequence[Tuple[str, float]] = DEFAULT_MIX,
+    timeout: float = 30.0,
+) -> Dict[str, Any]:
+    """``concurrency`` closed-loop workers sending requests for ``duration`` seconds."""
+    samples: List[Tuple[str, int, float]] = []
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout, limits=limits) as client:
+        deadline = time.perf_counter() + duration
+
+        async def worker(worker_id: int) -> None:
+            rnd = random.Random(seed * 1000 + worker_id)
+            while time.perf_counter() < deadline:
+                shape = make_request(rnd, choose_kind(rnd, mix))
+                t0 = time.perf_counter()
+                try:
+                    resp = await client.request(
+                        shape["method"], shape["path"],
+                        params=shape.get("params"), json=shape.get("json"),
+                    )
+                    status = resp.status_code
+                except httpx.HTTPError:
+                    status = 0
+                samples.append((shape["kind"], status, time.perf_counter() - t0))
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(i) for i in range(concurrency)))
+        elapsed = time.perf_counter() - started
+    return summarize(samples, concurrency, elapsed)
+
+
+def run_ladder(
+    base_url: str,
+    levels: Sequence[int],
+    duration: float,
+    seed: int = 1,
+    mix: Sequence[Tuple[str, float]] = DEFAULT_MIX,
+    warmup: float = 0.0,
+) -> List[Dict[str, Any]]:
+    """One step per concurrency level; an unreported ``warmup`` step fills cold caches first."""
+    if warmup > 0:
+        asyncio.run(run_step(base_url, 1, warmup, seed - 1, mix))
+    return [
+        asyncio.run(run_step(base_url, level, duration, seed + i, mix))
+        for i, level in enumerate(levels)
+    ]
+
+
+def format_report(steps: Sequence[Dict[str, Any]]) -> str:
+    lines = [
+        f"{'conc':>5} {'reqs':>7} {'rps':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+        f"{'errors':>7} {'shed':>7}"
+    ]
+    for s in steps:
+        lines.append(
+            f"{s['concurrency']:>5} {s['requests']:>7} {s['rps']:>8.1f} {s['p50_ms']:>8.1f} "
+            f"{s['p95_ms']:>8.1f} {s['p99_ms']:>8.1f} {s['error_rate']:>7.1%} "
+            f"{s['shed_rate']:>7.1%}"
+        )
+    knee = find_knee(steps)
+    lines.append(
+        f"knee: throughput stops scaling after concurrency {knee}"
+        if knee is not None
+        else "knee: not reached (throughput still scaling at the top level)"
+    )
+    return "\n".join(lines)
+
+
+@contextmanager
+def _patched_env(values: Dict[str, str]) -> Iterator[None]:
+    from src.core.config import get_settings
+
+    saved = {k: os.environ.get(k) for k in values}
+    os.environ.update(values)
+    get_settings.cache_clear()
+    try:
+        yield
+    finally:
+        for k, v in saved.items():
+            if v is None:
+                os.environ.pop(k, None)
+            else:
+                os.environ[k] = v
+        get_settings.cache_clear()
+
+
+@contextmanager
+def local_stack(
+    latency: str = DEFAULT_LATENCY,
+    errors: str = "",
+    throttle: str = "",
+    scale: int = 1,
+    seed: Optional[int] = 1,
+) -> Iterator[str]:
+    """Mock upstreams plus a fresh API app (own event store file), both on local ports;
+    yields the API base URL."""
+    profile = build_profile(latency, errors, throttle)
+    with serve_in_thread(create_app(profile, scale, seed)) as upstream_url:
+        with tempfile.TemporaryDirectory(prefix="weekender-load-") as tmp:
+            env = {
+                **upstream_env(upstream_url),
+                "DATABASE_URL": f"sqlite:///{os.path.join(tmp, 'events.sqlite3')}",
+                "CRAWLER_ENABLED": "false",
+                "LOG_LEVEL": "WARNING",
+            }
+            with _patched_env(env):
+                from src.main import create_app as create_api
+                from src.services.event_store import reset_event_store
+
+                reset_event_store()
+                try:
+                    with serve_in_thread(create_api()) as api_url:
+                        yield api_url
+                finally:
+                    reset_event_store()
+
+
+def _parse_mix(spec: str) -> Tuple[Tuple[str, float], ...]:
+    if not spec:
+        return DEFAULT_MIX
+    pairs = []
+    for part in spec.split(","):
+        kind, _, weight = part.partition("=")
+        pairs.append((kind.strip(), float(weight)))
+    return tuple(pairs)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load-test the itinerary API")
+    parser.add_argument("--api-url", default="", help="target a running API instead")
+    parser.add_argument("--levels", default="1,2,4,8,16", help="concurrency steps")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per step")
+    parser.add_argument("--warmup", type=float, default=3.0, help="unreported seconds first")
+    parser.add_argument("--mix", default="", help='e.g. "options=0.5,weather=0.5"')
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--latency", default=DEFAULT_LATENCY, help="mock upstream latency spec")
+    parser.add_argument("--errors", default="", help="mock upstream 503 rates")
+    parser.add_argument("--throttle", default="", help="mock upstream 429 rates")
+    parser.add_argument("--scale", type=int, default=1, help="mock fixture copies")
+    parser.add_argument("--json", default="", help="also write the steps to this file")
+    args = parser.parse_args()
+
+    # Per-request client debug logs would swamp the report (and slow the run)
+    for name in ("httpx", "httpcore", "openai"):
+        logging.getLogger(name).setLevel(logging.WARNING)
+    levels = [int(x) for x in args.levels.split(",") if x.strip()]
+    mix = _parse_mix(args.mix)
+    if args.api_url:
+        steps = run_ladder(
+            args.api_url, levels, args.duration, args.seed, mix, args.warmup
+        )
+    else:
+        with local_stack(args.latency, args.errors, args.throttle, args.scale, args.seed) as url:
+            steps = run_ladder(url, levels, args.duration, args.seed, mix, args.warmup)
+    print(format_report(steps))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as fh:
+            json.dump({"steps": steps, "knee": find_knee(steps)}, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
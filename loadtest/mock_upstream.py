@@ -0,0 +1,270 @@
+"""
+Title: Mock Upstream Server
+Team: Purple Turtles — Gwen Li, Aadya Agarwal, Emma Peng, Noah Hicks
+Date: 2026-10-18
+Summary: A small ASGI app standing in for Yelp, Ticketmaster, Google Maps, OpenWeather, an
+        OpenAI-compatible chat endpoint and VisitPittsburgh, served from the benchmark fixtures.
+        Each upstream gets its own latency distribution, 5xx error rate and 429 rate so load
+        tests see realistic slowness and failures without spending API quota.
+Disclaimer: This file includes AI-assisted content (GPT-5); reviewed and approved by the Purple Turtles team.
+
+Run: python -m loadtest.mock_upstream --port 9100 --latency "*=lognormal:80:0.5" \
+         --errors "ticketmaster=0.02" --throttle "yelp=0.05"
+     then export the printed variables before starting the API.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from contextlib import contextmanager
+import copy
+import hashlib
+import math
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+from fastapi import FastAPI, Request
+from fastapi.responses import HTMLResponse, JSONResponse, Response
+
+from benchmarks.replay import (
+    distance_matrix_body,
+    fixture,
+    forecast,
+    shift_days,
+    ticketmaster_page_body,
+    visitpgh_html,
+    yelp_search_body,
+)
+from src.services.classifier import classify_environment_heuristic
+
+
+UPSTREAMS = ("yelp", "ticketmaster", "google", "openweather", "openai", "visitpgh")
+
+# Defaults roughly match what the real services showed from a campus network (ms)
+DEFAULT_LATENCY = "*=lognormal:60:0.4,yelp=lognormal:180:0.5,ticketmaster=lognormal:250:0.5"
+
+Sampler = Callable[[random.Random], float]
+
+
+def parse_latency(spec: str) -> Sampler:
+    """``fixed:MS``, ``uniform:LO:HI``, ``normal:MEAN:SD`` or ``lognormal:MEDIAN:SIGMA``
+    (milliseconds) -> sampler returning seconds."""
+    kind, *args = spec.strip().split(":")
+    values = [float(a) for a in args]
+    if kind == "fixed" and len(values) == 1:
+        return lambda rnd: values[0] / 1000.0
+    if kind == "uniform" and len(values) == 2:
+        return lambda rnd: rnd.uniform(values[0], values[1]) / 1000.0
+    if kind == "normal" and len(values) == 2:
+        return lambda rnd: max(0.0, rnd.gauss(values[0], values[1])) / 1000.0
+    if kind == "lognormal" and len(values) == 2:
+        mu = math.log(max(values[0], 1e-3))
+        return lambda rnd: rnd.lognormvariate(mu, values[1]) / 1000.0
+    raise ValueError(f"bad latency spec {spec!r}")
+
+
+def _per_upstream(spec: str) -> Dict[str, str]:
+    """``"*=a,yelp=b"`` -> {"*": "a", "yelp": "b"}."""
+    out: Dict[str, str] = {}
+    for part in filter(None, (p.strip() for p in spec.split(","))):
+        name, _, value = part.partition("=")
+        name = name.strip()
+        if name != "*" and name not in UPSTREAMS:
+            raise ValueError(f"unknown upstream {name!r} (expected one of {UPSTREAMS})")
+        out[name] = value.strip()
+    return out
+
+
+def build_profile(
+    latency: str = DEFAULT_LATENCY, errors: str = "", throttle: str = ""
+) -> Dict[str, Dict[str, Any]]:
+    """Per-upstream behaviour: {name: {latency: sampler, error_rate, throttle_rate}}."""
+    lat = _per_upstream(latency)
+    err = _per_upstream(errors)
+    thr = _per_upstream(throttle)
+    profile: Dict[str, Dict[str, Any]] = {}
+    for name in UPSTREAMS:
+        spec = lat.get(name, lat.get("*", "fixed:0"))
+        profile[name] = {
+            "latency": parse_latency(spec),
+            "latency_spec": spec,
+            "error_rate": float(err.get(name, err.get("*", 0.0))),
+            "throttle_rate": float(thr.get(name, thr.get("*", 0.0))),
+        }
+    return profile
+
+
+def _geocode_body(address: str) -> Dict[str, Any]:
+    """The recorded geocode moved a stable, address-dependent distance (up to ~3 mi)."""
+    body = copy.deepcopy(fixture("google_geocode.json"))
+    digest = hashlib.sha1(address.lower().encode("utf-8")).digest()
+    loc = body["results"][0]["geometry"]["location"]
+    loc["lat"] += (digest[0] / 255.0 - 0.5) * 0.08
+    loc["lng"] += (digest[1] / 255.0 - 0.5) * 0.1
+    body["results"][0]["formatted_address"] = address
+    return body
+
+
+def _chat_body(payload: Dict[str, Any]) -> Dict[str, Any]:
+    text = " ".join(str(m.get("content", "")) for m in payload.get("messages", [])[-1:])
+    label = classify_environment_heuristic(text)
+    if label == "unknown":
+        label = "indoor" if hashlib.sha1(text.encode("utf-8")).digest()[0] % 3 else "outdoor"
+    return {
+        "id": "chatcmpl-mock",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": payload.get("model", "mock"),
+        "choices": [
+            {
+                "index": 0,
+                "message": {"role": "assistant", "content": label},
+                "finish_reason": "stop",
+            }
+        ],
+        "usage": {"prompt_tokens": len(text) // 4, "completion_tokens": 1,
+                  "total_tokens": len(text) // 4 + 1},
+    }
+
+
+def create_app(
+    profile: Optional[Dict[str, Dict[str, Any]]] = None,
+    scale: int = 1,
+    seed: Optional[int] = None,
+) -> FastAPI:
+    """Mock upstream app; ``scale`` multiplies the Yelp/Ticketmaster fixtures."""
+    profile = profile or build_profile()
+    rnd = random.Random(seed)
+    days = shift_days()
+    stats: Dict[str, Dict[str, int]] = {name: {} for name in UPSTREAMS}
+    app = FastAPI(title="weekender mock upstreams")
+
+    async def serve(name: str, build: Callable[[], Response]) -> Response:
+        behaviour = profile[name]
+        await asyncio.sleep(behaviour["latency"](rnd))
+        roll = rnd.random()
+        if roll < behaviour["throttle_rate"]:
+            response: Response = JSONResponse(
+                {"error": "rate limited"}, status_code=429, headers={"Retry-After": "1"}
+            )
+        elif roll < behaviour["throttle_rate"] + behaviour["error_rate"]:
+            response = JSONResponse({"error": "upstream unavailable"}, status_code=503)
+        else:
+            response = build()
+        counts = stats[name]
+        counts[str(response.status_code)] = counts.get(str(response.status_code), 0) + 1
+        return response
+
+    @app.get("/yelp/v3/businesses/search")
+    async def yelp_search(request: Request) -> Response:
+        return await serve(
+            "yelp", lambda: JSONResponse(yelp_search_body(request.query_params, scale))
+        )
+
+    @app.get("/ticketmaster/discovery/v2/events.json")
+    async def ticketmaster_events(request: Request) -> Response:
+        return await serve(
+            "ticketmaster",
+            lambda: JSONResponse(ticketmaster_page_body(request.query_params, scale, days)),
+        )
+
+    @app.get("/google/maps/api/geocode/json")
+    async def geocode(address: str = "") -> Response:
+        return await serve("google", lambda: JSONResponse(_geocode_body(address)))
+
+    @app.get("/google/maps/api/distancematrix/json")
+    async def distance_matrix(request: Request) -> Response:
+        return await serve(
+            "google", lambda: JSONResponse(distance_matrix_body(request.query_params))
+        )
+
+    @app.get("/openweather/data/2.5/forecast")
+    async def weather() -> Response:
+        return await serve("openweather", lambda: JSONResponse(forecast(days)))
+
+    @app.post("/openai/v1/chat/completions")
+    async def chat(request: Request) -> Response:
+        payload = await request.json()
+        return await serve("openai", lambda: JSONResponse(_chat_body(payload)))
+
+    @app.get("/visitpgh/{path:path}")
+    async def visitpgh(path: str) -> Response:
+        return await serve("visitpgh", lambda: HTMLResponse(visitpgh_html()))
+
+    @app.get("/__stats")
+    def upstream_stats() -> Dict[str, Any]:
+        """Responses served so far, by upstream and status code."""
+        return {
+            "stats": stats,
+            "latency": {name: b["latency_spec"] for name, b in profile.items()},
+        }
+
+    return app
+
+
+def upstream_env(base_url: str) -> Dict[str, str]:
+    """Settings that point the API's clients at a mock server on ``base_url``."""
+    base = base_url.rstrip("/")
+    return {
+        "YELP_BASE_URL": f"{base}/yelp/v3",
+        "TM_BASE_URL": f"{base}/ticketmaster/discovery/v2/events.json",
+        "GOOGLE_MAPS_BASE_URL": f"{base}/google/maps/api",
+        "OPENWEATHER_URL": f"{base}/openweather/data/2.5/forecast",
+        "OPENAI_BASE_URL": f"{base}/openai/v1",
+        "VISITPGH_URL": f"{base}/visitpgh/this-week/",
+        # Keys only need to look configured
+        "YELP_API_KEY": "mock",
+        "TICKETMASTER_API_KEY": "mock",
+        "MAPS_API_KEY": "mock",
+        "MAPS_PROVIDER": "google",
+        "WEATHER_API_KEY": "mock",
+        "OPENAI_API_KEY": "mock",
+    }
+
+
+@contextmanager
+def serve_in_thread(app: Any, host: str = "127.0.0.1", port: int = 0) -> Iterator[str]:
+    """Run ``app`` with uvicorn on a background thread; yields its base URL."""
+    import uvicorn
+
+    server = uvicorn.Server(uvicorn.Config(app, host=host, port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, name="mock-upstream", daemon=True)
+    thread.start()
+    deadline = time.monotonic() + 10.0
+    while not server.started:
+        if not thread.is_alive() or time.monotonic() > deadline:
+            raise RuntimeError("mock upstream failed to start")
+        time.sleep(0.01)
+    bound: Tuple[str, int] = server.servers[0].sockets[0].getsockname()[:2]
+    try:
+        yield f"http://{bound[0]}:{bound[1]}"
+    finally:
+        server.should_exit = True
+        thread.join(timeout=10.0)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Mock upstream server for load tests")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--latency", default=DEFAULT_LATENCY,
+                        help='per upstream, e.g. "*=uniform:20:80,yelp=lognormal:150:0.6"')
+    parser.add_argument("--errors", default="", help='503 rates, e.g. "ticketmaster=0.02"')
+    parser.add_argument("--throttle", default="", help='429 rates, e.g. "yelp=0.05"')
+    parser.add_argument("--scale", type=int, default=1, help="Yelp/Ticketmaster fixture copies")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    import uvicorn
+
+    app = create_app(build_profile(args.latency, args.errors, args.throttle), args.scale, args.seed)
+    for key, value in upstream_env(f"http://{args.host}:{args.port}").items():
+        print(f"{key}={value}")
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""
+Title: Planner Admission Control
+Team: Purple Turtles — Gwen Li, Aadya Agarwal, Emma Peng, Noah Hicks
+Date: 2026-10-18
+Summary: Bounds concurrent itinerary builds (each fans out to several upstreams) with a
+        fixed number of slots and a bounded FIFO wait queue. Requests that find the queue
+        full, or wait longer than ADMISSION_QUEUE_TIMEOUT_SECONDS, are shed with 503 and
+        Retry-After instead of slowing every in-flight build. Only cache misses take a
+        slot, so cache-servable requests are answered even while the planner is saturated.
+Disclaimer: This file includes AI-assisted content (GPT-5); reviewed and approved by the Purple Turtles team.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from contextlib import contextmanager
+import threading
+import time
+from typing import Deque, Iterator, Optional
+
+from fastapi import HTTPException
+
+from ..core.config import get_settings
+from ..core.metrics import ADMISSION_IN_FLIGHT, ADMISSION_QUEUE_DEPTH, ADMISSION_REJECTED
+
+# Threadpool workers kept free beyond slots + queue for cache hits and the other routes
+THREAD_HEADROOM = 16
+
+
+class Overloaded(HTTPException):
+    """503 with Retry-After; ``reason`` is queue_full or queue_timeout."""
+
+    def __init__(self, reason: str, retry_after: int) -> None:
+        super().__init__(
+            status_code=503,
+            detail=f"planner overloaded ({reason}); retry later",
+            headers={"Retry-After": str(max(int(retry_after), 1))},
+        )
+        self.reason = reason
+
+
+class AdmissionLimiter:
+    """``limit`` concurrent slots; up to ``queue_size`` callers wait in arrival order."""
+
+    def __init__(
+        self, limit: int, queue_size: int, timeout_seconds: float, retry_after: int
+    ) -> None:
+        self.limit = max(limit, 1)
+        self.queue_size = max(queue_size, 0)
+        self.timeout_seconds = timeout_seconds
+        self.retry_after = retry_after
+        self.in_flight = 0
+        self._waiters: Deque[object] = deque()
+        self._cond = threading.Condition()
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiters)
+
+    def _publish(self) -> None:
+        ADMISSION_IN_FLIGHT.set(self.in_flight)
+        ADMISSION_QUEUE_DEPTH.set(len(self._waiters))
+
+    def _reject(self, reason: str) -> Overloaded:
+        ADMISSION_REJECTED.inc(reason)
+        return Overloaded(reason, self.retry_after)
+
+    def acquire(self) -> bool:
+        """Take a slot; True if this caller had to queue. Raises Overloaded when shed."""
+        with self._cond:
+            if self.in_flight < self.limit and not self._waiters:
+                self.in_flight += 1
+                self._publish()
+                return False
+            if len(self._waiters) >= self.queue_size:
+                raise self._reject("queue_full")
+            ticket = object()
+            self._waiters.append(ticket)
+            self._publish()
+            deadline = time.monotonic() + self.timeout_seconds
+            try:
+                while not (self._waiters[0] is ticket and self.in_flight < self.limit):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise self._reject("queue_timeout")
+                    self._cond.wait(remaining)
+            finally:
+                self._waiters.remove(ticket)
+                self._publish()
+                self._cond.notify_all()  # the next ticket may now be at the head
+            self.in_flight += 1
+            self._publish()
+            return True
+
+    def release(self) -> None:
+        with self._cond:
+            self.in_flight -= 1
+            self._publish()
+            self._cond.notify_all()
+
+    @contextmanager
+    def slot(self) -> Iterator[bool]:
+        queued = self.acquire()
+        try:
+            yield queued
+        finally:
+            self.release()
+
+
+_LIMITER: Optional[AdmissionLimiter] = None
+_LIMITER_LOCK = threading.Lock()
+
+
+def admission_enabled() -> bool:
+    return get_settings().admission_max_concurrency > 0
+
+
+def get_limiter() -> AdmissionLimiter:
+    global _LIMITER
+    settings = get_settings()
+    config = (
+        max(settings.admission_max_concurrency, 1),
+        max(settings.admission_queue_size, 0),
+        settings.admission_queue_timeout_seconds,
+        settings.admission_retry_after_seconds,
+    )
+    with _LIMITER_LOCK:
+        if _LIMITER is None or (
+            _LIMITER.limit,
+            _LIMITER.queue_size,
+            _LIMITER.timeout_seconds,
+            _LIMITER.retry_after,
+        ) != config:
+            _LIMITER = AdmissionLimiter(*config)
+        return _LIMITER
+
+
+@contextmanager
+def admitted() -> Iterator[bool]:
+    """Hold a planner slot for the block (yields whether the caller queued for it)."""
+    if not admission_enabled():
+        yield False
+        return
+    with get_limiter().slot() as queued:
+        yield queued
+
+
+def threadpool_size(current: int) -> int:
+    """Sync routes run in the threadpool; queued builds block a worker each, so keep enough
+    workers beyond them that cache hits never wait behind the queue."""
+    if not admission_enabled():
+        return current
+    settings = get_settings()
+    needed = (
+        settings.admission_max_concurrency + max(settings.admission_queue_size, 0)
+        + THREAD_HEADROOM
+    )
+    return max(current, needed)
@@ -0,0 +1,197 @@
+"""
+Title: Itinerary Response Cache
+Team: Purple Turtles — Gwen Li, Aadya Agarwal, Emma Peng, Noah Hicks
+Date: 2026-10-18
+Summary: Caches serialized itinerary responses under a canonical hash of the request
+        (normalized city, origin address, dates and interests; no I/O) with ETag support,
+        and traces each build into a Server-Timing header (and optional debug_timings).
+        An entry whose snapshot_id can no longer be re-planned from counts as a miss.
+Disclaimer: This file includes AI-assisted content (GPT-5); reviewed and approved by the Purple Turtles team.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+import hashlib
+import json
+import time
+from typing import Any, Callable, Dict, Optional
+
+from fastapi import Response
+from pydantic import BaseModel
+
+from .admission import admitted
+from .responses import dump_json
+from ..core.cache import make_cache
+from ..core.config import get_settings
+from ..core.metrics import cache_lookup, coalesced, server_timing, trace, trace_timings
+from ..models.itinerary import ItineraryRequest
+from ..services.planner import snapshot_available
+
+
+_RESPONSES = make_cache(
+    "response",
+    maxsize=get_settings().response_cache_max_entries,
+    ttl_seconds=get_settings().response_cache_ttl_seconds,
+)
+
+
+def _normalize_dt(dt: datetime) -> str:
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return dt.replace(second=0, microsecond=0).isoformat()
+
+
+def _normalize_text(text: Optional[str]) -> Optional[str]:
+    if not text:
+        return None
+    return " ".join(text.lower().replace(",", " ").split())
+
+
+def request_cache_key(endpoint: str, request: ItineraryRequest, compact: bool = False) -> str:
+    """Canonical hash of everything in the request that can change the response.
+
+    Pure computation: the origin is keyed by its normalized address text rather than its
+    geocode, so a repeat request costs one cache lookup and no upstream call (an address
+    that cannot be geocoded would otherwise reach the geocoder on every request).
+    """
+    prefs = request.preferences
+    canonical: Dict[str, Any] = {
+        "endpoint": endpoint,
+        "compact": bool(compact),
+        "city": _normalize_text(request.city),
+        "start": _normalize_dt(request.start_date),
+        "end": _normalize_dt(request.end_date),
+        "origin": _normalize_text(request.user_address),
+        "max_distance": (
+            None
+            if request.max_distance_miles is None
+            else round(float(request.max_distance_miles), 2)
+        ),
+        "budget": prefs.budget_level.lower(),
+        "interests": sorted({i.strip().lower() for i in prefs.interests if i.strip()}),
+        "mobility": prefs.mobility.lower(),
+        "environment": prefs.environment.lower(),
+    }
+    raw = json.dumps(canonical, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _ttl_for(sources: Dict[str, int], warnings: list) -> int:
+    """Minimum freshness window of the sources behind a response."""
+    settings = get_settings()
+    if warnings and any("_unavailable" in w for w in warnings):
+        # Degraded results should not outlive a short upstream blip
+        return settings.response_cache_degraded_ttl_seconds
+    source_ttls = {
+        "visitpgh": settings.visitpgh_ttl_seconds,
+        "ticketmaster": settings.ticketmaster_ttl_seconds,
+        "yelp": settings.yelp_ttl_seconds,
+        "openweather": settings.weather_ttl_seconds,
+    }
+    ttls = [source_ttls[s] for s in sources if s in source_ttls]
+    return min([settings.response_cache_ttl_seconds] + ttls)
+
+
+def _entry(
+    model: BaseModel,
+    compact: bool,
+    sources: Dict[str, int],
+    warnings: list,
+    snapshot_id: Optional[str] = None,
+) -> Dict[str, Any]:
+    body = dump_json(model, compact)
+    ttl = _ttl_for(sources, warnings)
+    return {
+        "body": body,
+        "etag": '"' + hashlib.sha1(body).hexdigest() + '"',
+        "expires_at": time.time() + ttl,
+        "ttl": ttl,
+        "snapshot_id": snapshot_id,
+    }
+
+
+def _lookup(key: str) -> Optional[Dict[str, Any]]:
+    """Cached entry for ``key``, unless the snapshot_id it hands out is already gone."""
+    entry = _RESPONSES.get(key)
+    if entry is None:
+        return None
+    snapshot_id = entry.get("snapshot_id")
+    if snapshot_id and not snapshot_available(snapshot_id):
+        # Follow-up re-plans against that id would miss; rebuild and issue a fresh one
+        _RESPONSES.pop(key)
+        return None
+    return entry
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    tags = [t.strip() for t in if_none_match.split(",")]
+    return "*" in tags or etag in tags or f"W/{etag}" in tags
+
+
+def _build_entry(
+    build: Callable[[], BaseModel], compact: bool, debug_timings: bool, spans: Any
+) -> Dict[str, Any]:
+    model = build()
+    # PlanResponse wraps an ItineraryResponse; options carry used_sources
+    inner = getattr(model, "activities", model)
+    sources = getattr(inner, "used_sources", None) or getattr(inner, "sources", None) or {}
+    warnings = list(getattr(inner, "warnings", None) or [])
+    if debug_timings:
+        inner.debug_timings = trace_timings(spans)
+    return _entry(model, compact, sources, warnings, getattr(inner, "snapshot_id", None))
+
+
+def cached_response(
+    key: str,
+    build: Callable[[], BaseModel],
+    compact: bool = False,
+    if_none_match: Optional[str] = None,
+    debug_timings: bool = False,
+) -> Response:
+    """Serve ``key`` from cache (or build and store it) honoring If-None-Match.
+
+    Every response carries ``Server-Timing`` for the work done on this request.
+    ``debug_timings`` always rebuilds (bypassing, and not filling, the response cache) so
+    the body can carry the spans. Builds run under admission control and may raise
+    ``Overloaded`` (503).
+    """
+    settings = get_settings()
+    use_cache = settings.response_cache_enabled and not debug_timings
+    started = time.perf_counter()
+    with trace() as spans:
+        entry = _lookup(key) if use_cache else None
+        if use_cache:
+            cache_lookup("response", entry is not None)
+        status = "hit"
+        if entry is None:
+            # Only builds take an admission slot; hits above never queue behind them
+            with admitted() as queued:
+                if queued and use_cache:
+                    # Identical requests queue together; the first one's build serves the rest
+                    entry = _lookup(key)
+                    if entry is not None:
+                        coalesced("response")
+                if entry is None:
+                    status = "miss"
+                    entry = _build_entry(build, compact, debug_timings, spans)
+                    if use_cache:
+                        _RESPONSES.set(key, entry, ttl_seconds=entry["ttl"])
+    total_ms = (time.perf_counter() - started) * 1000.0
+
+    max_age = max(0, int(entry["expires_at"] - time.time()))
+    headers = {
+        "ETag": entry["etag"],
+        "Cache-Control": f"private, max-age={max_age}",
+        "X-Cache": status,
+        "Server-Timing": server_timing(spans, total_ms, status),
+    }
+    if _etag_matches(if_none_match, entry["etag"]):
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry["body"], headers=headers, media_type="application/json")
+
+
+def clear_response_cache() -> None:
+    _RESPONSES.clear()
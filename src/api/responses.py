@@ -0,0 +1,39 @@
+"""
+Title: Fast JSON Responses
+Team: Purple Turtles — Gwen Li, Aadya Agarwal, Emma Peng, Noah Hicks
+Date: 2026-10-18
+Summary: Serializes pydantic models straight to JSON bytes (pydantic-core) instead of the
+        jsonable_encoder + json.dumps path, with an opt-in compact shape that drops nulls.
+Disclaimer: This file includes AI-assisted content (GPT-5); reviewed and approved by the Purple Turtles team.
+"""
+
+from __future__ import annotations
+
+from typing import Mapping, Optional
+
+from fastapi import Response
+from pydantic import BaseModel
+
+
+def model_response(
+    model: BaseModel,
+    compact: bool = False,
+    status_code: int = 200,
+    headers: Optional[Mapping[str, str]] = None,
+) -> Response:
+    """Return ``model`` as an ``application/json`` response in one serialization pass.
+
+    ``compact`` omits fields whose value is ``None`` (most Activity fields for
+    scraped events), which noticeably shrinks itinerary payloads.
+    """
+    return Response(
+        content=dump_json(model, compact),
+        status_code=status_code,
+        headers=dict(headers or {}),
+        media_type="application/json",
+    )
+
+
+def dump_json(model: BaseModel, compact: bool = False) -> bytes:
+    """Serialize with pydantic-core (no intermediate dicts); ``compact`` drops nulls."""
+    return model.model_dump_json(exclude_none=compact).encode("utf-8")
@@ -6,8 +6,8 @@ Summary: FastAPI routes for health and itinerary preview.
 Disclaimer: This file includes AI-assisted content (GPT-5); reviewed and approved by the Purple Turtles team.
 """
 
-from fastapi import APIRouter, HTTPException, Query
-from fastapi.encoders import jsonable_encoder
+from fastapi import APIRouter, Header, HTTPException, Query
+from fastapi.responses import JSONResponse, PlainTextResponse
 import logging
 import traceback
 from datetime import datetime, timedelta
@@ -16,34 +16,41 @@ from src.models.itinerary import (
     ItineraryRequest,
     ItineraryResponse,
     ItineraryOptionsResponse,
+    PlanResponse,
     Preference,
 )
+from src.api.response_cache import cached_response, request_cache_key
+from src.core.metrics import metrics_enabled, render_prometheus
+from src.core.profiling import ProfiledRoute, get_profile_store, profiling_enabled
 from src.services.planner import build_itinerary, build_itinerary_options
 from src.services.yelp_client import search_food
 from src.services.visitpgh_scraper import fetch_this_week_events
 from src.services.weather_client import fetch_forecast
 
 
-router = APIRouter()
-print("🚀 routes_planner loaded successfully!")
+router = APIRouter(route_class=ProfiledRoute)
 
 
 @router.get("/weather")
-async def get_weather():
+def get_weather():
     """
     Fetches weather forecast data for Pittsburgh (7-day + hourly)
     """
     print("📅 get_weather() called successfully")
 
-    data = fetch_forecast("Pittsburgh")
+    # Same city key as the planner's default, so both share one cached forecast
+    data = fetch_forecast("Pittsburgh, PA")
     return data
 
 
 @router.get("/plan")
-async def get_plan(
+def get_plan(
     start_date: str = Query(...),
     address: str = Query("Pittsburgh, PA"),
     days: int = Query(2),
+    compact: bool = Query(False, description="Drop null fields from the response"),
+    debug_timings: bool = Query(False, description="Include per-stage timings (uncached)"),
+    if_none_match: str | None = Header(None),
 ):
     """
     Generate itinerary for given date and location.
@@ -72,11 +79,22 @@ async def get_plan(
             max_distance_miles=5.0,
         )
 
-        itinerary = build_itinerary(request_obj)
-
-        print("✅ Itinerary built successfully!")
-        return jsonable_encoder({"start_date": start_date, "activities": itinerary})
+        def build() -> PlanResponse:
+            itinerary = build_itinerary(request_obj)
+            print("✅ Itinerary built successfully!")
+            return PlanResponse(start_date=start_date, activities=itinerary)
+
+        key = request_cache_key("plan", request_obj, compact)
+        return cached_response(
+            key,
+            build,
+            compact=compact,
+            if_none_match=if_none_match,
+            debug_timings=debug_timings,
+        )
 
+    except HTTPException:
+        raise  # admission 503s keep their status and Retry-After
     except Exception as e:
         print("❌ ERROR in get_plan():", e)
         traceback.print_exc()
@@ -93,8 +111,53 @@ def health() -> dict:
     response_model=ItineraryResponse,
     summary="Build a single itinerary (defaults to upcoming weekend at CMU)",
 )
-def create_itinerary(payload: ItineraryRequest) -> ItineraryResponse:
-    return build_itinerary(payload)
+def create_itinerary(
+    payload: ItineraryRequest,
+    compact: bool = Query(False, description="Drop null fields from the response"),
+    debug_timings: bool = Query(False, description="Include per-stage timings (uncached)"),
+    if_none_match: str | None = Header(None),
+):
+    key = request_cache_key("itinerary", payload, compact)
+    return cached_response(
+        key,
+        lambda: build_itinerary(payload),
+        compact=compact,
+        if_none_match=if_none_match,
+        debug_timings=debug_timings,
+    )
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def metrics() -> PlainTextResponse:
+    """Stage/upstream timings and cache counters in Prometheus text format."""
+    if not metrics_enabled():
+        raise HTTPException(status_code=404, detail="metrics disabled")
+    return PlainTextResponse(
+        render_prometheus(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
+@router.get("/debug/profiles")
+def list_profiles() -> JSONResponse:
+    """Kept request profiles, newest first (PROFILE_SAMPLE_RATE / PROFILE_SLOW_MS)."""
+    if not profiling_enabled():
+        raise HTTPException(status_code=404, detail="profiling disabled")
+    return JSONResponse({"profiles": get_profile_store().list()})
+
+
+@router.get("/debug/profiles/{profile_id}")
+def get_profile(
+    profile_id: str,
+    format: str = Query("json", description="json | folded (flamegraph.pl / speedscope)"),
+):
+    if not profiling_enabled():
+        raise HTTPException(status_code=404, detail="profiling disabled")
+    record = get_profile_store().get(profile_id)
+    if record is None:
+        raise HTTPException(status_code=404, detail="profile not found")
+    if format == "folded":
+        return PlainTextResponse(record["folded"])
+    return JSONResponse(record)
 
 
 @router.get("/food/search")
@@ -123,8 +186,22 @@ def events_this_week() -> dict:
     response_model=ItineraryOptionsResponse,
     summary="Build multiple itinerary options (diversified; defaults prefilled)",
 )
-def create_itinerary_options(payload: ItineraryRequest) -> ItineraryOptionsResponse:
+def create_itinerary_options(
+    payload: ItineraryRequest,
+    compact: bool = Query(False, description="Drop null fields from the response"),
+    debug_timings: bool = Query(False, description="Include per-stage timings (uncached)"),
+    if_none_match: str | None = Header(None),
+):
+    key = request_cache_key("options", payload, compact)
     try:
-        return build_itinerary_options(payload)
+        return cached_response(
+            key,
+            lambda: build_itinerary_options(payload),
+            compact=compact,
+            if_none_match=if_none_match,
+            debug_timings=debug_timings,
+        )
+    except HTTPException:
+        raise  # admission 503s keep their status and Retry-After
     except Exception as exc:  # pragma: no cover
         raise HTTPException(status_code=500, detail=str(exc))
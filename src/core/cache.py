@@ -0,0 +1,335 @@
+"""
+Title: TTL Caches (In-Memory + Shared Across Workers)
+Team: Purple Turtles — Gwen Li, Aadya Agarwal, Emma Peng, Noah Hicks
+Date: 2026-10-18
+Summary: Small thread-safe LRU cache with per-entry expiry for process-local state, plus
+        shared backends (SQLite in WAL mode, or Redis when installed) so several server
+        workers reuse one set of upstream responses, geocodes and classifications.
+        ``make_cache`` picks the backend from CACHE_BACKEND.
+Disclaimer: This file includes AI-assisted content (GPT-5); reviewed and approved by the Purple Turtles team.
+"""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+import logging
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from typing import Any, Hashable, Optional, Tuple, Union
+
+from .config import get_settings
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_URLS = {
+    "sqlite": "sqlite:///./weekender-cache.sqlite3",
+    "redis": "redis://localhost:6379/0",
+}
+
+# Shared writes check the namespace size every this many sets
+_EVICT_EVERY = 64
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    expires_at REAL NOT NULL,
+    stored_at REAL NOT NULL,
+    value BLOB NOT NULL,
+    PRIMARY KEY (namespace, key)
+);
+CREATE INDEX IF NOT EXISTS idx_cache_age ON cache(namespace, stored_at);
+"""
+
+
+class TTLCache:
+    """LRU mapping whose entries expire ``ttl_seconds`` after they are set."""
+
+    def __init__(self, maxsize: int = 256, ttl_seconds: float = 300.0) -> None:
+        self.maxsize = max(1, int(maxsize))
+        self.ttl_seconds = float(ttl_seconds)
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        ttl = self.ttl_seconds if ttl_seconds is None else float(ttl_seconds)
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.pop(key, None)
+            return default if entry is None else entry[1]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+class SharedTTLCache(ABC):
+    """TTLCache interface over a store every worker process can see.
+
+    Values are pickled into the shared store, so other workers read their own copies. A
+    process-local TTLCache in front (same expiry) keeps hot entries from being re-read
+    and unpickled, and like any TTLCache hands back the very object that was set: treat
+    cached values as read-only and ``set`` a changed value back. ``clear`` and ``pop``
+    only reach other workers' local copies once those expire. An entry that cannot be
+    read or unpickled counts as a miss.
+    """
+
+    def __init__(self, namespace: str, maxsize: int = 256, ttl_seconds: float = 300.0) -> None:
+        self.namespace = namespace
+        self.maxsize = max(1, int(maxsize))
+        self.ttl_seconds = float(ttl_seconds)
+        self._local = TTLCache(maxsize, ttl_seconds)
+        self._sets = 0
+
+    def _key(self, key: Hashable) -> str:
+        return key if isinstance(key, str) else repr(key)
+
+    # Backend operations (wall-clock expiry: monotonic clocks differ per process)
+    @abstractmethod
+    def _load(self, key: str) -> Optional[Tuple[float, bytes]]:
+        ...
+
+    @abstractmethod
+    def _store(self, key: str, blob: bytes, expires_at: float) -> None:
+        ...
+
+    @abstractmethod
+    def _delete(self, key: str) -> None:
+        ...
+
+    @abstractmethod
+    def _delete_all(self) -> None:
+        ...
+
+    def _evict(self) -> None:
+        """Trim the namespace to ``maxsize`` (backends without their own limits)."""
+
+    @abstractmethod
+    def __len__(self) -> int:
+        ...
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        skey = self._key(key)
+        missing = object()
+        value = self._local.get(skey, missing)
+        if value is not missing:
+            return value
+        try:
+            found = self._load(skey)
+        except Exception as exc:  # a broken shared store degrades to misses
+            logger.warning("shared cache %s read failed: %s", self.namespace, exc)
+            return default
+        if found is None:
+            return default
+        expires_at, blob = found
+        remaining = expires_at - time.time()
+        if remaining <= 0:
+            return default
+        try:
+            value = pickle.loads(blob)
+        except Exception as exc:  # truncated, or written by incompatible code
+            logger.warning("shared cache %s entry unreadable: %s", self.namespace, exc)
+            return default
+        self._local.set(skey, value, ttl_seconds=remaining)
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        ttl = self.ttl_seconds if ttl_seconds is None else float(ttl_seconds)
+        skey = self._key(key)
+        self._local.set(skey, value, ttl_seconds=ttl)
+        try:
+            self._store(skey, pickle.dumps(value, pickle.HIGHEST_PROTOCOL), time.time() + ttl)
+            self._sets += 1
+            if self._sets % _EVICT_EVERY == 0:
+                self._evict()
+        except Exception as exc:
+            logger.warning("shared cache %s write failed: %s", self.namespace, exc)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        skey = self._key(key)
+        value = self.get(skey, default)
+        self._local.pop(skey)
+        try:
+            self._delete(skey)
+        except Exception as exc:
+            logger.warning("shared cache %s delete failed: %s", self.namespace, exc)
+        return value
+
+    def clear(self) -> None:
+        self._local.clear()
+        try:
+            self._delete_all()
+        except Exception as exc:
+            logger.warning("shared cache %s clear failed: %s", self.namespace, exc)
+
+
+class SQLiteTTLCache(SharedTTLCache):
+    """Shared cache in one SQLite file (WAL: readers never block the single writer)."""
+
+    def __init__(
+        self, path: str, namespace: str, maxsize: int = 256, ttl_seconds: float = 300.0
+    ) -> None:
+        super().__init__(namespace, maxsize, ttl_seconds)
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pid = 0
+        self._lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+        # Opened on first use and again after a fork (connections must not cross processes)
+        if self._conn is None or self._pid != os.getpid():
+            conn = sqlite3.connect(
+                self.path, timeout=5.0, check_same_thread=False, isolation_level=None
+            )
+            if self.path != ":memory:":
+                conn.execute("PRAGMA journal_mode = WAL")
+                conn.execute("PRAGMA synchronous = NORMAL")
+            conn.executescript(_SCHEMA)
+            self._conn, self._pid = conn, os.getpid()
+        return self._conn
+
+    def _load(self, key: str) -> Optional[Tuple[float, bytes]]:
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT expires_at, value FROM cache WHERE namespace = ? AND key = ?",
+                (self.namespace, key),
+            ).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def _store(self, key: str, blob: bytes, expires_at: float) -> None:
+        with self._lock:
+            self._connection().execute(
+                "INSERT OR REPLACE INTO cache (namespace, key, expires_at, stored_at, value) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (self.namespace, key, expires_at, time.time(), sqlite3.Binary(blob)),
+            )
+
+    def _delete(self, key: str) -> None:
+        with self._lock:
+            self._connection().execute(
+                "DELETE FROM cache WHERE namespace = ? AND key = ?", (self.namespace, key)
+            )
+
+    def _delete_all(self) -> None:
+        with self._lock:
+            self._connection().execute("DELETE FROM cache WHERE namespace = ?", (self.namespace,))
+
+    def _evict(self) -> None:
+        """Drop expired rows, then the oldest writes beyond ``maxsize``."""
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "DELETE FROM cache WHERE namespace = ? AND expires_at <= ?",
+                (self.namespace, time.time()),
+            )
+            conn.execute(
+                "DELETE FROM cache WHERE namespace = ? AND key IN ("
+                " SELECT key FROM cache WHERE namespace = ? ORDER BY stored_at DESC"
+                " LIMIT -1 OFFSET ?)",
+                (self.namespace, self.namespace, self.maxsize),
+            )
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection().execute(
+                "SELECT COUNT(*) FROM cache WHERE namespace = ? AND expires_at > ?",
+                (self.namespace, time.time()),
+            ).fetchone()[0]
+
+
+class RedisTTLCache(SharedTTLCache):
+    """Shared cache in Redis (``pip install redis``); Redis expires keys itself and its
+    ``maxmemory-policy`` bounds size."""
+
+    def __init__(
+        self, url: str, namespace: str, maxsize: int = 256, ttl_seconds: float = 300.0
+    ) -> None:
+        import redis  # optional dependency; make_cache falls back when it is missing
+
+        super().__init__(namespace, maxsize, ttl_seconds)
+        self._client = redis.Redis.from_url(url)
+        self._prefix = f"weekender:{namespace}:"
+
+    def _load(self, key: str) -> Optional[Tuple[float, bytes]]:
+        pipe = self._client.pipeline()
+        pipe.get(self._prefix + key)
+        pipe.pttl(self._prefix + key)
+        blob, pttl = pipe.execute()
+        if blob is None or pttl is None or pttl <= 0:
+            return None
+        return time.time() + pttl / 1000.0, blob
+
+    def _store(self, key: str, blob: bytes, expires_at: float) -> None:
+        ttl_ms = int((expires_at - time.time()) * 1000)
+        if ttl_ms > 0:
+            self._client.set(self._prefix + key, blob, px=ttl_ms)
+
+    def _delete(self, key: str) -> None:
+        self._client.delete(self._prefix + key)
+
+    def _delete_all(self) -> None:
+        keys = list(self._client.scan_iter(match=self._prefix + "*", count=500))
+        if keys:
+            self._client.delete(*keys)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self._client.scan_iter(match=self._prefix + "*", count=500))
+
+
+AnyTTLCache = Union[TTLCache, SharedTTLCache]
+
+
+def cache_path(cache_url: str) -> Optional[str]:
+    """Filesystem path for a ``sqlite:///`` URL (``None`` for other schemes)."""
+    prefix = "sqlite:///"
+    if not cache_url.startswith(prefix):
+        return None
+    return cache_url[len(prefix):] or ":memory:"
+
+
+def make_cache(namespace: str, maxsize: int = 256, ttl_seconds: float = 300.0) -> AnyTTLCache:
+    """TTL cache on the CACHE_BACKEND store: ``memory`` (per process, default), ``sqlite``
+    or ``redis`` (shared by every worker using the same CACHE_URL)."""
+    settings = get_settings()
+    backend = settings.cache_backend.strip().lower()
+    url = settings.cache_url or DEFAULT_CACHE_URLS.get(backend, "")
+    if backend == "sqlite":
+        path = cache_path(url)
+        if path is not None:
+            return SQLiteTTLCache(path, namespace, maxsize, ttl_seconds)
+        logger.warning("CACHE_URL %r is not sqlite:///; using in-memory caches", url)
+    elif backend == "redis":
+        try:
+            return RedisTTLCache(url, namespace, maxsize, ttl_seconds)
+        except ImportError:
+            logger.warning("CACHE_BACKEND=redis needs the redis package; using in-memory caches")
+    elif backend != "memory":
+        logger.warning("unknown CACHE_BACKEND %r; using in-memory caches", backend)
+    return TTLCache(maxsize, ttl_seconds)
@@ -22,6 +22,10 @@ class Settings(BaseSettings):
     openai_model: str = Field("gpt-5-nano", validation_alias="OPENAI_MODEL")
     openai_max_completion_tokens: int = Field(500, validation_alias="OPENAI_MAX_COMPLETION_TOKENS")
     openai_concurrency: int = Field(8, validation_alias="OPENAI_CONCURRENCY")
+    # OpenAI labels are reused for this long (per model and text)
+    classifier_cache_ttl_seconds: int = Field(
+        604800, validation_alias="CLASSIFIER_CACHE_TTL_SECONDS"
+    )
     maps_api_key: str = Field("changeme-maps-key", validation_alias="MAPS_API_KEY")
     weather_api_key: str = Field("changeme-weather-key", validation_alias="WEATHER_API_KEY")
     events_api_key: str = Field("changeme-events-key", validation_alias="EVENTS_API_KEY")
@@ -31,8 +35,88 @@ class Settings(BaseSettings):
     # Maps provider selection: "google" or "none" (haversine fallback)
     maps_provider: str = Field("google", validation_alias="MAPS_PROVIDER")
 
+    # Upstream endpoints; empty uses each client's public URL (point at loadtest stand-ins)
+    yelp_base_url: str = Field("", validation_alias="YELP_BASE_URL")
+    ticketmaster_base_url: str = Field("", validation_alias="TM_BASE_URL")
+    google_maps_base_url: str = Field("", validation_alias="GOOGLE_MAPS_BASE_URL")
+    openweather_url: str = Field("", validation_alias="OPENWEATHER_URL")
+    openai_base_url: str = Field("", validation_alias="OPENAI_BASE_URL")
+    visitpgh_url: str = Field("", validation_alias="VISITPGH_URL")
+
+    # Itinerary optimizer: beam width trades latency for plan quality under load
+    planner_beam_width: int = Field(8, validation_alias="PLANNER_BEAM_WIDTH")
+    planner_max_options: int = Field(3, validation_alias="PLANNER_MAX_OPTIONS")
+    # Candidate snapshots kept for incremental re-planning (snapshot_id)
+    plan_snapshot_ttl_seconds: int = Field(900, validation_alias="PLAN_SNAPSHOT_TTL_SECONDS")
+    plan_snapshot_max_entries: int = Field(256, validation_alias="PLAN_SNAPSHOT_MAX_ENTRIES")
+
+    # Freshness of each upstream source (seconds); response caching uses the minimum
+    visitpgh_ttl_seconds: int = Field(3600, validation_alias="VISITPGH_TTL_SECONDS")
+    ticketmaster_ttl_seconds: int = Field(900, validation_alias="TICKETMASTER_TTL_SECONDS")
+    yelp_ttl_seconds: int = Field(3600, validation_alias="YELP_TTL_SECONDS")
+    weather_ttl_seconds: int = Field(1800, validation_alias="WEATHER_TTL_SECONDS")
+    geocode_ttl_seconds: int = Field(86400, validation_alias="GEOCODE_TTL_SECONDS")
+
+    # Ticketmaster windowed ingestion: whole weeks for the metro area, paged, shared by users
+    ticketmaster_metro_radius_miles: int = Field(
+        30, validation_alias="TICKETMASTER_METRO_RADIUS_MILES"
+    )
+    ticketmaster_page_size: int = Field(200, validation_alias="TICKETMASTER_PAGE_SIZE")
+    ticketmaster_max_pages: int = Field(5, validation_alias="TICKETMASTER_MAX_PAGES")
+    # Yelp area pool: businesses pulled per area per YELP_TTL_SECONDS (Yelp caps it at 240)
+    yelp_pool_size: int = Field(200, validation_alias="YELP_POOL_SIZE")
+
+    # Full-response cache for itinerary endpoints
+    response_cache_enabled: bool = Field(True, validation_alias="RESPONSE_CACHE_ENABLED")
+    response_cache_max_entries: int = Field(512, validation_alias="RESPONSE_CACHE_MAX_ENTRIES")
+    response_cache_ttl_seconds: int = Field(900, validation_alias="RESPONSE_CACHE_TTL_SECONDS")
+    response_cache_degraded_ttl_seconds: int = Field(
+        60, validation_alias="RESPONSE_CACHE_DEGRADED_TTL_SECONDS"
+    )
+
+    # Admission control for planner builds (cache hits bypass it); 0 concurrency disables
+    admission_max_concurrency: int = Field(8, validation_alias="ADMISSION_MAX_CONCURRENCY")
+    admission_queue_size: int = Field(16, validation_alias="ADMISSION_QUEUE_SIZE")
+    admission_queue_timeout_seconds: float = Field(
+        10.0, validation_alias="ADMISSION_QUEUE_TIMEOUT_SECONDS"
+    )
+    admission_retry_after_seconds: int = Field(2, validation_alias="ADMISSION_RETRY_AFTER_SECONDS")
+
+    # Stage/upstream timers and cache counters served at /api/metrics
+    metrics_enabled: bool = Field(True, validation_alias="METRICS_ENABLED")
+    # Sampling profiler: a fraction of requests and/or those over PROFILE_SLOW_MS (0 = off)
+    profile_sample_rate: float = Field(0.0, validation_alias="PROFILE_SAMPLE_RATE")
+    profile_slow_ms: float = Field(0.0, validation_alias="PROFILE_SLOW_MS")
+    profile_interval_ms: float = Field(10.0, validation_alias="PROFILE_INTERVAL_MS")
+    profile_dir: str = Field("", validation_alias="PROFILE_DIR")  # empty: <tmp>/weekender-profiles
+    profile_keep: int = Field(50, validation_alias="PROFILE_KEEP")
+
+    # Gzip responses at least this many bytes (0 disables compression)
+    gzip_minimum_size: int = Field(1000, validation_alias="GZIP_MINIMUM_SIZE")
+
+    # Load TLS context, HTML parser and event store at startup rather than on first request
+    prewarm_enabled: bool = Field(True, validation_alias="PREWARM_ENABLED")
+
+    # Background event crawler (started with the app when enabled)
+    crawler_enabled: bool = Field(False, validation_alias="CRAWLER_ENABLED")
+    crawler_seed_urls: str = Field("", validation_alias="CRAWLER_SEED_URLS")  # comma-separated
+    crawler_interval_seconds: int = Field(21600, validation_alias="CRAWLER_INTERVAL_SECONDS")
+    crawler_max_pages: int = Field(50, validation_alias="CRAWLER_MAX_PAGES")
+    crawler_max_depth: int = Field(2, validation_alias="CRAWLER_MAX_DEPTH")
+    crawler_concurrency: int = Field(4, validation_alias="CRAWLER_CONCURRENCY")
+    crawler_per_host_concurrency: int = Field(2, validation_alias="CRAWLER_PER_HOST_CONCURRENCY")
+    crawler_delay_seconds: float = Field(1.0, validation_alias="CRAWLER_DELAY_SECONDS")
+    crawler_timeout_seconds: float = Field(15.0, validation_alias="CRAWLER_TIMEOUT_SECONDS")
+
+    # memory (per worker) | sqlite | redis; shared backends serve every worker on CACHE_URL
     cache_backend: str = Field("memory", validation_alias="CACHE_BACKEND")
+    cache_url: str = Field("", validation_alias="CACHE_URL")  # empty: per-backend default
     database_url: str = Field("sqlite:///./weekender.sqlite3", validation_alias="DATABASE_URL")
+    # Local event store (SQLite at DATABASE_URL); undated events expire after this long
+    event_store_enabled: bool = Field(True, validation_alias="EVENT_STORE_ENABLED")
+    event_store_undated_ttl_seconds: int = Field(
+        604800, validation_alias="EVENT_STORE_UNDATED_TTL_SECONDS"
+    )
 
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8")
 
@@ -0,0 +1,67 @@
+"""
+Title: Shared HTTP Client Setup
+Team: Purple Turtles — Gwen Li, Aadya Agarwal, Emma Peng, Noah Hicks
+Date: 2026-10-18
+Summary: Upstream clients are short-lived httpx.Client instances; this module imports httpx on
+        first use (it is the heaviest import behind the routes) and shares one TLS context, so
+        a new client no longer reloads the CA bundle. The app lifespan builds it up front.
+        canonical_url() gives every writer of event URLs (scraper, crawler, store) one key.
+Disclaimer: This file includes AI-assisted content (GPT-5); reviewed and approved by the Purple Turtles team.
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+import re
+import ssl
+from typing import TYPE_CHECKING, Optional
+from urllib.parse import parse_qsl, urlencode, urljoin, urlsplit, urlunsplit
+
+if TYPE_CHECKING:  # pragma: no cover
+    import httpx
+
+
+# Query parameters that never change which page a URL points at
+_TRACKING_PARAMS = ("utm_", "fbclid", "gclid", "mc_cid", "mc_eid", "_ga")
+
+
+@lru_cache(maxsize=1)
+def ssl_context() -> ssl.SSLContext:
+    """httpx's default verifying context (certifi bundle), built once per process."""
+    import httpx
+
+    return httpx.create_ssl_context()
+
+
+def http_client(timeout: float) -> "httpx.Client":
+    import httpx
+
+    return httpx.Client(timeout=timeout, verify=ssl_context())
+
+
+def canonical_url(url: str, base: Optional[str] = None) -> Optional[str]:
+    """Normalize ``url`` (resolved against ``base``) so variants de-duplicate to one key.
+
+    Lowercases scheme/host, drops default ports, fragments and tracking parameters, sorts the
+    query string and collapses repeated slashes. Returns ``None`` for non-HTTP(S) links.
+    """
+    if not url:
+        return None
+    full = urljoin(base, url.strip()) if base else url.strip()
+    parts = urlsplit(full)
+    scheme = parts.scheme.lower()
+    if scheme not in ("http", "https") or not parts.hostname:
+        return None
+    host = parts.hostname.lower()
+    port = parts.port
+    if port and not ((scheme == "http" and port == 80) or (scheme == "https" and port == 443)):
+        host = f"{host}:{port}"
+    path = re.sub(r"/{2,}", "/", parts.path or "/")
+    query = urlencode(
+        sorted(
+            (k, v)
+            for k, v in parse_qsl(parts.query, keep_blank_values=True)
+            if not k.lower().startswith(_TRACKING_PARAMS)
+        )
+    )
+    return urlunsplit((scheme, host, path, query, ""))
@@ -0,0 +1,342 @@
+"""
+Title: Metrics (Stage Timers + Prometheus Export)
+Team: Purple Turtles — Gwen Li, Aadya Agarwal, Emma Peng, Noah Hicks
+Date: 2026-10-18
+Summary: Process-local counters, gauges and histograms with context-manager timers for planner stages
+        and upstream calls, cache hit/miss counters, and Prometheus text rendering for
+        /api/metrics. The same timers feed an optional per-request trace (contextvars) that
+        becomes the Server-Timing header and debug_timings. With METRICS_ENABLED off and no
+        trace active the timers are shared no-op contexts.
+Disclaimer: This file includes AI-assisted content (GPT-5); reviewed and approved by the Purple Turtles team.
+"""
+
+from __future__ import annotations
+
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+import threading
+import time
+from typing import Any, ContextManager, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .config import get_settings
+
+
+# Seconds; spans cache hits (ms) through slow upstreams and full plan builds
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0
+)
+
+_NOOP: ContextManager[None] = nullcontext()
+
+LabelValues = Tuple[str, ...]
+
+# How a span's data was obtained; a span reports the strongest status seen inside it
+_STATUS_RANK = {"cache": 1, "coalesced": 2, "fetched": 3}
+
+# Spans recorded for the current request (None when no trace is active)
+_TRACE: ContextVar[Optional[List[Dict[str, Any]]]] = ContextVar("weekender_trace", default=None)
+_SPAN: ContextVar[Optional[Dict[str, Any]]] = ContextVar("weekender_span", default=None)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: LabelValues, extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class Counter:
+    """Monotonic counter per label set."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[LabelValues, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, *labels: str) -> float:
+        with self._lock:
+            return self._values.get(labels, 0.0)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_labels(self.labelnames, k)} {_number(v)}" for k, v in items]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class Gauge(Counter):
+    """Current value per label set (can go down)."""
+
+    kind = "gauge"
+
+    def set(self, value: float, *labels: str) -> None:
+        with self._lock:
+            self._values[labels] = float(value)
+
+
+class Histogram:
+    """Cumulative-bucket histogram per label set (Prometheus semantics)."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [per-bucket counts..., +Inf count, sum]
+        self._values: Dict[LabelValues, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        with self._lock:
+            row = self._values.get(labels)
+            if row is None:
+                row = self._values[labels] = [0.0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    row[i] += 1
+                    break
+            else:
+                row[len(self.buckets)] += 1
+            row[-1] += value
+
+    def count(self, *labels: str) -> int:
+        with self._lock:
+            row = self._values.get(labels)
+            return int(sum(row[:-1])) if row else 0
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = sorted((k, list(v)) for k, v in self._values.items())
+        lines = []
+        for labels, row in items:
+            running = 0.0
+            for bound, hits in zip(self.buckets, row):
+                running += hits
+                le = 'le="' + _number(bound) + '"'
+                lines.append(
+                    f"{self.name}_bucket{_labels(self.labelnames, labels, le)} {_number(running)}"
+                )
+            running += row[len(self.buckets)]
+            inf = _labels(self.labelnames, labels, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{inf} {_number(running)}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, labels)} {_number(row[-1])}")
+            lines.append(
+                f"{self.name}_count{_labels(self.labelnames, labels)} {_number(running)}"
+            )
+        return lines
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+def _mark(status: str) -> None:
+    """Raise the status of the open span and its ancestors to at least ``status``."""
+    span = _SPAN.get()
+    while span is not None:
+        if _STATUS_RANK[status] > _STATUS_RANK.get(span["status"] or "", 0):
+            span["status"] = status
+        span = span["parent"]
+
+
+class _Timer:
+    """Observes elapsed seconds into ``histogram`` (when metrics are on) and records a span
+    in the active trace; counts ``errors`` on exceptions."""
+
+    __slots__ = ("histogram", "labels", "errors", "kind", "span", "token", "started")
+
+    def __init__(
+        self,
+        histogram: Optional[Histogram],
+        labels: LabelValues,
+        errors: Optional[Counter] = None,
+        kind: str = "stage",
+    ) -> None:
+        self.histogram = histogram
+        self.labels = labels
+        self.errors = errors
+        self.kind = kind
+        self.span: Optional[Dict[str, Any]] = None
+        self.token: Any = None
+        self.started = 0.0
+
+    def __enter__(self) -> "_Timer":
+        spans = _TRACE.get()
+        if spans is not None:
+            self.span = {
+                "name": self.labels[0],
+                "kind": self.kind,
+                "ms": 0.0,
+                "status": None,
+                "parent": _SPAN.get(),
+            }
+            spans.append(self.span)
+            self.token = _SPAN.set(self.span)
+            if self.kind == "upstream":
+                _mark("fetched")
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> bool:
+        elapsed = time.perf_counter() - self.started
+        if self.histogram is not None:
+            self.histogram.observe(elapsed, *self.labels)
+            if exc_type is not None and self.errors is not None:
+                self.errors.inc(*self.labels)
+        if self.span is not None:
+            self.span["ms"] = round(elapsed * 1000.0, 2)
+            if exc_type is not None:
+                self.span["status"] = "error"
+            _SPAN.reset(self.token)
+        return False
+
+
+STAGE_SECONDS = Histogram(
+    "weekender_stage_seconds", "Wall time per planner stage.", ("stage",)
+)
+UPSTREAM_SECONDS = Histogram(
+    "weekender_upstream_seconds", "Wall time per upstream call.", ("upstream",)
+)
+UPSTREAM_ERRORS = Counter(
+    "weekender_upstream_errors_total", "Upstream calls that raised.", ("upstream",)
+)
+CACHE_LOOKUPS = Counter(
+    "weekender_cache_lookups_total", "Cache lookups by cache and result.", ("cache", "result")
+)
+
+ADMISSION_IN_FLIGHT = Gauge(
+    "weekender_admission_in_flight", "Planner builds holding an admission slot."
+)
+ADMISSION_QUEUE_DEPTH = Gauge(
+    "weekender_admission_queue_depth", "Planner builds waiting for an admission slot."
+)
+ADMISSION_REJECTED = Counter(
+    "weekender_admission_rejected_total", "Requests shed with 503 by reason.", ("reason",)
+)
+
+REGISTRY: List[Any] = [
+    STAGE_SECONDS,
+    UPSTREAM_SECONDS,
+    UPSTREAM_ERRORS,
+    CACHE_LOOKUPS,
+    ADMISSION_IN_FLIGHT,
+    ADMISSION_QUEUE_DEPTH,
+    ADMISSION_REJECTED,
+]
+
+
+def metrics_enabled() -> bool:
+    return get_settings().metrics_enabled
+
+
+def stage(name: str) -> ContextManager[Any]:
+    """Time a planner stage: ``with stage("weather"): ...``."""
+    enabled = metrics_enabled()
+    if not enabled and _TRACE.get() is None:
+        return _NOOP
+    return _Timer(STAGE_SECONDS if enabled else None, (name,))
+
+
+def upstream(name: str) -> ContextManager[Any]:
+    """Time one upstream call and count it as an error if the block raises."""
+    enabled = metrics_enabled()
+    if not enabled and _TRACE.get() is None:
+        return _NOOP
+    return _Timer(
+        UPSTREAM_SECONDS if enabled else None, (name,), UPSTREAM_ERRORS, kind="upstream"
+    )
+
+
+def cache_lookup(cache: str, hit: bool) -> None:
+    if metrics_enabled():
+        CACHE_LOOKUPS.inc(cache, "hit" if hit else "miss")
+    if hit and _TRACE.get() is not None:
+        _mark("cache")
+
+
+def coalesced(cache: str) -> None:
+    """A cache miss that was filled by a concurrent caller's fetch (single-flight)."""
+    if metrics_enabled():
+        CACHE_LOOKUPS.inc(cache, "coalesced")
+    if _TRACE.get() is not None:
+        _mark("coalesced")
+
+
+@contextmanager
+def trace() -> Iterator[List[Dict[str, Any]]]:
+    """Record every stage/upstream span opened in this context (per request)."""
+    spans: List[Dict[str, Any]] = []
+    token = _TRACE.set(spans)
+    try:
+        yield spans
+    finally:
+        _TRACE.reset(token)
+
+
+def trace_timings(spans: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Spans as plain dicts ({name, kind, ms, status, parent}) for ``debug_timings``."""
+    return [
+        {
+            "name": s["name"],
+            "kind": s["kind"],
+            "ms": s["ms"],
+            "status": s["status"],
+            "parent": s["parent"]["name"] if s["parent"] else None,
+        }
+        for s in spans
+    ]
+
+
+def server_timing(spans: List[Dict[str, Any]], total_ms: float, cache_status: str) -> str:
+    """``Server-Timing`` header value: one entry per span plus the request total."""
+    parts = []
+    for s in spans:
+        name = s["name"] if s["kind"] == "stage" else f"{s['kind']}.{s['name']}"
+        entry = f"{name};dur={s['ms']:.1f}"
+        if s["status"]:
+            entry += f';desc="{s["status"]}"'
+        parts.append(entry)
+    parts.append(f'total;dur={total_ms:.1f};desc="{cache_status}"')
+    return ", ".join(parts)
+
+
+def render_prometheus() -> str:
+    """All metrics in the Prometheus text exposition format (version 0.0.4)."""
+    lines: List[str] = []
+    for metric in REGISTRY:
+        lines.append(f"# HELP {metric.name} {metric.help}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        lines.extend(metric.samples())
+    return "\n".join(lines) + "\n"
+
+
+def reset_metrics() -> None:
+    for metric in REGISTRY:
+        metric.clear()
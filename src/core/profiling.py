@@ -0,0 +1,358 @@
+"""
+Title: Request Profiling (Sampling Stack Profiler)
+Team: Purple Turtles — Gwen Li, Aadya Agarwal, Emma Peng, Noah Hicks
+Date: 2026-10-18
+Summary: Opt-in ASGI middleware that profiles a random fraction of requests and/or keeps the
+        profile of any request slower than a threshold. A background thread samples the
+        stacks of the threads serving profiled requests (the event loop plus threadpool
+        workers bound by ProfiledRoute), so nothing runs while no profiled request is in
+        flight. Profiles are folded stacks kept in a bounded on-disk ring buffer (shared by
+        every worker; ids carry the pid) and served at /api/debug/profiles.
+Disclaimer: This file includes AI-assisted content (GPT-5); reviewed and approved by the Purple Turtles team.
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+import functools
+import inspect
+import json
+import os
+import random
+import re
+import sys
+import tempfile
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from fastapi.routing import APIRoute
+
+from .config import get_settings
+
+
+MAX_STACK_DEPTH = 128
+TOP_FUNCTIONS = 15
+DEBUG_PATH_PREFIX = "/api/debug/profiles"
+
+# Leaf frames of an event loop waiting for I/O (selectors; uvloop waits inside C code)
+_IDLE_LEAVES = frozenset(
+    {
+        ("selectors.py", "select"),
+        ("selectors.py", "poll"),
+        ("runners.py", "run"),
+        ("base_events.py", "run_forever"),
+        ("base_events.py", "run_until_complete"),
+    }
+)
+# <start ms>-<pid>-<seq>: workers sharing PROFILE_DIR never write the same id
+_PROFILE_ID = re.compile(r"^\d{13}-\d+-\d{6}$")
+_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# The profile of the request being served (None when this request is not profiled)
+_ACTIVE: ContextVar[Optional["RequestProfile"]] = ContextVar("weekender_profile", default=None)
+
+
+def profiling_enabled() -> bool:
+    settings = get_settings()
+    return settings.profile_sample_rate > 0 or settings.profile_slow_ms > 0
+
+
+def profile_dir() -> str:
+    return get_settings().profile_dir or os.path.join(tempfile.gettempdir(), "weekender-profiles")
+
+
+def _short_path(filename: str) -> str:
+    if filename.startswith(_ROOT + os.sep):
+        return os.path.relpath(filename, _ROOT)
+    marker = f"{os.sep}site-packages{os.sep}"
+    if marker in filename:
+        return filename.split(marker, 1)[1]
+    return os.path.basename(filename)
+
+
+@functools.lru_cache(maxsize=4096)
+def _frame_label(filename: str, name: str, firstlineno: int) -> str:
+    # Semicolons separate frames in the folded format
+    return f"{name} ({_short_path(filename)}:{firstlineno})".replace(";", ":")
+
+
+def _idle(frame: Any) -> bool:
+    code = frame.f_code
+    return (os.path.basename(code.co_filename), code.co_name) in _IDLE_LEAVES
+
+
+def _stack(frame: Any) -> Tuple[str, ...]:
+    """Root-first frame labels of a thread's current stack."""
+    labels: List[str] = []
+    while frame is not None and len(labels) < MAX_STACK_DEPTH:
+        code = frame.f_code
+        labels.append(_frame_label(code.co_filename, code.co_name, code.co_firstlineno))
+        frame = frame.f_back
+    labels.reverse()
+    return tuple(labels)
+
+
+class RequestProfile:
+    """Stack samples for one request, from every thread bound to it."""
+
+    def __init__(self, method: str, path: str, loop_thread: Optional[int] = None) -> None:
+        self.method = method
+        self.path = path
+        # The server's event loop is bound to every in-flight profile; its idle waits are
+        # dropped (a worker thread waiting on I/O is still this request's time)
+        self.loop_thread = loop_thread
+        self.started = time.time()
+        self.threads: Dict[int, int] = {}  # thread ident -> bind depth
+        self.samples: Counter[Tuple[str, ...]] = Counter()
+        self.lock = threading.Lock()
+
+    def bind(self, ident: int) -> None:
+        with self.lock:
+            self.threads[ident] = self.threads.get(ident, 0) + 1
+
+    def unbind(self, ident: int) -> None:
+        with self.lock:
+            depth = self.threads.get(ident, 0) - 1
+            if depth > 0:
+                self.threads[ident] = depth
+            else:
+                self.threads.pop(ident, None)
+
+    def record(self, frames: Dict[int, Any]) -> None:
+        with self.lock:
+            idents = list(self.threads)
+        for ident in idents:
+            frame = frames.get(ident)
+            if frame is None or (ident == self.loop_thread and _idle(frame)):
+                continue
+            self.samples[_stack(frame)] += 1
+
+    def folded(self) -> str:
+        """Brendan Gregg's collapsed-stack lines (flamegraph.pl, speedscope)."""
+        return "\n".join(
+            f"{';'.join(stack)} {count}" for stack, count in self.samples.most_common()
+        )
+
+    def top_functions(self, limit: int = TOP_FUNCTIONS) -> List[Dict[str, Any]]:
+        """Functions by samples on-CPU-or-waiting (self) and anywhere on the stack (total)."""
+        own: Counter[str] = Counter()
+        total: Counter[str] = Counter()
+        for stack, count in self.samples.items():
+            own[stack[-1]] += count
+            for label in set(stack):
+                total[label] += count
+        return [
+            {"function": label, "self": own[label], "total": count}
+            for label, count in total.most_common()
+            if own[label]
+        ][:limit]
+
+
+class _Sampler:
+    """One daemon thread; samples only while at least one profile is active."""
+
+    def __init__(self) -> None:
+        self._active: List[RequestProfile] = []
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self, profile: RequestProfile) -> None:
+        with self._lock:
+            self._active.append(profile)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="request-profiler", daemon=True
+                )
+                self._thread.start()
+        self._wake.set()
+
+    def stop(self, profile: RequestProfile) -> None:
+        with self._lock:
+            if profile in self._active:
+                self._active.remove(profile)
+
+    def _run(self) -> None:
+        me = threading.get_ident()
+        while True:
+            with self._lock:
+                active = list(self._active)
+                if not active:
+                    self._wake.clear()
+            if not active:
+                self._wake.wait()
+                continue
+            frames = sys._current_frames()
+            frames.pop(me, None)
+            for profile in active:
+                profile.record(frames)
+            del frames
+            time.sleep(max(get_settings().profile_interval_ms, 1) / 1000.0)
+
+
+_SAMPLER = _Sampler()
+
+
+@contextmanager
+def bind_thread() -> Iterator[None]:
+    """Attribute this thread's stack to the current request's profile, if any."""
+    profile = _ACTIVE.get()
+    if profile is None:
+        yield
+        return
+    ident = threading.get_ident()
+    profile.bind(ident)
+    try:
+        yield
+    finally:
+        profile.unbind(ident)
+
+
+def _bound(endpoint: Callable[..., Any]) -> Callable[..., Any]:
+    @functools.wraps(endpoint)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        with bind_thread():
+            return endpoint(*args, **kwargs)
+
+    return wrapper
+
+
+class ProfiledRoute(APIRoute):
+    """Sync endpoints run on threadpool workers; bind those threads to the request's profile
+    (the signature is preserved through ``__wrapped__``)."""
+
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any) -> None:
+        if not inspect.iscoroutinefunction(endpoint):
+            endpoint = _bound(endpoint)
+        super().__init__(path, endpoint, **kwargs)
+
+
+class ProfileStore:
+    """At most ``keep`` profiles as JSON files; the oldest are deleted first."""
+
+    def __init__(self, directory: str, keep: int) -> None:
+        self.directory = directory
+        self.keep = max(keep, 1)
+        self._seq = 0
+        self._lock = threading.Lock()
+
+    def _ids(self) -> List[str]:
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return []
+        return sorted(n[:-5] for n in names if n.endswith(".json") and _PROFILE_ID.match(n[:-5]))
+
+    def save(self, record: Dict[str, Any]) -> str:
+        with self._lock:
+            self._seq = (self._seq + 1) % 1_000_000
+            profile_id = f"{int(record['started'] * 1000):013d}-{os.getpid()}-{self._seq:06d}"
+            os.makedirs(self.directory, exist_ok=True)
+            path = os.path.join(self.directory, f"{profile_id}.json")
+            tmp = f"{path}.tmp"
+            with open(tmp, "w", encoding="utf-8") as fh:
+                json.dump({"id": profile_id, **record}, fh)
+            os.replace(tmp, path)
+            for old in self._ids()[: -self.keep]:
+                try:
+                    os.remove(os.path.join(self.directory, f"{old}.json"))
+                except FileNotFoundError:
+                    pass
+        return profile_id
+
+    def list(self) -> List[Dict[str, Any]]:
+        """Newest first, without the stacks."""
+        out = []
+        for profile_id in reversed(self._ids()):
+            record = self.get(profile_id)
+            if record is not None:
+                record.pop("folded", None)
+                record.pop("top", None)
+                out.append(record)
+        return out
+
+    def get(self, profile_id: str) -> Optional[Dict[str, Any]]:
+        if not _PROFILE_ID.match(profile_id):
+            return None
+        try:
+            with open(os.path.join(self.directory, f"{profile_id}.json"), encoding="utf-8") as fh:
+                return json.load(fh)
+        except (FileNotFoundError, ValueError):
+            return None
+
+
+_STORE: Optional[ProfileStore] = None
+_STORE_LOCK = threading.Lock()
+
+
+def get_profile_store() -> ProfileStore:
+    global _STORE
+    with _STORE_LOCK:
+        directory, keep = profile_dir(), get_settings().profile_keep
+        if _STORE is None or (_STORE.directory, _STORE.keep) != (directory, max(keep, 1)):
+            _STORE = ProfileStore(directory, keep)
+        return _STORE
+
+
+class ProfilingMiddleware:
+    """Profiles PROFILE_SAMPLE_RATE of requests, plus any request over PROFILE_SLOW_MS.
+
+    With a slow threshold every request is sampled (stack snapshots every
+    PROFILE_INTERVAL_MS) and only slow ones are kept; without one, unsampled requests
+    pass straight through.
+    """
+
+    def __init__(self, app: Any) -> None:
+        self.app = app
+        self._random = random.Random()
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http" or scope["path"].startswith(DEBUG_PATH_PREFIX):
+            await self.app(scope, receive, send)
+            return
+        settings = get_settings()
+        sampled = self._random.random() < settings.profile_sample_rate
+        if not sampled and settings.profile_slow_ms <= 0:
+            await self.app(scope, receive, send)
+            return
+
+        loop_thread = threading.get_ident()
+        profile = RequestProfile(scope["method"], scope["path"], loop_thread)
+        status = {"code": 500}
+
+        async def send_wrapper(message: Dict[str, Any]) -> None:
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        token = _ACTIVE.set(profile)
+        profile.bind(loop_thread)  # async endpoints and middleware
+        _SAMPLER.start(profile)
+        t0 = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed_ms = (time.perf_counter() - t0) * 1000.0
+            _SAMPLER.stop(profile)
+            profile.unbind(loop_thread)
+            _ACTIVE.reset(token)
+            slow = 0 < settings.profile_slow_ms <= elapsed_ms
+            if sampled or slow:
+                get_profile_store().save(
+                    {
+                        "method": profile.method,
+                        "path": profile.path,
+                        "query": scope.get("query_string", b"").decode("latin-1"),
+                        "status": status["code"],
+                        "duration_ms": round(elapsed_ms, 1),
+                        "reason": "slow" if slow else "sampled",
+                        "started": profile.started,
+                        "interval_ms": settings.profile_interval_ms,
+                        "samples": sum(profile.samples.values()),
+                        "top": profile.top_functions(),
+                        "folded": profile.folded(),
+                    }
+                )
@@ -6,36 +6,86 @@ Summary: Creates the FastAPI app, configures logging, and includes routes.
 Disclaimer: This file includes AI-assisted content (GPT-5); reviewed and approved by the Purple Turtles team.
 """
 
+import anyio.to_thread
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 import logging
 
 logging.basicConfig(level=logging.DEBUG)
+from src.api.admission import threadpool_size
 from src.core.config import get_settings
 from src.core.logging_config import configure_logging
+from src.core.profiling import ProfilingMiddleware, profiling_enabled
 from src.api.routes import router as api_router
+from src.services.planner import claim_crawl, ingest_crawled_events
+from src.services.warmup import prewarm
 from fastapi import FastAPI, Request
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.responses import HTMLResponse
-from fastapi.templating import Jinja2Templates
+from functools import lru_cache
 import os
 
 
+@lru_cache(maxsize=1)
+def _templates():
+    # jinja2 loads with the first homepage request, not with every worker
+    from fastapi.templating import Jinja2Templates
+
+    # Template directory is one level above src
+    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return Jinja2Templates(directory=os.path.join(base_dir, "templates"))
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    settings = get_settings()
+    # Planner routes are sync; size the threadpool so admission-queued builds cannot use
+    # every worker and starve cache hits
+    limiter = anyio.to_thread.current_default_thread_limiter()
+    limiter.total_tokens = threadpool_size(limiter.total_tokens)
+    # Build TLS/parser/store state before the first request instead of at import
+    if settings.prewarm_enabled:
+        await asyncio.to_thread(prewarm)
+
+    # Crawling runs beside the server, never inside a request; results land in the event
+    # store. Every worker starts the loop, but a run claim in that store lets only one crawl.
+    crawler = None
+    if settings.crawler_enabled:
+        from src.services.crawler import crawl_forever
+
+        crawler = asyncio.create_task(
+            crawl_forever(sink=ingest_crawled_events, claim=claim_crawl)
+        )
+    try:
+        yield
+    finally:
+        if crawler is not None:
+            crawler.cancel()
+            await asyncio.gather(crawler, return_exceptions=True)
+
+
 def create_app() -> FastAPI:
     configure_logging()
     settings = get_settings()
-    app = FastAPI(title=settings.app_name)
+    app = FastAPI(title=settings.app_name, lifespan=lifespan)
+
+    # Itinerary payloads are large and repetitive JSON; gzip cuts bytes on the wire
+    if settings.gzip_minimum_size > 0:
+        app.add_middleware(GZipMiddleware, minimum_size=settings.gzip_minimum_size)
+
+    # Opt-in sampling profiler for a fraction of requests and/or slow ones
+    if profiling_enabled():
+        app.add_middleware(ProfilingMiddleware)
 
     # Register existing API routes
     app.include_router(api_router, prefix="/api")
 
-    # Configure template directory (one level above src)
-    BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    templates = Jinja2Templates(directory=os.path.join(BASE_DIR, "templates"))
-
     # Add homepage route
     @app.get("/", response_class=HTMLResponse)
     async def read_root(request: Request):
         print("✅ Homepage route called successfully!")
-        return templates.TemplateResponse("index.html", {"request": request})
+        return _templates().TemplateResponse("index.html", {"request": request})
 
     return app
 
@@ -7,7 +7,7 @@ Disclaimer: This file includes AI-assisted content (GPT-5); reviewed and approve
 """
 
 from datetime import datetime, time, timedelta
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional
 from pydantic import BaseModel, Field, ConfigDict
 
 
@@ -111,6 +111,10 @@ class ItineraryRequest(BaseModel):
         5,
         description="Maximum distance from origin in miles for included activities (default: 5)",
     )
+    snapshot_id: Optional[str] = Field(
+        None,
+        description="Reuse candidates from a prior response's snapshot_id (same city, dates and address)",
+    )
 
 
 class ItineraryResponse(BaseModel):
@@ -121,6 +125,12 @@ class ItineraryResponse(BaseModel):
     sources: Dict[str, int] = Field(
         default_factory=dict, description="counts of items by source"
     )
+    snapshot_id: Optional[str] = Field(
+        None, description="candidate snapshot to pass back for fast re-planning"
+    )
+    debug_timings: Optional[List[Dict[str, Any]]] = Field(
+        None, description="per-stage/upstream spans (ms, cache|coalesced|fetched) when requested"
+    )
 
 
 class EventItem(BaseModel):
@@ -137,6 +147,17 @@ class ItineraryOptionsResponse(BaseModel):
     options: List[ItineraryResponse]
     warnings: List[str] = Field(default_factory=list)
     used_sources: Dict[str, int] = Field(default_factory=dict)
+    snapshot_id: Optional[str] = Field(
+        None, description="candidate snapshot to pass back for fast re-planning"
+    )
+    debug_timings: Optional[List[Dict[str, Any]]] = Field(
+        None, description="per-stage/upstream spans (ms, cache|coalesced|fetched) when requested"
+    )
+
+
+class PlanResponse(BaseModel):
+    start_date: str
+    activities: ItineraryResponse
 
 
 class YelpSearchResponse(BaseModel):
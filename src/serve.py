@@ -0,0 +1,78 @@
+"""
+Title: Server Launcher (Config Profiles)
+Team: Purple Turtles — Gwen Li, Aadya Agarwal, Emma Peng, Noah Hicks
+Date: 2026-10-18
+Summary: Runs uvicorn from one of the config/uvicorn*.ini profiles: [server] keys are uvicorn
+        options (e.g. ``workers``), [env] sets defaults for every worker's settings. Values in
+        the real environment or .env take precedence over the profile.
+Disclaimer: This file includes AI-assisted content (GPT-5); reviewed and approved by the Purple Turtles team.
+
+Run: python -m src.serve config/uvicorn.prod.ini
+"""
+
+from __future__ import annotations
+
+import argparse
+import ast
+import configparser
+import os
+from typing import Any, Dict, Tuple
+
+APP = "src.main:app"
+
+
+def _value(raw: str) -> Any:
+    """Profile values are Python/TOML-style literals: "text", 8000, true/false."""
+    text = raw.strip()
+    lowered = text.lower()
+    if lowered in ("true", "false"):
+        return lowered == "true"
+    try:
+        return ast.literal_eval(text)
+    except (ValueError, SyntaxError):
+        return text
+
+
+def load_profile(path: str) -> Tuple[Dict[str, Any], Dict[str, str]]:
+    """(uvicorn keyword options, environment defaults) from an ini profile."""
+    parser = configparser.ConfigParser()
+    if not parser.read(path, encoding="utf-8"):
+        raise FileNotFoundError(path)
+    server = {
+        key.replace("-", "_"): _value(raw)
+        for key, raw in (parser.items("server") if parser.has_section("server") else [])
+    }
+    server.pop("factory", None)  # APP is a module-level instance
+    env = {
+        key.upper(): str(_value(raw))
+        for key, raw in (parser.items("env") if parser.has_section("env") else [])
+    }
+    return server, env
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run the API from a uvicorn ini profile")
+    parser.add_argument("profile", nargs="?", default="config/uvicorn.ini")
+    parser.add_argument("--workers", type=int, default=None, help="override the profile")
+    args = parser.parse_args()
+
+    server, env = load_profile(args.profile)
+    if args.workers is not None:
+        server["workers"] = args.workers
+
+    try:
+        from dotenv import load_dotenv
+
+        load_dotenv()  # never overrides variables that are already set
+    except Exception:  # pragma: no cover
+        pass
+    for key, value in env.items():
+        os.environ.setdefault(key, value)  # spawned workers inherit the environment
+
+    import uvicorn
+
+    uvicorn.run(APP, **server)
+
+
+if __name__ == "__main__":
+    main()
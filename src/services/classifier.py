@@ -10,9 +10,12 @@ from __future__ import annotations
 
 from typing import Optional, Iterable, List, Dict
 import asyncio
+import hashlib
 import json
 
+from ..core.cache import make_cache
 from ..core.config import get_settings
+from ..core.metrics import cache_lookup, upstream
 
 
 INDOOR_WORDS = {
@@ -56,6 +59,14 @@ OUTDOOR_WORDS = {
 }
 
 
+# OpenAI answers by model + text; shared across workers with a shared CACHE_BACKEND
+_LABELS = make_cache("classification", 8192, get_settings().classifier_cache_ttl_seconds)
+
+
+def _label_key(model: str, text: str) -> str:
+    return f"{model}:{hashlib.sha1(text.encode('utf-8')).hexdigest()}"
+
+
 def classify_environment_heuristic(text: str) -> str:
     lowered = text.lower()
     # Score by counts to break ties instead of returning unknown when both present
@@ -86,10 +97,16 @@ def classify_environment(text: str) -> str:
     if not key or key.startswith("changeme"):
         return "unknown"
 
+    label_key = _label_key(settings.openai_model, text[:800])
+    cached = _LABELS.get(label_key)
+    cache_lookup("classification", cached is not None)
+    if cached is not None:
+        return cached
+
     try:
         from openai import OpenAI
 
-        client = OpenAI(api_key=key)
+        client = OpenAI(api_key=key, base_url=settings.openai_base_url or None)
         system = (
             "You are an environment classifier. Return only a JSON object with a 'label' "
             "field that is either 'indoor' or 'outdoor'. Choose the most plausible one; "
@@ -100,18 +117,20 @@ def classify_environment(text: str) -> str:
             "Classify the following text. Return JSON only. Text: " + text[:800]
         )
         # Ask for a single-word answer; models often follow this reliably.
-        resp = client.chat.completions.create(
-            model=settings.openai_model,
-            messages=[
-                {"role": "system", "content": (
-                    "Answer with exactly one word: 'indoor' or 'outdoor'. No punctuation or extra words."
-                )},
-                {"role": "user", "content": user},
-            ],
-            max_completion_tokens=settings.openai_max_completion_tokens,
-        )
+        with upstream("openai"):
+            resp = client.chat.completions.create(
+                model=settings.openai_model,
+                messages=[
+                    {"role": "system", "content": (
+                        "Answer with exactly one word: 'indoor' or 'outdoor'. No punctuation or extra words."
+                    )},
+                    {"role": "user", "content": user},
+                ],
+                max_completion_tokens=settings.openai_max_completion_tokens,
+            )
         content = (resp.choices[0].message.content or "").strip().lower()
         if content in {"indoor", "outdoor"}:
+            _LABELS.set(label_key, content)
             return content
 
         # Final fallback: keep unknown if model didn't comply
@@ -153,46 +172,58 @@ async def classify_environment_batch(texts: Iterable[str]) -> List[str]:
     if not key or key.startswith("changeme"):
         return heuristic_labels
 
-    try:
-        from openai import AsyncOpenAI  # type: ignore
-    except Exception:
-        return heuristic_labels
-
-    client = AsyncOpenAI(api_key=key)
-
     # Deduplicate prompts
     index_to_prompt: Dict[int, str] = {i: items[i][:800] for i in needs_refinement_indexes}
     unique_prompts: Dict[str, List[int]] = {}
     for idx, prompt in index_to_prompt.items():
         unique_prompts.setdefault(prompt, []).append(idx)
 
+    # Labels already answered (by any worker) skip the API
+    results_by_prompt: Dict[str, str] = {}
+    for prompt in unique_prompts:
+        cached = _LABELS.get(_label_key(settings.openai_model, prompt))
+        cache_lookup("classification", cached is not None)
+        if cached is not None:
+            results_by_prompt[prompt] = cached
+
+    misses = [p for p in unique_prompts if p not in results_by_prompt]
+    client = None
+    if misses:
+        try:
+            from openai import AsyncOpenAI  # type: ignore
+
+            client = AsyncOpenAI(api_key=key, base_url=settings.openai_base_url or None)
+        except Exception:
+            misses = []  # unrefined prompts stay "unknown"
+
     semaphore = asyncio.Semaphore(max(1, int(getattr(settings, "openai_concurrency", 8))))
 
     async def classify_one(prompt_text: str) -> str:
         async with semaphore:
             try:
-                resp = await client.chat.completions.create(
-                    model=settings.openai_model,
-                    messages=[
-                        {"role": "system", "content": (
-                            "Answer with exactly one word: 'indoor' or 'outdoor'. No punctuation or extra words."
-                        )},
-                        {"role": "user", "content": (
-                            "Classify the following text. Return only one word. Text: " + prompt_text
-                        )},
-                    ],
-                    max_completion_tokens=settings.openai_max_completion_tokens,
-                )
+                with upstream("openai"):
+                    resp = await client.chat.completions.create(
+                        model=settings.openai_model,
+                        messages=[
+                            {"role": "system", "content": (
+                                "Answer with exactly one word: 'indoor' or 'outdoor'. No punctuation or extra words."
+                            )},
+                            {"role": "user", "content": (
+                                "Classify the following text. Return only one word. Text: " + prompt_text
+                            )},
+                        ],
+                        max_completion_tokens=settings.openai_max_completion_tokens,
+                    )
                 content = (resp.choices[0].message.content or "").strip().lower()
                 if content in {"indoor", "outdoor"}:
+                    _LABELS.set(_label_key(settings.openai_model, prompt_text), content)
                     return content
                 return "unknown"
             except Exception:
                 return "unknown"
 
     # Launch tasks for unique prompts
-    tasks: Dict[str, asyncio.Task[str]] = {p: asyncio.create_task(classify_one(p)) for p in unique_prompts}
-    results_by_prompt: Dict[str, str] = {}
+    tasks: Dict[str, asyncio.Task[str]] = {p: asyncio.create_task(classify_one(p)) for p in misses}
     for prompt, task in tasks.items():
         try:
             results_by_prompt[prompt] = await task
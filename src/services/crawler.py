@@ -0,0 +1,313 @@
+"""
+Title: Background Event Crawler
+Team: Purple Turtles — Gwen Li, Aadya Agarwal, Emma Peng, Noah Hicks
+Date: 2026-10-18
+Summary: Async crawler around the VisitPittsburgh scraper. Follows listing pages (next week,
+        venue calendars) and event detail pages from a URL frontier with per-host concurrency
+        limits, polite delays, robots.txt and canonical-URL de-duplication; events go to a sink.
+Disclaimer: This file includes AI-assisted content (GPT-5); reviewed and approved by the Purple Turtles team.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import re
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+from urllib.robotparser import RobotFileParser
+
+import httpx
+from lxml import etree
+
+from ..core.config import get_settings
+from ..core.http import canonical_url
+from .visitpgh_scraper import VISIT_PGH_URL, parse_events_html
+
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT = "weekender-crawler/1.0"
+
+# How often crawl_forever asks for the next round when runs are claimed
+CLAIM_POLL_SECONDS = 300
+
+# Receives each batch of new or enriched events (dicts keyed like the scraper's output)
+EventSink = Callable[[List[Dict[str, Any]]], None]
+
+# Links worth following as further listings: next week, paging, venue calendars
+_LISTING_HINT = re.compile(
+    r"next|this-week|week|calendar|/page/\d+|[?&]page=\d+|venue", re.IGNORECASE
+)
+_SKIP_EXTENSIONS = (".jpg", ".jpeg", ".png", ".gif", ".svg", ".pdf", ".ics", ".zip", ".mp4")
+
+# Latest crawl output for the default sink
+_CRAWLED: Dict[str, Dict[str, Any]] = {}
+_CRAWLED_LOCK = threading.Lock()
+
+
+def _parse_tree(html: str) -> Optional[Any]:
+    if not html or not html.strip():
+        return None
+    parser = etree.HTMLParser()
+    parser.feed(html)
+    return parser.close()
+
+
+def _element_text(el: Any) -> str:
+    return " ".join(" ".join(el.itertext()).split())
+
+
+def extract_links(html: str, base_url: str) -> List[Tuple[str, str]]:
+    """Return ``(canonical_url, anchor_text)`` for every ``a[href]`` in the main content."""
+    root = _parse_tree(html)
+    if root is None:
+        return []
+    main = next(root.iter("main"), root)
+    links: List[Tuple[str, str]] = []
+    for a in main.iter("a"):
+        url = canonical_url(a.get("href") or "", base_url)
+        if url and not urlsplit(url).path.lower().endswith(_SKIP_EXTENSIONS):
+            links.append((url, _element_text(a)))
+    return links
+
+
+def parse_event_detail_html(html: str, url: str) -> Optional[Dict[str, Any]]:
+    """Extract a single event ({title, details, url, start}) from an event detail page."""
+    root = _parse_tree(html)
+    if root is None:
+        return None
+    meta = {
+        (m.get("property") or m.get("name") or "").lower(): m.get("content")
+        for m in root.iter("meta")
+    }
+    main = next(root.iter("main"), root)
+    h1 = next(main.iter("h1"), None)
+    title = (_element_text(h1) if h1 is not None else "") or (meta.get("og:title") or "").strip()
+    if not title:
+        return None
+
+    time_el = next(main.iter("time"), None)
+    start = time_el.get("datetime") if time_el is not None else None
+    details = None
+    for el in main.iter("time", "p"):
+        txt = _element_text(el)
+        if len(txt) > 6:
+            details = txt
+            break
+    details = details or meta.get("og:description") or meta.get("description")
+    return {"title": title, "details": details, "url": url, "start": start}
+
+
+class _HostGate:
+    """Per-host concurrency limit plus a minimum spacing between request starts."""
+
+    def __init__(self, concurrency: int, delay_seconds: float) -> None:
+        self._sem = asyncio.Semaphore(max(1, concurrency))
+        self._lock = asyncio.Lock()
+        self._next_start = 0.0
+        self._delay = max(0.0, delay_seconds)
+
+    async def __aenter__(self) -> "_HostGate":
+        await self._sem.acquire()
+        loop = asyncio.get_running_loop()
+        async with self._lock:
+            wait = self._next_start - loop.time()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            self._next_start = loop.time() + self._delay
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        self._sem.release()
+
+
+async def crawl_events(
+    seeds: Optional[List[str]] = None,
+    sink: Optional[EventSink] = None,
+    client: Optional[httpx.AsyncClient] = None,
+    max_pages: Optional[int] = None,
+    max_depth: Optional[int] = None,
+) -> Dict[str, int]:
+    """Crawl from ``seeds`` and push discovered events to ``sink``; returns crawl counters.
+
+    Only hosts of the seed URLs are visited. Seed and listing pages are parsed with the
+    scraper's heading extractor; event links found there are fetched as detail pages and
+    merged into the listing entry. Each event is emitted again only when it gained data.
+    """
+    settings = get_settings()
+    seeds = seeds or _seed_urls()
+    sink = sink or remember_events
+    max_pages = settings.crawler_max_pages if max_pages is None else max_pages
+    max_depth = settings.crawler_max_depth if max_depth is None else max_depth
+
+    allowed_hosts = {urlsplit(u).netloc for u in (canonical_url(s) for s in seeds) if u}
+    gates: Dict[str, _HostGate] = {}
+    robots: Dict[str, Optional[RobotFileParser]] = {}
+    robots_lock = asyncio.Lock()
+    frontier: asyncio.Queue = asyncio.Queue()
+    seen: set = set()
+    found: Dict[str, Dict[str, Any]] = {}
+    stats = {"fetched": 0, "failed": 0, "blocked": 0, "events": 0, "emitted": 0}
+
+    def enqueue(url: Optional[str], kind: str, depth: int) -> None:
+        if not url or url in seen or len(seen) >= max_pages:
+            return
+        if urlsplit(url).netloc not in allowed_hosts:
+            return
+        seen.add(url)
+        frontier.put_nowait((url, kind, depth))
+
+    def gate_for(host: str) -> _HostGate:
+        if host not in gates:
+            gates[host] = _HostGate(
+                settings.crawler_per_host_concurrency, settings.crawler_delay_seconds
+            )
+        return gates[host]
+
+    async def allowed(http: httpx.AsyncClient, url: str) -> bool:
+        parts = urlsplit(url)
+        async with robots_lock:
+            if parts.netloc not in robots:
+                robots[parts.netloc] = None
+                try:
+                    async with gate_for(parts.netloc):
+                        resp = await http.get(f"{parts.scheme}://{parts.netloc}/robots.txt")
+                    if resp.status_code == 200:
+                        parser = RobotFileParser()
+                        parser.parse(resp.text.splitlines())
+                        robots[parts.netloc] = parser
+                except httpx.HTTPError:
+                    pass  # unreachable robots.txt: crawl as if none were published
+        parser = robots[parts.netloc]
+        return parser is None or parser.can_fetch(USER_AGENT, url)
+
+    async def emit(events: List[Dict[str, Any]], page_url: str) -> None:
+        batch = []
+        for e in events:
+            url = canonical_url(e.get("url") or "", page_url)
+            key = url or "title:" + e["title"].lower()
+            current = found.get(key)
+            merged = dict(current or {"source": "visitpgh"})
+            merged.update({k: v for k, v in e.items() if v})
+            merged["url"] = url or merged.get("url")
+            if merged != current:
+                found[key] = merged
+                batch.append(dict(merged))
+        if batch:
+            stats["emitted"] += len(batch)
+            # Sinks may block (SQLite, classification); keep them off the event loop
+            await asyncio.to_thread(sink, batch)
+
+    async def handle(http: httpx.AsyncClient, url: str, kind: str, depth: int) -> None:
+        if not await allowed(http, url):
+            stats["blocked"] += 1
+            return
+        try:
+            async with gate_for(urlsplit(url).netloc):
+                resp = await http.get(url)
+            resp.raise_for_status()
+        except httpx.HTTPError:
+            stats["failed"] += 1
+            return
+        stats["fetched"] += 1
+        html = resp.text
+
+        if kind == "detail":
+            event = parse_event_detail_html(html, url)
+            if event:
+                await emit([event], url)
+            return
+
+        events = parse_events_html(html)
+        await emit(events, url)
+        if depth >= max_depth:
+            return
+        for e in events:
+            enqueue(canonical_url(e.get("url") or "", url), "detail", depth + 1)
+        for link, text in extract_links(html, url):
+            if _LISTING_HINT.search(link) or _LISTING_HINT.search(text):
+                enqueue(link, "listing", depth + 1)
+
+    async def worker(http: httpx.AsyncClient) -> None:
+        while True:
+            url, kind, depth = await frontier.get()
+            try:
+                await handle(http, url, kind, depth)
+            except Exception:  # keep the crawl alive on parser surprises
+                stats["failed"] += 1
+                logger.exception("crawler: failed to process %s", url)
+            finally:
+                frontier.task_done()
+
+    for seed in seeds:
+        enqueue(canonical_url(seed), "listing", 0)
+
+    own_client = client is None
+    http = client or httpx.AsyncClient(
+        timeout=settings.crawler_timeout_seconds,
+        headers={"User-Agent": USER_AGENT},
+        follow_redirects=True,
+    )
+    workers = [
+        asyncio.create_task(worker(http)) for _ in range(max(1, settings.crawler_concurrency))
+    ]
+    try:
+        await frontier.join()
+    finally:
+        for w in workers:
+            w.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        if own_client:
+            await http.aclose()
+
+    stats["events"] = len(found)
+    stats["pages"] = len(seen)
+    return stats
+
+
+async def crawl_forever(
+    sink: Optional[EventSink] = None, claim: Optional[Callable[[float], bool]] = None
+) -> None:
+    """Re-crawl every CRAWLER_INTERVAL_SECONDS until cancelled (app lifespan task).
+
+    With ``claim`` (called with the interval before each round), only the caller it grants
+    the round crawls. Under several server workers that keeps one crawl per interval, so
+    per-host limits and robots.txt state are those of a single crawler, not one per worker.
+    """
+    while True:
+        interval = max(60, get_settings().crawler_interval_seconds)
+        try:
+            if claim is None or await asyncio.to_thread(claim, interval):
+                stats = await crawl_events(sink=sink)
+                logger.info("crawler: %s", stats)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("crawler: crawl failed")
+        # Claimants re-check often so a round is not missed when its last winner exits
+        await asyncio.sleep(interval if claim is None else min(interval, CLAIM_POLL_SECONDS))
+
+
+def _seed_urls() -> List[str]:
+    raw = get_settings().crawler_seed_urls
+    seeds = [u.strip() for u in raw.split(",") if u.strip()]
+    return seeds or [VISIT_PGH_URL]
+
+
+def remember_events(events: List[Dict[str, Any]]) -> None:
+    """Default sink: keep the latest crawl results in memory, keyed by canonical URL/title."""
+    with _CRAWLED_LOCK:
+        for e in events:
+            _CRAWLED[e.get("url") or "title:" + e["title"].lower()] = dict(e)
+
+
+def crawled_events() -> List[Dict[str, Any]]:
+    with _CRAWLED_LOCK:
+        return [dict(e) for e in _CRAWLED.values()]
+
+
+def clear_crawled_events() -> None:
+    with _CRAWLED_LOCK:
+        _CRAWLED.clear()
@@ -0,0 +1,231 @@
+"""
+Title: Event Date Extraction
+Team: Purple Turtles — Gwen Li, Aadya Agarwal, Emma Peng, Noah Hicks
+Date: 2026-10-18
+Summary: Pulls event days out of scraped text ("Friday – Sunday", "Sep 12–14", "9/14",
+        "Daily through Oct 26") with precompiled regexes and a per-text memo; fuzzy dateutil
+        parsing is only the last resort. Ranges expand to every day they cover.
+Disclaimer: This file includes AI-assisted content (GPT-5); reviewed and approved by the Purple Turtles team.
+"""
+
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+import re
+from typing import List, NamedTuple, Optional, Tuple
+
+from dateutil import parser as date_parser
+
+from .optimizer import WEEKDAY_NAMES
+
+
+MAX_RANGE_DAYS = 92  # longer runs stop expanding after about a season
+PAST_GRACE_DAYS = 60  # a year-less date further back than this means next year
+
+_MONTHS = {
+    "jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6,
+    "jul": 7, "aug": 8, "sep": 9, "oct": 10, "nov": 11, "dec": 12,
+}
+_WEEKDAY_ABBR = {
+    "mon": 0, "tue": 1, "tues": 1, "wed": 2, "thu": 3, "thur": 3, "thurs": 3,
+    "fri": 4, "sat": 5, "sun": 6,
+}
+
+_MONTH = (
+    r"(?P<{n}>jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?"
+    r"|sept?(?:ember)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)\.?"
+)
+_DAY = r"(?P<{n}>[0-3]?\d)(?:st|nd|rd|th)?(?!\s*:|\d)"
+_YEAR = r"(?:,?\s*(?P<{n}>20\d\d))?"
+_DASH = r"\s*(?:-|–|—|to|through|thru|until)\s*"
+
+_MONTH_RANGE_RE = re.compile(
+    r"\b" + _MONTH.format(n="m1") + r"\s+" + _DAY.format(n="d1") + _YEAR.format(n="y1")
+    + _DASH
+    + r"(?:" + _MONTH.format(n="m2") + r"\s+)?" + _DAY.format(n="d2") + _YEAR.format(n="y2")
+    + r"\b",
+    re.IGNORECASE,
+)
+_MONTH_DAY_RE = re.compile(
+    r"(?<!\w)" + _MONTH.format(n="m") + r"\s+" + _DAY.format(n="d") + _YEAR.format(n="y")
+    + r"\b",
+    re.IGNORECASE,
+)
+_UNTIL_RE = re.compile(
+    r"\b(?:through|thru|until|till)\s+" + _MONTH.format(n="m") + r"\s+" + _DAY.format(n="d")
+    + _YEAR.format(n="y") + r"\b",
+    re.IGNORECASE,
+)
+_NUMERIC_RE = re.compile(
+    r"(?<![\d/])(?P<m>1[0-2]|0?[1-9])/(?P<d>3[01]|[12]\d|0?[1-9])(?:/(?P<y>(?:20)?\d\d))?(?![\d/])"
+)
+_WEEKDAY = (
+    r"(?P<{n}>(?:mon|tues|wednes|thurs|fri|satur|sun)days?"
+    r"|(?:Mon|Tues?|Wed|Thu(?:rs?)?|Fri|Sat|Sun)\b\.?)"
+)
+_WEEKDAY_RANGE_RE = re.compile(
+    r"\b" + _WEEKDAY.format(n="w1")
+    + r"\s*(?:-|–|—|to|through|thru)\s*"
+    + _WEEKDAY.format(n="w2"),
+    re.IGNORECASE,
+)
+_WEEKDAY_RE = re.compile(
+    r"\b(?P<full>(?:mon|tues|wednes|thurs|fri|satur|sun)day)s?\b"
+    r"|\b(?P<abbr>Mon|Tues?|Wed|Thu(?:rs?)?|Fri|Sat|Sun)\b\.?(?=\s*(?:[,–—-]|\d))",
+    re.IGNORECASE,
+)
+_DIGIT_RE = re.compile(r"\d")
+_WEEKEND_RE = re.compile(r"\bweekends?\b", re.IGNORECASE)
+_MONTH_WORD_RE = re.compile(
+    r"\b(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\b", re.IGNORECASE
+)
+
+
+class EventDays(NamedTuple):
+    """Weekday names (in order of occurrence) and explicit calendar dates found in text."""
+
+    weekdays: Tuple[str, ...]
+    dates: Tuple[date, ...]
+
+
+def _month(token: str) -> int:
+    return _MONTHS[token[:3].lower()]
+
+
+def _weekday_index(token: str) -> int:
+    word = token.lower().rstrip(".")
+    if word.endswith("s") and word.endswith("days"):
+        word = word[:-1]
+    if word.endswith("day"):
+        return WEEKDAY_NAMES.index(word)
+    return _WEEKDAY_ABBR[word]
+
+
+def _resolve(month: int, day: int, year: Optional[str], today: date) -> Optional[date]:
+    try:
+        if year:
+            y = int(year)
+            return date(y + 2000 if y < 100 else y, month, day)
+        guess = date(today.year, month, day)
+        if guess < today - timedelta(days=PAST_GRACE_DAYS):
+            guess = date(today.year + 1, month, day)
+        return guess
+    except ValueError:  # e.g. Feb 30
+        return None
+
+
+def _expand(first: Optional[date], last: Optional[date]) -> List[date]:
+    if first is None or last is None:
+        return []
+    if last < first:
+        # "Dec 30 – Jan 2" without years, or a day-only end earlier than the start
+        last = last.replace(year=last.year + 1) if last.month < first.month else first
+    days = []
+    cur = first
+    while cur <= last and len(days) < MAX_RANGE_DAYS:
+        days.append(cur)
+        cur += timedelta(days=1)
+    return days
+
+
+def _explicit_dates(text: str, today: date) -> List[date]:
+    if not _DIGIT_RE.search(text):
+        return []  # every date pattern needs a day number
+    found: List[date] = []
+    consumed: List[Tuple[int, int]] = []
+
+    for m in _MONTH_RANGE_RE.finditer(text):
+        m1 = _month(m["m1"])
+        first = _resolve(m1, int(m["d1"]), m["y1"] or m["y2"], today)
+        m2 = _month(m["m2"]) if m["m2"] else m1
+        last = _resolve(m2, int(m["d2"]), m["y2"] or m["y1"], today)
+        if m["m2"] is None and last is not None and first is not None and last < first:
+            # "Sep 30–2": the end day rolls into the next month
+            nxt = (first.replace(day=1) + timedelta(days=32)).replace(day=1)
+            last = _resolve(nxt.month, int(m["d2"]), str(nxt.year), today)
+        found.extend(_expand(first, last))
+        consumed.append(m.span())
+
+    for m in _UNTIL_RE.finditer(text):
+        if any(a <= m.start() < b for a, b in consumed):
+            continue
+        last = _resolve(_month(m["m"]), int(m["d"]), m["y"], today)
+        if last is not None and last >= today:
+            found.extend(_expand(today, last))
+            consumed.append(m.span())
+
+    for m in _MONTH_DAY_RE.finditer(text):
+        if any(a <= m.start() < b for a, b in consumed):
+            continue
+        d = _resolve(_month(m["m"]), int(m["d"]), m["y"], today)
+        if d is not None:
+            found.append(d)
+
+    for m in _NUMERIC_RE.finditer(text):
+        d = _resolve(int(m["m"]), int(m["d"]), m["y"], today)
+        if d is not None:
+            found.append(d)
+    return sorted(set(found))
+
+
+def _weekday_mentions(text: str) -> List[int]:
+    singles = list(_WEEKDAY_RE.finditer(text))
+    days: List[int] = []
+    consumed: List[Tuple[int, int]] = []
+    # A range needs a weekday on each side, so only scan for one when a weekday is present
+    for m in _WEEKDAY_RANGE_RE.finditer(text) if singles else ():
+        try:
+            start, end = _weekday_index(m["w1"]), _weekday_index(m["w2"])
+        except (KeyError, ValueError):
+            continue
+        days.extend((start + i) % 7 for i in range((end - start) % 7 + 1))
+        consumed.append(m.span())
+    for m in singles:
+        if any(a <= m.start() < b for a, b in consumed):
+            continue
+        days.append(_weekday_index(m["full"] or m["abbr"]))
+    if _WEEKEND_RE.search(text):
+        days.extend([5, 6])
+    return list(dict.fromkeys(days))
+
+
+def _dateutil_fallback(text: str) -> Optional[date]:
+    """Fuzzy dateutil parse, only for text that names a month no pattern understood."""
+    if not (_MONTH_WORD_RE.search(text) and _DIGIT_RE.search(text)):
+        return None
+    try:
+        # Two defaults expose fields dateutil filled in rather than found in the text
+        a = date_parser.parse(text, fuzzy=True, default=datetime(2000, 1, 1))
+        b = date_parser.parse(text, fuzzy=True, default=datetime(2001, 2, 2))
+    except (ValueError, OverflowError):
+        return None
+    if a.month != b.month or a.day != b.day:
+        return None
+    return a.date() if a.year == b.year else None
+
+
+@lru_cache(maxsize=4096)
+def _extract_cached(text: str, today: date) -> EventDays:
+    dates = _explicit_dates(text, today)
+    if not dates:
+        fallback = _dateutil_fallback(text) if not _weekday_mentions(text) else None
+        if fallback is not None:
+            dates = [fallback]
+    if dates:
+        weekdays = [WEEKDAY_NAMES[d.weekday()] for d in dates]
+    else:
+        weekdays = [WEEKDAY_NAMES[i] for i in _weekday_mentions(text)]
+    return EventDays(tuple(dict.fromkeys(weekdays)), tuple(dates))
+
+
+def extract_event_days(text: str, today: Optional[date] = None) -> EventDays:
+    """Days an event runs on, from free text such as a VisitPgh title + details.
+
+    Explicit dates win over weekday mentions; date and weekday ranges expand to every day
+    in between (capped at MAX_RANGE_DAYS). Year-less dates resolve to the nearest upcoming year.
+    Results are memoized per (text, today).
+    """
+    if not text or not text.strip():
+        return EventDays((), ())
+    return _extract_cached(" ".join(text.split()), today or date.today())
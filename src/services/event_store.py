@@ -0,0 +1,487 @@
+"""
+Title: Local Event Store
+Team: Purple Turtles — Gwen Li, Aadya Agarwal, Emma Peng, Noah Hicks
+Date: 2026-10-18
+Summary: SQLite store (DATABASE_URL) for classified event candidates with parsed start/end
+        times, coordinates and source. Indexed by date, weekday and geo cell so the planner's
+        candidate collection is a local query; ingest windows record what upstreams covered,
+        and windowed syncs only convert and write events whose upstream data changed. Run
+        claims let one of several server workers take each round of a periodic job.
+Disclaimer: This file includes AI-assisted content (GPT-5); reviewed and approved by the Purple Turtles team.
+"""
+
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from dateutil import parser as date_parser
+
+from ..core.config import get_settings
+from ..core.http import canonical_url
+from .geo_index import bounding_box, geo_cell
+from .optimizer import WEEKDAY_NAMES
+
+
+MAX_EVENT_DAYS = 92  # multi-day events index at most about a season of days
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id TEXT PRIMARY KEY,
+    source TEXT NOT NULL,
+    scope TEXT NOT NULL,
+    title TEXT NOT NULL,
+    url TEXT,
+    start_at TEXT,
+    end_at TEXT,
+    lat REAL,
+    lon REAL,
+    cell_lat INTEGER,
+    cell_lon INTEGER,
+    environment TEXT,
+    content_hash TEXT NOT NULL,
+    upstream_hash TEXT,
+    payload TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    expires_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_events_start ON events(start_at);
+CREATE INDEX IF NOT EXISTS idx_events_cell ON events(cell_lat, cell_lon);
+CREATE INDEX IF NOT EXISTS idx_events_source ON events(source, expires_at);
+CREATE INDEX IF NOT EXISTS idx_events_scope ON events(source, scope);
+CREATE TABLE IF NOT EXISTS event_days (
+    event_id TEXT NOT NULL REFERENCES events(id) ON DELETE CASCADE,
+    day TEXT,
+    weekday INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_event_days_day ON event_days(day, event_id);
+CREATE INDEX IF NOT EXISTS idx_event_days_weekday ON event_days(weekday, event_id);
+CREATE INDEX IF NOT EXISTS idx_event_days_event ON event_days(event_id);
+CREATE TABLE IF NOT EXISTS ingest_windows (
+    source TEXT NOT NULL,
+    scope TEXT NOT NULL,
+    start_day TEXT NOT NULL,
+    end_day TEXT NOT NULL,
+    fetched_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_ingest_windows ON ingest_windows(source, scope, fetched_at);
+CREATE TABLE IF NOT EXISTS run_claims (
+    name TEXT PRIMARY KEY,
+    next_run_at REAL NOT NULL,
+    holder TEXT NOT NULL
+);
+"""
+
+_STORE: Optional["EventStore"] = None
+_STORE_LOCK = threading.Lock()
+
+
+def sqlite_path(database_url: str) -> Optional[str]:
+    """Filesystem path for a ``sqlite:///`` URL (``None`` for other databases)."""
+    prefix = "sqlite:///"
+    if not database_url.startswith(prefix):
+        return None
+    return database_url[len(prefix):] or ":memory:"
+
+
+def _parse_dt(value: Any) -> Optional[datetime]:
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        dt = value
+    else:
+        try:
+            dt = date_parser.isoparse(str(value))
+        except (ValueError, OverflowError):
+            return None
+    # Wall-clock time at the venue; tz offsets are not needed for day matching
+    return dt.replace(tzinfo=None)
+
+
+def _day(value: datetime) -> str:
+    return value.date().isoformat()
+
+
+def event_id(source: str, item: Dict[str, Any]) -> str:
+    """Stable id: source plus the upstream id, else the canonical event URL, else its
+    lowercased title (so the scraper's and the crawler's copies of an event share a row)."""
+    url = item.get("url")
+    ident = (
+        item.get("external_id")
+        or (canonical_url(url) or url if url else None)
+        or (item.get("title") or item.get("name") or "").strip().lower()
+    )
+    return source + ":" + hashlib.sha1(str(ident).encode("utf-8")).hexdigest()[:20]
+
+
+def upstream_hash(raw: Dict[str, Any]) -> str:
+    """Fingerprint of an upstream record; unchanged records skip conversion on sync."""
+    blob = json.dumps(raw, sort_keys=True, default=str)
+    return hashlib.sha1(blob.encode("utf-8")).hexdigest()
+
+
+def _event_days(item: Dict[str, Any]) -> List[Tuple[Optional[str], int]]:
+    """(iso day, weekday) rows from start/end, explicit event dates, or weekday names."""
+    start = _parse_dt(item.get("start_at"))
+    if start is not None:
+        end = max(_parse_dt(item.get("end_at")) or start, start)
+        days = []
+        cur = start.date()
+        while cur <= end.date() and len(days) < MAX_EVENT_DAYS:
+            days.append((cur.isoformat(), cur.weekday()))
+            cur += timedelta(days=1)
+        return days
+    dates = sorted({d for d in (_parse_dt(v) for v in item.get("event_dates") or []) if d})
+    if dates:
+        return [(d.date().isoformat(), d.weekday()) for d in dates[:MAX_EVENT_DAYS]]
+    names = item.get("day_names") or [item.get("day_name")]
+    weekdays = [WEEKDAY_NAMES.index(n.lower()) for n in names if n and n.lower() in WEEKDAY_NAMES]
+    # Weekday-only rows have no date; no rows at all means any day until the row expires
+    return [(None, w) for w in dict.fromkeys(weekdays)]
+
+
+class EventStore:
+    """Thread-safe SQLite event store; rows keep the planner's candidate dict as payload."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA foreign_keys = ON")
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode = WAL")
+            self._conn.execute("PRAGMA synchronous = NORMAL")
+        self._conn.executescript(_SCHEMA)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(events)")}
+        if "upstream_hash" not in columns:  # store files created before windowed sync
+            self._conn.execute("ALTER TABLE events ADD COLUMN upstream_hash TEXT")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def upsert(
+        self,
+        source: str,
+        scope: str,
+        items: Iterable[Dict[str, Any]],
+        now: Optional[float] = None,
+        upstream_hashes: Optional[Dict[str, str]] = None,
+    ) -> int:
+        """Insert or refresh candidate dicts for ``source``; returns rows written.
+
+        ``upstream_hashes`` maps event ids to the fingerprint of the record they came from.
+        """
+        now = time.time() if now is None else now
+        undated_ttl = get_settings().event_store_undated_ttl_seconds
+        by_id: Dict[str, Tuple[tuple, List[Tuple[Optional[str], int]]]] = {}
+        for item in items:
+            if not (item.get("title") or item.get("name")):
+                continue
+            eid = event_id(source, item)
+            start = _parse_dt(item.get("start_at"))
+            end = _parse_dt(item.get("end_at"))
+            coords = item.get("coordinates") or {}
+            lat, lon = coords.get("lat"), coords.get("lon")
+            cell = geo_cell(lat, lon) if lat is not None and lon is not None else (None, None)
+            days = _event_days(item)
+            dated = [day for day, _weekday in days if day]
+            if dated:
+                last = datetime.combine(date.fromisoformat(max(dated)), datetime.min.time())
+                expires_at = (last + timedelta(days=1)).timestamp()
+            else:
+                expires_at = now + undated_ttl
+            payload = json.dumps(item, sort_keys=True, default=str)
+            row = (
+                eid, source, scope, item.get("title") or item.get("name"), item.get("url"),
+                start.isoformat() if start else None, end.isoformat() if end else None,
+                lat, lon, cell[0], cell[1], item.get("environment"),
+                hashlib.sha1(payload.encode("utf-8")).hexdigest(),
+                (upstream_hashes or {}).get(eid), payload, now, expires_at,
+            )
+            by_id[eid] = (row, days)  # last duplicate in a batch wins
+        rows = [row for row, _days in by_id.values()]
+        day_rows = [
+            (eid, day, weekday) for eid, (_row, days) in by_id.items() for day, weekday in days
+        ]
+
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN")
+            self._conn.executemany(
+                """
+                INSERT INTO events (id, source, scope, title, url, start_at, end_at, lat, lon,
+                    cell_lat, cell_lon, environment, content_hash, upstream_hash, payload,
+                    fetched_at, expires_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(id) DO UPDATE SET
+                    scope = excluded.scope, title = excluded.title, url = excluded.url,
+                    start_at = excluded.start_at, end_at = excluded.end_at,
+                    lat = excluded.lat, lon = excluded.lon,
+                    cell_lat = excluded.cell_lat, cell_lon = excluded.cell_lon,
+                    environment = excluded.environment, content_hash = excluded.content_hash,
+                    upstream_hash = excluded.upstream_hash, payload = excluded.payload, fetched_at = excluded.fetched_at,
+                    expires_at = excluded.expires_at
+                """,
+                rows,
+            )
+            self._conn.executemany(
+                "DELETE FROM event_days WHERE event_id = ?", [(r[0],) for r in rows]
+            )
+            self._conn.executemany(
+                "INSERT INTO event_days (event_id, day, weekday) VALUES (?, ?, ?)", day_rows
+            )
+        return len(rows)
+
+    def ingest(
+        self,
+        source: str,
+        scope: str,
+        start: datetime,
+        end: datetime,
+        items: Iterable[Dict[str, Any]],
+        now: Optional[float] = None,
+        complete: bool = False,
+    ) -> int:
+        """Write-through an upstream fetch for ``start..end`` and record the covered window.
+
+        With ``complete`` the items are the whole current listing for ``scope`` (whatever
+        their dates): stored rows of the scope that it no longer lists are removed.
+        """
+        now = time.time() if now is None else now
+        items = list(items)
+        written = self.upsert(source, scope, items, now=now)
+        listed = {event_id(source, item) for item in items}
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN")
+            if complete:
+                stale = [
+                    (eid,)
+                    for (eid,) in self._conn.execute(
+                        "SELECT id FROM events WHERE source = ? AND scope = ?", (source, scope)
+                    ).fetchall()
+                    if eid not in listed
+                ]
+                self._conn.executemany("DELETE FROM events WHERE id = ?", stale)
+            self._conn.execute(
+                "INSERT INTO ingest_windows (source, scope, start_day, end_day, fetched_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (source, scope, _day(start), _day(end), now),
+            )
+        self.prune(now)
+        return written
+
+    def sync(
+        self,
+        source: str,
+        scope: str,
+        start: datetime,
+        end: datetime,
+        raw_items: Iterable[Dict[str, Any]],
+        convert: Callable[[List[Dict[str, Any]]], List[Dict[str, Any]]],
+        complete: bool = True,
+        now: Optional[float] = None,
+    ) -> Dict[str, int]:
+        """Apply a full upstream listing of ``start..end`` as a delta; returns change counts.
+
+        Records are matched by upstream ``id`` (else URL/title) and fingerprint: only new or
+        changed ones go through ``convert`` (raw records -> candidates, one per record) and
+        get written; unchanged rows are just marked fresh. When the listing is ``complete``,
+        stored events of this scope in the window that upstream no longer lists are removed
+        and the window is recorded as covered. A truncated listing does neither: its events
+        are written, but ``covers`` keeps asking for the window.
+        """
+        now = time.time() if now is None else now
+        fresh: Dict[str, Tuple[Dict[str, Any], str]] = {}
+        for raw in raw_items:
+            key = {"external_id": raw.get("id"), "url": raw.get("url"), "title": raw.get("title")}
+            fresh[event_id(source, key)] = (raw, upstream_hash(raw))
+        with self._lock:
+            known = dict(
+                self._conn.execute(
+                    "SELECT id, upstream_hash FROM events WHERE source = ? AND scope = ?",
+                    (source, scope),
+                ).fetchall()
+            )
+        changed = [eid for eid, (_raw, h) in fresh.items() if known.get(eid) != h]
+        unchanged = [eid for eid in fresh if eid not in changed]
+
+        candidates = convert([fresh[eid][0] for eid in changed]) if changed else []
+        hashes = {
+            event_id(source, cand): fresh[eid][1] for eid, cand in zip(changed, candidates)
+        }
+        self.upsert(source, scope, candidates, now=now, upstream_hashes=hashes)
+
+        removed = 0
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN")
+            self._conn.executemany(
+                "UPDATE events SET fetched_at = ? WHERE id = ?", [(now, e) for e in unchanged]
+            )
+            if complete:
+                stale = [
+                    eid
+                    for (eid,) in self._conn.execute(
+                        "SELECT DISTINCT e.id FROM events e JOIN event_days d ON d.event_id = e.id"
+                        " WHERE e.source = ? AND e.scope = ? AND d.day BETWEEN ? AND ?",
+                        (source, scope, _day(start), _day(end)),
+                    ).fetchall()
+                    if eid not in fresh
+                ]
+                self._conn.executemany("DELETE FROM events WHERE id = ?", [(e,) for e in stale])
+                removed = len(stale)
+                self._conn.execute(
+                    "INSERT INTO ingest_windows (source, scope, start_day, end_day, fetched_at)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    (source, scope, _day(start), _day(end), now),
+                )
+        self.prune(now)
+        new = sum(1 for eid in changed if eid not in known)
+        return {
+            "added": new,
+            "updated": len(changed) - new,
+            "unchanged": len(unchanged),
+            "removed": removed,
+        }
+
+    def covers(
+        self,
+        source: str,
+        scope: str,
+        start: datetime,
+        end: datetime,
+        max_age_seconds: float,
+        now: Optional[float] = None,
+    ) -> bool:
+        """True when fetches newer than ``max_age_seconds`` already covered ``start..end``
+        (one window, or adjoining ones such as the pieces of a resumed listing)."""
+        now = time.time() if now is None else now
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT start_day, end_day FROM ingest_windows WHERE source = ? AND scope = ?"
+                " AND fetched_at >= ? AND start_day <= ? AND end_day >= ?"
+                " ORDER BY start_day",
+                (source, scope, now - max_age_seconds, _day(end), _day(start)),
+            ).fetchall()
+        needed = start.date()
+        for first, last in rows:
+            if date.fromisoformat(first) > needed:
+                break
+            needed = max(needed, date.fromisoformat(last) + timedelta(days=1))
+        return needed > end.date()
+
+    def query(
+        self,
+        start: datetime,
+        end: datetime,
+        sources: Optional[Sequence[str]] = None,
+        near: Optional[Dict[str, float]] = None,
+        radius_miles: Optional[float] = None,
+        now: Optional[float] = None,
+    ) -> List[Dict[str, Any]]:
+        """Candidates happening in ``start..end`` (by date, weekday, or undated).
+
+        With ``near`` and ``radius_miles`` the geo-cell index drops located rows outside the
+        radius' bounding box; rows without coordinates are always kept.
+        """
+        now = time.time() if now is None else now
+        first, last = start.date(), end.date()
+        weekdays = sorted({(first + timedelta(days=i)).weekday()
+                           for i in range(min((last - first).days + 1, 7))})
+        sql = [
+            "SELECT e.payload FROM events e WHERE e.expires_at > ? AND (",
+            " EXISTS (SELECT 1 FROM event_days d WHERE d.event_id = e.id"
+            " AND d.day BETWEEN ? AND ?)",
+            " OR EXISTS (SELECT 1 FROM event_days d WHERE d.event_id = e.id AND d.day IS NULL"
+            f" AND d.weekday IN ({','.join('?' * len(weekdays)) or 'NULL'}))",
+            " OR NOT EXISTS (SELECT 1 FROM event_days d WHERE d.event_id = e.id))",
+        ]
+        params: List[Any] = [now, first.isoformat(), last.isoformat(), *weekdays]
+        if sources:
+            sql.append(f" AND e.source IN ({','.join('?' * len(sources))})")
+            params.extend(sources)
+        if near is not None and radius_miles is not None:
+            min_lat, min_lon, max_lat, max_lon = bounding_box(
+                float(near["lat"]), float(near["lon"]), radius_miles
+            )
+            r0, c0 = geo_cell(min_lat, min_lon)
+            r1, c1 = geo_cell(max_lat, max_lon)
+            sql.append(
+                " AND (e.cell_lat IS NULL OR (e.cell_lat BETWEEN ? AND ?"
+                " AND e.cell_lon BETWEEN ? AND ?))"
+            )
+            params.extend([r0, r1, c0, c1])
+        sql.append(" ORDER BY e.rowid")
+        with self._lock:
+            rows = self._conn.execute("".join(sql), params).fetchall()
+        return [json.loads(payload) for (payload,) in rows]
+
+    def prune(self, now: Optional[float] = None) -> int:
+        """Drop expired events and ingest windows older than a day."""
+        now = time.time() if now is None else now
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN")
+            removed = self._conn.execute(
+                "DELETE FROM events WHERE expires_at <= ?", (now,)
+            ).rowcount
+            self._conn.execute(
+                "DELETE FROM ingest_windows WHERE fetched_at < ?", (now - 86400,)
+            )
+        return removed
+
+    def claim_run(
+        self, name: str, interval_seconds: float, holder: str, now: Optional[float] = None
+    ) -> bool:
+        """Claim the next run of periodic job ``name``; at most one claim per interval.
+
+        Every process sharing the store may call this; the first caller once the previous
+        claim's interval has passed wins. A claimer that dies simply lets the next interval
+        come round, so there is no lock to go stale.
+        """
+        now = time.time() if now is None else now
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")  # serializes claimers across processes
+            row = self._conn.execute(
+                "SELECT next_run_at FROM run_claims WHERE name = ?", (name,)
+            ).fetchone()
+            if row is not None and row[0] > now:
+                return False
+            self._conn.execute(
+                "INSERT OR REPLACE INTO run_claims (name, next_run_at, holder) VALUES (?, ?, ?)",
+                (name, now + interval_seconds, holder),
+            )
+        return True
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM events").fetchone()[0]
+
+
+def get_event_store() -> Optional[EventStore]:
+    """Process-wide store for DATABASE_URL, or ``None`` when disabled/not SQLite."""
+    global _STORE
+    settings = get_settings()
+    if not settings.event_store_enabled:
+        return None
+    path = sqlite_path(settings.database_url)
+    if path is None:
+        return None
+    with _STORE_LOCK:
+        if _STORE is None or _STORE.path != path:
+            if _STORE is not None:
+                _STORE.close()
+            _STORE = EventStore(path)
+        return _STORE
+
+
+def reset_event_store() -> None:
+    """Close the process-wide store (tests, settings changes)."""
+    global _STORE
+    with _STORE_LOCK:
+        if _STORE is not None:
+            _STORE.close()
+        _STORE = None
@@ -0,0 +1,83 @@
+"""
+Title: Spatial Grid Index
+Team: Purple Turtles — Gwen Li, Aadya Agarwal, Emma Peng, Noah Hicks
+Date: 2026-10-18
+Summary: Fixed-size lat/lon grid buckets with a bounding-box + haversine radius query, used
+        to drop out-of-range candidates before any paid Distance Matrix call.
+Disclaimer: This file includes AI-assisted content (GPT-5); reviewed and approved by the Purple Turtles team.
+"""
+
+from __future__ import annotations
+
+from math import cos, floor, radians
+from typing import Dict, Generic, Iterable, List, Optional, Tuple, TypeVar
+
+from .maps_client import _haversine_miles
+
+
+T = TypeVar("T")
+
+MILES_PER_DEG_LAT = 69.0
+DEFAULT_CELL_DEG = 0.02  # ~1.4 miles of latitude per cell
+
+
+def geo_cell(lat: float, lon: float, cell_deg: float = DEFAULT_CELL_DEG) -> Tuple[int, int]:
+    """Grid cell (row, col) containing a coordinate."""
+    return (int(floor(lat / cell_deg)), int(floor(lon / cell_deg)))
+
+
+def bounding_box(
+    lat: float, lon: float, radius_miles: float
+) -> Tuple[float, float, float, float]:
+    """(min_lat, min_lon, max_lat, max_lon) that encloses a radius around a point."""
+    dlat = radius_miles / MILES_PER_DEG_LAT
+    # Guard the cosine near the poles; Pittsburgh never gets close
+    dlon = radius_miles / (MILES_PER_DEG_LAT * max(cos(radians(lat)), 0.01))
+    return (lat - dlat, lon - dlon, lat + dlat, lon + dlon)
+
+
+class GeoGridIndex(Generic[T]):
+    """Buckets items by grid cell for fast radius lookups.
+
+    Haversine distance is a lower bound on travel distance, so anything a radius
+    query rejects can never pass a ``max_distance_miles`` check on road distance.
+    """
+
+    def __init__(self, cell_deg: float = DEFAULT_CELL_DEG) -> None:
+        self.cell_deg = cell_deg
+        self._cells: Dict[Tuple[int, int], List[Tuple[float, float, T]]] = {}
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def insert(self, coords: Dict[str, float], item: T) -> None:
+        lat, lon = float(coords["lat"]), float(coords["lon"])
+        self._cells.setdefault(geo_cell(lat, lon, self.cell_deg), []).append((lat, lon, item))
+        self._size += 1
+
+    def extend(self, pairs: Iterable[Tuple[Optional[Dict[str, float]], T]]) -> None:
+        for coords, item in pairs:
+            if coords:
+                self.insert(coords, item)
+
+    def query_radius(
+        self, center: Dict[str, float], radius_miles: float
+    ) -> List[Tuple[T, float]]:
+        """Items within ``radius_miles`` of ``center`` as (item, haversine miles)."""
+        lat0, lon0 = float(center["lat"]), float(center["lon"])
+        min_lat, min_lon, max_lat, max_lon = bounding_box(lat0, lon0, radius_miles)
+        r0, c0 = geo_cell(min_lat, min_lon, self.cell_deg)
+        r1, c1 = geo_cell(max_lat, max_lon, self.cell_deg)
+
+        hits: List[Tuple[T, float]] = []
+        for row in range(r0, r1 + 1):
+            for col in range(c0, c1 + 1):
+                for lat, lon, item in self._cells.get((row, col), ()):
+                    # Cheap box check before the trig-heavy haversine
+                    if not (min_lat <= lat <= max_lat and min_lon <= lon <= max_lon):
+                        continue
+                    miles = _haversine_miles(lat0, lon0, lat, lon)
+                    if miles <= radius_miles:
+                        hits.append((item, miles))
+        return hits
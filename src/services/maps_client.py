@@ -12,13 +12,23 @@ from __future__ import annotations
 from math import radians, cos, sin, asin, sqrt
 from typing import Any, Dict, List, Optional
 
-import httpx
-
+from ..core.cache import make_cache
 from ..core.config import get_settings
+from ..core.http import http_client
+from ..core.metrics import cache_lookup, upstream
+
 
+GOOGLE_MAPS_BASE_URL = "https://maps.googleapis.com/maps/api"
+GOOGLE_GEOCODE_URL = f"{GOOGLE_MAPS_BASE_URL}/geocode/json"
+GOOGLE_DISTANCE_MATRIX_URL = f"{GOOGLE_MAPS_BASE_URL}/distancematrix/json"
 
-GOOGLE_GEOCODE_URL = "https://maps.googleapis.com/maps/api/geocode/json"
-GOOGLE_DISTANCE_MATRIX_URL = "https://maps.googleapis.com/maps/api/distancematrix/json"
+# Addresses rarely move; keep successful geocodes for a day
+_GEOCODE_CACHE = make_cache("geocode", 4096, get_settings().geocode_ttl_seconds)
+
+# City centers known without a geocoding API; matched anywhere in the city string
+_KNOWN_CITIES: Dict[str, Dict[str, float]] = {
+    "pittsburgh": {"lat": 40.4406, "lon": -79.9959},
+}
 
 
 def _haversine_miles(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
@@ -30,7 +40,38 @@ def _haversine_miles(lat1: float, lon1: float, lat2: float, lon2: float) -> floa
     return radius_miles * c
 
 
+def _normalize_address(address: str) -> str:
+    return " ".join(address.lower().replace(",", " ").split())
+
+
 def geocode_address(address: str) -> Optional[Dict[str, float]]:
+    """Geocode an address, caching successful lookups per normalized address."""
+    key = _normalize_address(address)
+    cached = _GEOCODE_CACHE.get(key)
+    cache_lookup("geocode", cached is not None)
+    if cached is not None:
+        return dict(cached)
+    coords = _geocode_uncached(address)
+    if coords is not None:
+        _GEOCODE_CACHE.set(key, coords)
+        return dict(coords)
+    return None
+
+
+def resolve_city(city: str) -> Optional[Dict[str, float]]:
+    """City center for any spelling of a city ("Pittsburgh, PA", "pittsburgh 15213", ...).
+
+    Known cities resolve locally; others go through the cached geocoder. Shared by the
+    weather client (forecast cache key) and the planner (default origin).
+    """
+    key = _normalize_address(city)
+    for name, coords in _KNOWN_CITIES.items():
+        if name in key:
+            return dict(coords)
+    return geocode_address(city) if key else None
+
+
+def _geocode_uncached(address: str) -> Optional[Dict[str, float]]:
     # Known local addresses fallback (works without Google Maps)
     lowered = address.lower()
     if "hamburg hall" in lowered or "4800 forbes" in lowered or "carnegie mellon" in lowered or "cmu" in lowered:
@@ -41,8 +82,8 @@ def geocode_address(address: str) -> Optional[Dict[str, float]]:
     if settings.maps_provider == "google" and settings.maps_api_key and not settings.maps_api_key.startswith("changeme"):
         params = {"address": address, "key": settings.maps_api_key}
         try:
-            with httpx.Client(timeout=10) as client:
-                resp = client.get(GOOGLE_GEOCODE_URL, params=params)
+            with upstream("google_geocode"), http_client(timeout=10) as client:
+                resp = client.get(_maps_url("geocode"), params=params)
                 resp.raise_for_status()
                 data = resp.json()
             if data.get("status") == "OK" and data.get("results"):
@@ -53,6 +94,11 @@ def geocode_address(address: str) -> Optional[Dict[str, float]]:
     return None
 
 
+def _maps_url(api: str) -> str:
+    base = get_settings().google_maps_base_url or GOOGLE_MAPS_BASE_URL
+    return f"{base}/{api}/json"
+
+
 def _format_coords(coords: Dict[str, float]) -> str:
     return f"{coords['lat']},{coords['lon']}"
 
@@ -70,9 +116,9 @@ def distance_matrix_miles(origins: List[Dict[str, float]], destinations: List[Di
         and not settings.maps_api_key.startswith("changeme")
     ):
         try:
-            with httpx.Client(timeout=10) as client:
+            with upstream("google_distance_matrix"), http_client(timeout=10) as client:
                 resp = client.get(
-                    GOOGLE_DISTANCE_MATRIX_URL,
+                    _maps_url("distancematrix"),
                     params={
                         "origins": "|".join(_format_coords(o) for o in origins),
                         "destinations": "|".join(_format_coords(d) for d in destinations),
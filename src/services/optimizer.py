@@ -0,0 +1,295 @@
+"""
+Title: Itinerary Optimizer (Scoring + Beam Search)
+Team: Purple Turtles — Gwen Li, Aadya Agarwal, Emma Peng, Noah Hicks
+Date: 2026-10-18
+Summary: Scores candidates on distance, weather, interests, source and travel between
+        consecutive stops, then runs a bounded beam search over days and time blocks
+        to return the top-K diverse plans.
+Disclaimer: This file includes AI-assisted content (GPT-5); reviewed and approved by the Purple Turtles team.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+from .maps_client import _haversine_miles
+
+
+WEEKDAY_NAMES = [
+    "monday",
+    "tuesday",
+    "wednesday",
+    "thursday",
+    "friday",
+    "saturday",
+    "sunday",
+]
+
+# (block name, start hour, end hour, candidate kind)
+DAY_BLOCKS: List[Tuple[str, int, int, str]] = [
+    ("morning", 9, 11, "food"),
+    ("afternoon", 13, 15, "event"),
+    ("evening", 18, 21, "food"),
+]
+# Meal served in a food block (matches the Yelp pool's meal tags)
+BLOCK_MEALS: Dict[str, str] = {"morning": "breakfast", "evening": "dinner"}
+
+DEFAULT_WEIGHTS: Dict[str, float] = {
+    "distance": 0.6,  # penalty per max-distance unit from origin
+    "weather": 0.8,  # outdoor items scaled by (suitability - 0.5)
+    "interest": 0.5,  # bonus when title/notes mention an interest
+    "source": 1.0,  # multiplier applied to SOURCE_PRIORS
+    "travel": 0.4,  # penalty per hour between consecutive stops
+    "day_match": 0.3,  # bonus for events dated on the plan day
+    "repeat": 1.0,  # penalty for reusing a food place when none other is left
+    "diversity": 0.5,  # penalty per item shared with already selected plans
+}
+
+SOURCE_PRIORS: Dict[str, float] = {
+    "ticketmaster": 0.15,
+    "visitpgh": 0.1,
+    "yelp": 0.1,
+    "fallback": -0.5,
+}
+
+ASSUMED_SPEED_MPH = 25.0
+
+# Beam state: (score, picks per slot, used candidate indexes, last known coordinates)
+_State = Tuple[float, Tuple[Optional[int], ...], FrozenSet[int], Optional[Dict[str, float]]]
+
+
+def _kind(item: Dict[str, Any]) -> str:
+    return "food" if item.get("category") == "food" else "event"
+
+
+def _matches_env(
+    env: Optional[str], env_preference: Optional[str], suitability: Optional[float] = None
+) -> bool:
+    if env_preference in (None, "either"):
+        return True
+    if env is None or env == "unknown":
+        return True  # allow unknowns; weather scoring steers them
+    if env_preference == "outdoor" and suitability is not None and suitability < 0.4:
+        # Outdoor is poor for this block: let indoor items in, scoring prefers them
+        return True
+    return env == env_preference
+
+
+def _block_suitability(
+    weather_info: Optional[Dict[str, Any]], block: str
+) -> Optional[float]:
+    """Suitability for one time block, falling back to the day's average."""
+    if not weather_info:
+        return None
+    block_info = (weather_info.get("blocks") or {}).get(block)
+    if block_info and block_info.get("suitability") is not None:
+        return block_info["suitability"]
+    return weather_info.get("suitability")
+
+
+def score_item(
+    item: Dict[str, Any],
+    block: str,
+    day_name: str,
+    weather_info: Optional[Dict[str, Any]] = None,
+    interests: Optional[List[str]] = None,
+    max_distance_miles: Optional[float] = None,
+    weights: Optional[Dict[str, float]] = None,
+) -> float:
+    """Static score of placing an item in a block (higher is better).
+
+    Travel between consecutive stops depends on the plan so it is added during search.
+    """
+    w = weights or DEFAULT_WEIGHTS
+    score = 0.0
+
+    dist = item.get("distance_miles")
+    if dist is not None:
+        scale = max_distance_miles or 5.0
+        score -= w["distance"] * (dist / scale)
+
+    suitability = _block_suitability(weather_info, block)
+    if suitability is not None:
+        env = item.get("environment")
+        if env == "outdoor":
+            score += w["weather"] * (suitability - 0.5)
+        elif env == "indoor" and suitability < 0.4:
+            score += w["weather"] * (0.4 - suitability) * 0.5
+
+    if interests and _kind(item) == "event":
+        text = f"{item.get('title') or item.get('name') or ''} {item.get('notes') or ''}".lower()
+        if any(i.lower() in text for i in interests):
+            score += w["interest"]
+
+    score += w["source"] * SOURCE_PRIORS.get(item.get("source") or "", 0.0)
+
+    if _kind(item) == "event" and day_name in _item_days(item):
+        score += w["day_match"]
+
+    return score
+
+
+def _travel_minutes(
+    a: Optional[Dict[str, float]], b: Optional[Dict[str, float]]
+) -> Optional[float]:
+    if not a or not b:
+        return None
+    miles = _haversine_miles(a["lat"], a["lon"], b["lat"], b["lon"])
+    return (miles / ASSUMED_SPEED_MPH) * 60
+
+
+def _item_days(item: Dict[str, Any]) -> set[str]:
+    # Multi-day events list every weekday they run on; older candidates only carry day_name
+    days = item.get("day_names") or ([item["day_name"]] if item.get("day_name") else [])
+    return set(days)
+
+
+def _eligible_for_day(item: Dict[str, Any], day_name: str, plan_days: set[str]) -> bool:
+    # Events dated for another day of the plan stay on that day; undated events and
+    # events outside the plan window are fallbacks for any day.
+    if _kind(item) == "food":
+        return True
+    days = _item_days(item)
+    return not days or day_name in days or not (days & plan_days)
+
+
+def optimize_plans(
+    day_dates: List[datetime],
+    candidates: List[Dict[str, Any]],
+    env_preference: Optional[str] = "either",
+    interests: Optional[List[str]] = None,
+    daily_weather: Optional[Dict[str, Dict[str, Any]]] = None,
+    origin: Optional[Dict[str, float]] = None,
+    max_distance_miles: Optional[float] = None,
+    beam_width: int = 8,
+    top_k: int = 3,
+    branching: Optional[int] = None,
+    weights: Optional[Dict[str, float]] = None,
+) -> List[Dict[str, Any]]:
+    """Beam search over (day, block) slots returning up to ``top_k`` diverse plans.
+
+    Each plan is ``{"score": float, "days": [[(block_name, start_h, end_h, item), ...], ...]}``.
+    ``beam_width`` bounds the states kept per slot and ``branching`` the candidates
+    expanded per state (defaults to ``2 * beam_width``); both trade latency for quality.
+    """
+    w = {**DEFAULT_WEIGHTS, **(weights or {})}
+    beam_width = max(1, int(beam_width))
+    top_k = max(1, int(top_k))
+    branching = max(1, int(branching or beam_width * 2))
+    daily_weather = daily_weather or {}
+
+    plan_days = {WEEKDAY_NAMES[d.weekday()] for d in day_dates}
+
+    # Slot list with pre-ranked eligible candidates (static part of the score)
+    slots: List[Tuple[int, str, int, int, List[Tuple[int, float]]]] = []
+    for day_idx, day in enumerate(day_dates):
+        day_name = WEEKDAY_NAMES[day.weekday()]
+        weather_info = daily_weather.get(day.date().isoformat())
+        for block, start_h, end_h, kind in DAY_BLOCKS:
+            suitability = _block_suitability(weather_info, block)
+            ranked: List[Tuple[int, float]] = []
+            for idx, item in enumerate(candidates):
+                if _kind(item) != kind:
+                    continue
+                if not _matches_env(item.get("environment"), env_preference, suitability):
+                    continue
+                if not _eligible_for_day(item, day_name, plan_days):
+                    continue
+                ranked.append(
+                    (
+                        idx,
+                        score_item(
+                            item,
+                            block,
+                            day_name,
+                            weather_info,
+                            interests,
+                            max_distance_miles,
+                            w,
+                        ),
+                    )
+                )
+            ranked.sort(key=lambda p: p[1], reverse=True)
+            slots.append((day_idx, block, start_h, end_h, ranked))
+
+    per_item_cap = max(1, beam_width // top_k)
+    beam: List[_State] = [(0.0, (), frozenset(), origin)]
+    prev_day = -1
+    for day_idx, _block, _sh, _eh, ranked in slots:
+        new_day = day_idx != prev_day
+        prev_day = day_idx
+        expanded: List[_State] = []
+        for score, picks, used, last in beam:
+            last = origin if new_day else last
+            grown = 0
+            fresh = [(i, st) for i, st in ranked if i not in used]
+            if not fresh:
+                # Reuse a food place only when no alternative is left (never events)
+                fresh = [
+                    (i, st - w["repeat"])
+                    for i, st in ranked
+                    if _kind(candidates[i]) == "food"
+                ]
+            for idx, step in fresh[:branching]:
+                item = candidates[idx]
+                minutes = _travel_minutes(last, item.get("coordinates"))
+                if minutes is not None:
+                    step -= w["travel"] * (minutes / 60.0)
+                expanded.append(
+                    (
+                        score + step,
+                        picks + (idx,),
+                        used | {idx},
+                        item.get("coordinates") or last,
+                    )
+                )
+                grown += 1
+            if not grown:
+                expanded.append((score, picks + (None,), used, last))
+
+        # Keep the best states, capping how many share the latest pick so the beam
+        # does not collapse onto one item; fill leftover room with the overflow.
+        expanded.sort(key=lambda s: s[0], reverse=True)
+        pruned: List[_State] = []
+        overflow: List[_State] = []
+        seen: set[Tuple[Optional[int], ...]] = set()
+        per_item: Dict[Optional[int], int] = {}
+        for state in expanded:
+            key = state[1]
+            if key in seen:
+                continue
+            seen.add(key)
+            latest = key[-1]
+            if per_item.get(latest, 0) >= per_item_cap:
+                overflow.append(state)
+                continue
+            per_item[latest] = per_item.get(latest, 0) + 1
+            pruned.append(state)
+            if len(pruned) >= beam_width:
+                break
+        pruned.extend(overflow[: beam_width - len(pruned)])
+        beam = pruned
+
+    # Diverse top-K: greedily penalize items shared with plans already selected
+    remaining = [s for s in beam if any(p is not None for p in s[1])]
+    selected: List[_State] = []
+    taken: set[int] = set()
+    while remaining and len(selected) < top_k:
+        best = max(
+            remaining,
+            key=lambda s: s[0]
+            - w["diversity"] * len({p for p in s[1] if p is not None} & taken),
+        )
+        remaining.remove(best)
+        selected.append(best)
+        taken.update(p for p in best[1] if p is not None)
+
+    plans: List[Dict[str, Any]] = []
+    for score, picks, _used, _last in selected:
+        days: List[List[Tuple[str, int, int, Dict[str, Any]]]] = [[] for _ in day_dates]
+        for (day_idx, block, start_h, end_h, _ranked), pick in zip(slots, picks):
+            if pick is not None:
+                days[day_idx].append((block, start_h, end_h, candidates[pick]))
+        plans.append({"score": score, "days": days})
+    return plans
@@ -8,10 +8,13 @@ Disclaimer: This file includes AI-assisted content (GPT-5); reviewed and approve
 
 from __future__ import annotations
 
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 import asyncio
-import re
-from typing import Any, Dict, Iterable, List, Optional, Tuple
+import math
+import os
+import sqlite3
+import uuid
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 
 from dateutil import parser as date_parser
 
@@ -22,23 +25,29 @@ from ..models.itinerary import (
     DayPlan,
     Activity,
 )
-from .visitpgh_scraper import fetch_this_week_events
+from .visitpgh_scraper import VISIT_PGH_URL, fetch_this_week_events
+from .date_extract import extract_event_days
 from .yelp_client import search_food
 from .classifier import classify_environment, classify_environment_batch
-from .weather_client import fetch_forecast, map_forecast_to_days
-from .maps_client import geocode_address, distance_matrix_miles
-from .ticketmaster_client import fetch_events_ticketmaster
-
-
-WEEKDAY_NAMES = [
-    "monday",
-    "tuesday",
-    "wednesday",
-    "thursday",
-    "friday",
-    "saturday",
-    "sunday",
-]
+from .weather_client import forecast_days
+from .maps_client import distance_matrix_miles, geocode_address, resolve_city
+from .ticketmaster_client import fetch_all_events_ticketmaster
+from .optimizer import BLOCK_MEALS, WEEKDAY_NAMES, optimize_plans
+from .routing import build_leg_table, sequence_stops
+from .geo_index import GeoGridIndex
+from .event_store import get_event_store
+from ..core.cache import make_cache
+from ..core.config import get_settings
+from ..core.http import canonical_url
+from ..core.metrics import cache_lookup, stage
+
+
+# Candidate snapshots for incremental re-planning, keyed by snapshot_id
+_SNAPSHOTS = make_cache(
+    "plan_snapshot",
+    maxsize=get_settings().plan_snapshot_max_entries,
+    ttl_seconds=get_settings().plan_snapshot_ttl_seconds,
+)
 
 
 def _daterange(start: datetime, end: datetime) -> Iterable[datetime]:
@@ -48,167 +57,351 @@ def _daterange(start: datetime, end: datetime) -> Iterable[datetime]:
         cur = cur + timedelta(days=1)
 
 
-def _parse_day_from_text(text: str) -> Optional[str]:
-    lowered = text.lower()
-    for name in WEEKDAY_NAMES:
-        if name in lowered:
-            return name
-    # Try date like Sep 14, 2025 -> weekday
-    try:
-        dt = date_parser.parse(text, fuzzy=True, default=datetime(2000, 1, 1))
-        return WEEKDAY_NAMES[dt.weekday()]
-    except Exception:
-        return None
-
-
 def _weekday_from_iso_datetime(dt_str: Optional[str]) -> Optional[str]:
     if not dt_str:
         return None
     try:
-        dt = date_parser.parse(dt_str, fuzzy=True)
-        return WEEKDAY_NAMES[dt.weekday()]
-    except Exception:
-        return None
+        dt = date_parser.isoparse(dt_str)  # upstream timestamps are ISO 8601; skip fuzzy
+    except (ValueError, OverflowError):
+        try:
+            dt = date_parser.parse(dt_str, fuzzy=True)
+        except Exception:
+            return None
+    return WEEKDAY_NAMES[dt.weekday()]
 
 
 def _pittsburgh_coords() -> Dict[str, float]:
-    return {"lat": 40.4406, "lon": -79.9959}
+    return resolve_city("Pittsburgh, PA") or {"lat": 40.4406, "lon": -79.9959}
 
 
-def _pick_non_overlapping_blocks(
+def _to_activity(
+    item: Dict[str, Any],
     day: datetime,
-    candidates: List[Dict[str, Any]],
-    env_preference: str,
-    weather_day_info: Optional[Dict[str, Any]],
-) -> List[Activity]:
-    blocks: List[Tuple[str, Tuple[int, int]]] = [
-        ("morning", (9, 11)),
-        ("afternoon", (13, 15)),
-        ("evening", (18, 21)),
-    ]
-
-    suitability = weather_day_info.get("suitability") if weather_day_info else None
-    chosen: List[Activity] = []
-
-    # Simple strategy: pick one food for morning/evening, one event for afternoon
-    def match_env(env: Optional[str]) -> bool:
-        if env_preference == "either" or env_preference is None:
-            return True
-        if env is None or env == "unknown":
-            return (
-                True  # allow unknowns; filtered later by weather when outdoor is poor
+    start_h: int,
+    end_h: int,
+    leg: Optional[Dict[str, Any]] = None,
+) -> Activity:
+    return Activity(
+        name=item.get("name") or item.get("title") or "Activity",
+        category=item.get("category") or item.get("type") or "activity",
+        address=item.get("address"),
+        start_time=datetime(day.year, day.month, day.day, start_h, 0).time(),
+        end_time=datetime(day.year, day.month, day.day, end_h, 0).time(),
+        notes=item.get("notes"),
+        external_url=item.get("url"),
+        source=item.get("source"),
+        environment=item.get("environment"),
+        coordinates=item.get("coordinates"),
+        distance_miles=item.get("distance_miles"),
+        travel_time_minutes=leg.get("duration_minutes") if leg else None,
+    )
+
+
+VISITPGH_SCOPE = "this-week"
+CRAWL_SCOPE = "crawl"
+# Ticketmaster search radius around an origin when the request sets none
+DEFAULT_EVENT_RADIUS_MILES = 10.0
+
+
+def _event_radius(
+    origin_coords: Optional[Dict[str, float]], max_distance_miles: Optional[float]
+) -> Optional[float]:
+    """Radius events are fetched within (None without an origin: the whole area)."""
+    if origin_coords is None:
+        return None
+    return float(max_distance_miles or DEFAULT_EVENT_RADIUS_MILES)
+
+
+def _yelp_coords(coords: Optional[Dict[str, Any]]) -> Optional[Dict[str, float]]:
+    # Yelp uses latitude/longitude; candidates use lat/lon (None -> geocode the address)
+    try:
+        return {"lat": float(coords["latitude"]), "lon": float(coords["longitude"])}
+    except (TypeError, KeyError, ValueError):
+        return None
+
+
+def _visitpgh_candidates(events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Classify scraped/crawled VisitPgh events into planner candidates."""
+    # Relative hrefs on the This Week page resolve against it, as the crawler resolves them
+    base_url = get_settings().visitpgh_url or VISIT_PGH_URL
+    # Batch classify to avoid sequential OpenAI calls
+    texts = [f"{(e.get('title') or '')} {(e.get('details') or '')}" for e in events]
+    with stage("classification"):
+        envs = asyncio.run(classify_environment_batch(texts)) if texts else []
+    candidates: List[Dict[str, Any]] = []
+    for idx, e in enumerate(events):
+        title = e.get("title") or ""
+        details = e.get("details") or ""
+        env = envs[idx] if idx < len(envs) else classify_environment(f"{title} {details}")
+        start_at = e.get("start")
+        if start_at:
+            day_names = [d for d in [_weekday_from_iso_datetime(start_at)] if d]
+            event_dates: List[str] = []
+        else:
+            found = extract_event_days(f"{title} {details}")
+            day_names = list(found.weekdays)
+            event_dates = [d.isoformat() for d in found.dates]
+        candidates.append(
+            {
+                "title": title,
+                "category": "event",
+                "type": "event",
+                "notes": details,
+                "url": canonical_url(e.get("url") or "", base_url) or e.get("url"),
+                "source": "visitpgh",
+                "environment": env,
+                "day_name": day_names[0] if day_names else None,
+                "day_names": day_names,
+                "event_dates": event_dates,
+                "start_at": start_at,
+            }
+        )
+    return candidates
+
+
+def _ticketmaster_candidates(events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    texts = [f"{(e.get('title') or '')} {(e.get('details') or '')}" for e in events]
+    with stage("classification"):
+        envs = asyncio.run(classify_environment_batch(texts)) if texts else []
+    candidates: List[Dict[str, Any]] = []
+    for idx, e in enumerate(events):
+        title = e.get("title") or ""
+        details = e.get("details") or ""
+        env = envs[idx] if idx < len(envs) else classify_environment(f"{title} {details}")
+        day_name = _weekday_from_iso_datetime(e.get("start_local") or e.get("start_datetime"))
+        candidates.append(
+            {
+                "title": title,
+                "category": "event",
+                "type": "event",
+                "notes": details,
+                "url": e.get("url"),
+                "source": "ticketmaster",
+                "external_id": e.get("id"),
+                "environment": env,
+                "day_name": day_name,
+                "day_names": [day_name] if day_name else [],
+                "coordinates": e.get("coordinates"),
+                "start_at": e.get("start_local") or e.get("start_datetime"),
+            }
+        )
+    return candidates
+
+
+def _stored_or_fetched(
+    source: str,
+    scope: str,
+    start: datetime,
+    end: datetime,
+    ttl_seconds: int,
+    fetch: Callable[[], List[Dict[str, Any]]],
+    near: Optional[Dict[str, float]] = None,
+    radius_miles: Optional[float] = None,
+) -> List[Dict[str, Any]]:
+    """Answer from the event store when a fresh fetch covered the window; otherwise
+    fetch upstream, write it through, and answer from the store.
+
+    Each fetch is the complete listing for ``scope``: events that dropped off it are
+    removed rather than kept until their undated rows expire.
+    """
+    store = get_event_store()
+    if store is None:
+        return fetch()
+    fetched: Optional[List[Dict[str, Any]]] = None
+    try:
+        covered = store.covers(source, scope, start, end, ttl_seconds)
+        cache_lookup("event_store", covered)
+        if not covered:
+            fetched = fetch()
+            store.ingest(source, scope, start, end, fetched, complete=True)
+        return store.query(start, end, sources=(source,), near=near, radius_miles=radius_miles)
+    except sqlite3.Error:
+        return fetched if fetched is not None else fetch()
+
+
+def _ticketmaster_window(start: datetime, end: datetime) -> Tuple[datetime, datetime]:
+    """Whole Monday-Sunday weeks around a request, so overlapping requests share one sync."""
+    first = start.date() - timedelta(days=start.weekday())
+    last = end.date() + timedelta(days=6 - end.weekday())
+    return (
+        datetime.combine(first, datetime.min.time()),
+        datetime.combine(last, datetime.max.time()).replace(microsecond=0),
+    )
+
+
+def _within_window(
+    items: List[Dict[str, Any]], start: datetime, end: datetime
+) -> List[Dict[str, Any]]:
+    """Drop events whose start time (venue wall clock) falls outside ``start..end``."""
+    lo, hi = start.replace(tzinfo=None), end.replace(tzinfo=None)
+    kept = []
+    for item in items:
+        try:
+            at = date_parser.isoparse(item["start_at"]) if item.get("start_at") else None
+        except (ValueError, OverflowError):
+            at = None
+        if at is None or lo <= at.replace(tzinfo=None) <= hi:
+            kept.append(item)
+    return kept
+
+
+def _listed_day(raw: Dict[str, Any]) -> Optional[date]:
+    value = raw.get("start_local") or raw.get("start_datetime")
+    try:
+        return date_parser.isoparse(str(value)).date() if value else None
+    except (ValueError, OverflowError):
+        return None
+
+
+def _sync_ticketmaster_week(
+    store: Any, scope: str, area: Dict[str, Any], win_start: datetime, win_end: datetime
+) -> None:
+    """Page a metro week into the store, resuming a listing cut off at the result cap.
+
+    Ticketmaster lists by date and stops after TM_MAX_RESULTS events, so a busy week can end
+    early. The days before the last one received are then complete and recorded as covered;
+    the rest of the week is fetched again from that (possibly partial) last day.
+    """
+    cur = win_start
+    while True:
+        payload = fetch_all_events_ticketmaster(**area, start=cur, end=win_end)
+        raw = list(payload.get("events", []))
+        if payload.get("complete", True):
+            store.sync("ticketmaster", scope, cur, win_end, raw, _ticketmaster_candidates)
+            return
+        last = max(filter(None, map(_listed_day, raw)), default=None)
+        if last is None or last <= cur.date():
+            # A single day fills the cap: keep its events, leave the window uncovered
+            store.sync(
+                "ticketmaster", scope, cur, win_end, raw, _ticketmaster_candidates,
+                complete=False,
             )
-        return env == env_preference
-
-    # Partition candidates
-    food = [
-        c
-        for c in candidates
-        if c.get("category") == "food" and match_env(c.get("environment"))
-    ]
-    events = [
-        c
-        for c in candidates
-        if c.get("category") != "food" and match_env(c.get("environment"))
-    ]
-
-    # Weather-based filtering for outdoor preference
-    if env_preference == "outdoor" and suitability is not None and suitability < 0.4:
-        # If outdoor is poor, prefer indoor events and record via notes
-        events = [
-            c
-            for c in candidates
-            if (c.get("environment") == "indoor" or c.get("environment") is None)
-        ]
-
-    def to_activity(item: Dict[str, Any], start_h: int, end_h: int) -> Activity:
-        return Activity(
-            name=item.get("name") or item.get("title") or "Activity",
-            category=item.get("category") or item.get("type") or "activity",
-            address=item.get("address"),
-            start_time=datetime(day.year, day.month, day.day, start_h, 0).time(),
-            end_time=datetime(day.year, day.month, day.day, end_h, 0).time(),
-            notes=item.get("notes"),
-            external_url=item.get("url"),
-            source=item.get("source"),
-            environment=item.get("environment"),
-            coordinates=item.get("coordinates"),
-            distance_miles=item.get("distance_miles"),
-            travel_time_minutes=item.get("duration_minutes"),
+            return
+        resume = datetime.combine(last, datetime.min.time())
+        store.sync(
+            "ticketmaster", scope, cur, resume - timedelta(seconds=1), raw,
+            _ticketmaster_candidates,
+        )
+        cur = resume
+
+
+def _ticketmaster_events(
+    city: str,
+    start: datetime,
+    end: datetime,
+    origin_coords: Optional[Dict[str, float]],
+    max_distance_miles: Optional[float],
+) -> List[Dict[str, Any]]:
+    """Ticketmaster candidates for one request, filtered locally by time and radius.
+
+    With the event store, whole weeks for the metro area are paged in once per TTL and
+    refreshed as deltas; requests then never reach Ticketmaster themselves.
+    """
+    settings = get_settings()
+    # The store filters by the exact radius; Ticketmaster's API only takes whole miles
+    radius = _event_radius(origin_coords, max_distance_miles)
+    city_name = city.split(",")[0].strip()
+    center = resolve_city(city)
+    if center is not None:
+        metro_radius = settings.ticketmaster_metro_radius_miles
+        scope = f"metro:{center['lat']:.2f},{center['lon']:.2f},{metro_radius}"
+        area: Dict[str, Any] = {
+            "city": None, "lat": center["lat"], "lon": center["lon"], "radius_miles": metro_radius
+        }
+    else:
+        scope = "city:" + city_name.lower()
+        area = {"city": city_name}
+
+    def fetch_direct() -> List[Dict[str, Any]]:
+        # No store: query just this request's window (and radius, when there is an origin)
+        query = area if origin_coords is None else {
+            "city": None,
+            "lat": origin_coords.get("lat"),
+            "lon": origin_coords.get("lon"),
+            "radius_miles": math.ceil(radius) if radius is not None else None,
+        }
+        payload = fetch_all_events_ticketmaster(**query, start=start, end=end)
+        return _ticketmaster_candidates(list(payload.get("events", [])))
+
+    store = get_event_store()
+    if store is None:
+        return _within_window(fetch_direct(), start, end)
+    win_start, win_end = _ticketmaster_window(start, end)
+    try:
+        covered = store.covers(
+            "ticketmaster", scope, win_start, win_end, settings.ticketmaster_ttl_seconds
+        )
+        cache_lookup("event_store", covered)
+        if not covered:
+            _sync_ticketmaster_week(store, scope, area, win_start, win_end)
+        found = store.query(
+            start, end, sources=("ticketmaster",), near=origin_coords, radius_miles=radius
         )
+    except sqlite3.Error:
+        found = fetch_direct()
+    return _within_window(found, start, end)
+
+
+def claim_crawl(interval_seconds: float) -> bool:
+    """Crawler run claim: across server workers sharing the event store, one wins per
+    interval. Without a store crawled events have nowhere to go, so nobody crawls."""
+    store = get_event_store()
+    if store is None:
+        return False
+    return store.claim_run("crawler", interval_seconds, holder=f"pid:{os.getpid()}")
 
-    # Morning: breakfast
-    if food:
-        chosen.append(to_activity(food[0], *blocks[0][1]))
-    # Afternoon: event
-    if events:
-        chosen.append(to_activity(events[0], *blocks[1][1]))
-    # Evening: dinner
-    if len(food) > 1:
-        chosen.append(to_activity(food[1], *blocks[2][1]))
-    elif food:
-        # reuse breakfast place for dinner only if no alternative
-        chosen.append(to_activity(food[0], *blocks[2][1]))
 
-    return chosen
+def ingest_crawled_events(events: List[Dict[str, Any]]) -> None:
+    """Crawler sink: classify crawled VisitPgh events and upsert them into the store."""
+    store = get_event_store()
+    if store is not None and events:
+        store.upsert("visitpgh", CRAWL_SCOPE, _visitpgh_candidates(events))
 
 
 def _collect_candidates(
     city: str,
-    interests: List[str],
-    env_pref: str,
     start: datetime,
     end: datetime,
     origin_coords: Optional[Dict[str, float]] = None,
     max_distance_miles: Optional[float] = None,
 ) -> Tuple[List[Dict[str, Any]], List[str], Dict[str, int]]:
+    settings = get_settings()
     warnings: List[str] = []
     sources: Dict[str, int] = {}
     candidates: List[Dict[str, Any]] = []
 
-    # VisitPgh events (web-scraped)
+    # VisitPgh events (web-scraped, plus anything the background crawler stored)
     try:
-        events_payload = fetch_this_week_events()
-        visit_events = list(events_payload.get("events", []))
-        # Batch classify to avoid sequential OpenAI calls
-        texts = [
-            f"{(e.get('title') or '')} {(e.get('details') or '')}" for e in visit_events
-        ]
-        envs = asyncio.run(classify_environment_batch(texts)) if texts else []
-        for idx, e in enumerate(visit_events):
-            title = e.get("title") or ""
-            details = e.get("details") or ""
-            url = e.get("url")
-            env = (
-                envs[idx]
-                if idx < len(envs)
-                else classify_environment(f"{title} {details}")
-            )
-            day_name = _parse_day_from_text(f"{title} {details}")
-            candidates.append(
-                {
-                    "title": title,
-                    "category": "event",
-                    "type": "event",
-                    "notes": details,
-                    "url": url,
-                    "source": "visitpgh",
-                    "environment": env,
-                    "day_name": day_name,
-                }
+        with stage("visitpgh"):
+            visit = _stored_or_fetched(
+                "visitpgh",
+                VISITPGH_SCOPE,
+                start,
+                end,
+                settings.visitpgh_ttl_seconds,
+                lambda: _visitpgh_candidates(list(fetch_this_week_events().get("events", []))),
             )
-        sources["visitpgh"] = len(events_payload.get("events", []))
+        candidates.extend(visit)
+        sources["visitpgh"] = len(visit)
     except Exception as exc:
         warnings.append(f"visitpgh_unavailable: {exc}")
 
-    # Yelp food
+    # Yelp food (answered from the area-wide pool; meal tags pick breakfast/dinner spots)
     try:
-        breakfast = search_food(query="breakfast", location=city, limit=5)
-        dinner = search_food(query="dinner", location=city, limit=5)
+        with stage("yelp"):
+            breakfast = search_food(query="breakfast", location=city, limit=5)
+            dinner = search_food(query="dinner", location=city, limit=5)
         sources["yelp"] = len(breakfast.get("results", [])) + len(
             dinner.get("results", [])
         )
-        for b in breakfast.get("results", [])[:3]:
+        # One candidate per business: the optimizer never reuses a candidate, so a spot
+        # listed for both meals must not enter twice (it could fill both on one day)
+        seen_food: set[str] = set()
+        for b in breakfast.get("results", [])[:3] + dinner.get("results", [])[:3]:
+            ident = b.get("id") or (b.get("name") or "").strip().lower()
+            if ident in seen_food:
+                continue
+            seen_food.add(ident)
             candidates.append(
                 {
                     "name": b.get("name"),
@@ -217,69 +410,28 @@ def _collect_candidates(
                     "url": b.get("url"),
                     "source": "yelp",
                     "environment": "indoor",  # default assumption
-                }
-            )
-        for d in dinner.get("results", [])[:3]:
-            candidates.append(
-                {
-                    "name": d.get("name"),
-                    "category": "food",
-                    "address": d.get("location"),
-                    "url": d.get("url"),
-                    "source": "yelp",
-                    "environment": "indoor",
+                    "coordinates": _yelp_coords(b.get("coordinates")),
+                    "meals": b.get("meals") or [],
                 }
             )
     except Exception as exc:
         warnings.append(f"yelp_unavailable: {exc}")
 
-    # Ticketmaster events (API) — restricted to requested window and proximity if available
+    # Ticketmaster events (API) — metro-wide weekly sync, filtered to window and proximity
     try:
-        if origin_coords is not None:
-            tm_payload = fetch_events_ticketmaster(
-                city=None,
-                lat=origin_coords.get("lat"),
-                lon=origin_coords.get("lon"),
-                radius_miles=int(max_distance_miles or 10),
-                start=start,
-                end=end,
-            )
-        else:
-            tm_payload = fetch_events_ticketmaster(
-                city=city.split(",")[0], start=start, end=end
-            )
-        tm_events = list(tm_payload.get("events", []))
-        texts = [
-            f"{(e.get('title') or '')} {(e.get('details') or '')}" for e in tm_events
-        ]
-        envs = asyncio.run(classify_environment_batch(texts)) if texts else []
-        for idx, e in enumerate(tm_events):
-            title = e.get("title") or ""
-            details = e.get("details") or ""
-            url = e.get("url")
-            env = (
-                envs[idx]
-                if idx < len(envs)
-                else classify_environment(f"{title} {details}")
-            )
-            day_name = _weekday_from_iso_datetime(e.get("start_datetime"))
-            candidates.append(
-                {
-                    "title": title,
-                    "category": "event",
-                    "type": "event",
-                    "notes": details,
-                    "url": url,
-                    "source": "ticketmaster",
-                    "environment": env,
-                    "day_name": day_name,
-                    "coordinates": e.get("coordinates"),
-                }
-            )
-        sources["ticketmaster"] = len(tm_payload.get("events", []))
+        with stage("ticketmaster"):
+            tm = _ticketmaster_events(city, start, end, origin_coords, max_distance_miles)
+        candidates.extend(tm)
+        sources["ticketmaster"] = len(tm)
     except Exception as exc:
         warnings.append(f"ticketmaster_unavailable: {exc}")
 
+    return candidates, warnings, sources
+
+
+def _filter_by_interests(
+    candidates: List[Dict[str, Any]], interests: List[str]
+) -> List[Dict[str, Any]]:
     # Filter by interests loosely if provided (keep broad for MVP)
     if interests:
         keep: List[Dict[str, Any]] = []
@@ -296,29 +448,40 @@ def _collect_candidates(
                 if (len(keep) % 3) == 0:
                     keep.append(c)
         candidates = keep
+    return candidates
 
-    if not any(c.get("category") == "event" for c in candidates):
-    candidates.append({
-        "title": "Explore Point State Park",
-        "category": "event",
-        "type": "outdoor",
-        "notes": "Fallback: Ticketmaster and VisitPgh unavailable.",
-        "source": "fallback",
-        "environment": "outdoor"
-    })
 
-    return candidates, warnings, sources
+def _snapshot_key(request: ItineraryRequest) -> Tuple[str, str, str, str]:
+    """Request fields that decide which candidates get fetched and annotated."""
+    return (
+        request.city.strip().lower(),
+        request.start_date.isoformat(),
+        request.end_date.isoformat(),
+        (request.user_address or "").strip().lower(),
+    )
 
 
-def build_itinerary_options(request: ItineraryRequest) -> ItineraryOptionsResponse:
+def _snapshot_covers(snapshot: Dict[str, Any], request: ItineraryRequest) -> bool:
+    if snapshot["key"] != _snapshot_key(request):
+        return False
+    radius = snapshot["max_distance_miles"]
+    if radius is None:
+        return True
+    # Ticketmaster and the spatial prefilter were bounded by the original effective radius
+    wanted = _event_radius(snapshot["origin_coords"], request.max_distance_miles)
+    return wanted is not None and wanted <= radius
+
+
+def _gather_snapshot(request: ItineraryRequest) -> Dict[str, Any]:
+    """Fetch, classify and distance-annotate candidates (the I/O-bound stage)."""
     warnings: List[str] = []
     used_sources: Dict[str, int] = {}
 
     # Weather
     daily_weather: Dict[str, Dict[str, Any]] = {}
     try:
-        forecast = fetch_forecast(request.city)
-        daily_weather = map_forecast_to_days(forecast)
+        with stage("weather"):
+            daily_weather = forecast_days(request.city)  # shared, TTL-cached per location
         used_sources["openweather"] = len(daily_weather)
     except Exception as exc:
         warnings.append(f"weather_unavailable: {exc}")
@@ -326,14 +489,13 @@ def build_itinerary_options(request: ItineraryRequest) -> ItineraryOptionsRespon
     # Determine origin early to pass into candidate collection for better filtering
     origin_coords: Optional[Dict[str, float]] = None
     if request.user_address:
-        origin_coords = geocode_address(request.user_address)
-        if origin_coords is None:
-            origin_coords = _pittsburgh_coords()
+        with stage("geocode"):
+            origin_coords = geocode_address(request.user_address)
+            if origin_coords is None:
+                origin_coords = resolve_city(request.city) or _pittsburgh_coords()
 
     candidates, w2, s2 = _collect_candidates(
         city=request.city,
-        interests=request.preferences.interests,
-        env_pref=request.preferences.environment,
         start=request.start_date,
         end=request.end_date,
         origin_coords=origin_coords,
@@ -343,147 +505,151 @@ def build_itinerary_options(request: ItineraryRequest) -> ItineraryOptionsRespon
     for k, v in s2.items():
         used_sources[k] = used_sources.get(k, 0) + v
 
-    # origin_coords already computed above
-
-    # Attach distances from origin when possible and filter by max distance if requested
+    # Attach distances from origin when possible
     if origin_coords is not None:
         # For items without coords, attempt naive geocode by address once
+        with stage("geocode"):
+            for c in candidates:
+                if not c.get("coordinates") and c.get("address"):
+                    gc = geocode_address(c["address"])  # may be None
+                    if gc:
+                        c["coordinates"] = gc
+
+        # Spatial prefilter: haversine is a lower bound on travel distance, so items
+        # outside the radius are dropped before they ever reach the Distance Matrix.
+        if request.max_distance_miles is not None:
+            index: GeoGridIndex[int] = GeoGridIndex()
+            index.extend((c.get("coordinates"), i) for i, c in enumerate(candidates))
+            in_range = {
+                i for i, _miles in index.query_radius(origin_coords, request.max_distance_miles)
+            }
+            candidates = [
+                c
+                for i, c in enumerate(candidates)
+                if not c.get("coordinates") or i in in_range
+            ]
+
+        # Only items with true coordinates go to the provider
+        located = [c for c in candidates if c.get("coordinates")]
         for c in candidates:
-            if not c.get("coordinates") and c.get("address"):
-                gc = geocode_address(c["address"])  # may be None
-                if gc:
-                    c["coordinates"] = gc
-
-        # Build destinations while tracking which items truly had coordinates
-        had_coords: list[bool] = []
-        destinations = []
-        for c in candidates:
-            coords = c.get("coordinates")
-            if coords:
-                had_coords.append(True)
-                destinations.append(coords)
-            else:
-                had_coords.append(False)
-                destinations.append(origin_coords)  # placeholder to keep matrix shape
-
-        matrix = distance_matrix_miles([origin_coords], destinations)
-        if matrix:
-            row0 = matrix[0]
-            for idx, c in enumerate(candidates):
-                dm = row0[idx]
-                # Only assign distances if we had true destination coordinates
-                if had_coords[idx]:
+            c["distance_miles"] = None
+            c["duration_minutes"] = None
+        if located:
+            with stage("distance_matrix"):
+                matrix = distance_matrix_miles(
+                    [origin_coords], [c["coordinates"] for c in located]
+                )
+            if matrix:
+                for c, dm in zip(located, matrix[0]):
                     c["distance_miles"] = dm.get("distance_miles")
                     c["duration_minutes"] = dm.get("duration_minutes")
-                else:
-                    c["distance_miles"] = None
-                    c["duration_minutes"] = None
 
-        if request.max_distance_miles is not None:
+    return {
+        "key": _snapshot_key(request),
+        "max_distance_miles": _event_radius(origin_coords, request.max_distance_miles),
+        "warnings": warnings,
+        "used_sources": used_sources,
+        "daily_weather": daily_weather,
+        "origin_coords": origin_coords,
+        "candidates": candidates,
+        "legs": {},  # travel legs computed so far, reused by re-plans
+    }
+
+
+def _assemble_options(
+    request: ItineraryRequest,
+    snapshot: Dict[str, Any],
+    warnings: List[str],
+    replan: bool = False,
+) -> ItineraryOptionsResponse:
+    """Filter snapshot candidates and build options (CPU-only when ``replan``)."""
+    used_sources: Dict[str, int] = dict(snapshot["used_sources"])
+    daily_weather: Dict[str, Dict[str, Any]] = snapshot["daily_weather"]
+    origin_coords: Optional[Dict[str, float]] = snapshot["origin_coords"]
+
+    candidates = _filter_by_interests(
+        list(snapshot["candidates"]), request.preferences.interests
+    )
+    if not any(c.get("category") == "event" for c in candidates):
+        candidates.append(
+            {
+                "title": "Explore Point State Park",
+                "category": "event",
+                "type": "outdoor",
+                "notes": "Fallback: Ticketmaster and VisitPgh unavailable.",
+                "source": "fallback",
+                "environment": "outdoor",
+            }
+        )
 
-            def within_limit(item: Dict[str, Any]) -> bool:
-                dist = item.get("distance_miles")
-                if dist is None:
-                    return True  # keep unknowns to avoid over-filtering
-                return dist <= request.max_distance_miles
+    if origin_coords is not None and request.max_distance_miles is not None:
 
-            candidates = [c for c in candidates if within_limit(c)]
+        def within_limit(item: Dict[str, Any]) -> bool:
+            dist = item.get("distance_miles")
+            if dist is None:
+                return True  # keep unknowns to avoid over-filtering
+            return dist <= request.max_distance_miles
 
-    # Build up to 3 options by selecting different events per day
-    options: List[ItineraryResponse] = []
-    day_dates = list(_daterange(request.start_date, request.end_date))
-    day_names = [WEEKDAY_NAMES[d.weekday()] for d in day_dates]
+        candidates = [c for c in candidates if within_limit(c)]
 
+    day_dates = list(_daterange(request.start_date, request.end_date))
     if not day_dates:
         return ItineraryOptionsResponse(
             options=[], warnings=warnings, used_sources=used_sources
         )
 
-    # Group events by day name
-    events_by_day: Dict[str, List[Dict[str, Any]]] = {dn: [] for dn in day_names}
-    for c in candidates:
-        dn = c.get("day_name")
-        if dn in events_by_day:
-            events_by_day[dn].append(c)
-        elif c.get("category") != "food":
-            # Unknown day: allow as fallback for any day
-            events_by_day.setdefault("unknown", []).append(c)
-
-    # For each option, pick a different featured event when possible
-    global_used_event_titles: set[str] = set()
-    global_used_food_names: set[str] = set()
-    for opt_idx in range(3):
-        days: List[DayPlan] = []
-        used_titles: set[str] = set()  # per-option events used across days
-        used_foods: set[str] = set()  # per-option foods used across days
-        for day_dt in day_dates:
-            dn = WEEKDAY_NAMES[day_dt.weekday()]
-            day_weather = daily_weather.get(day_dt.date().isoformat())
-
-            # Candidate pool for this day
-            day_events = [
-                e
-                for e in events_by_day.get(dn, [])
-                if e.get("title") not in used_titles
-                and e.get("title") not in global_used_event_titles
-            ]
-            if not day_events:
-                day_events = [
-                    e
-                    for e in events_by_day.get("unknown", [])
-                    if e.get("title") not in used_titles
-                    and e.get("title") not in global_used_event_titles
-                ]
-
-            # Choose candidates to assemble blocks
-            # Prefer events closest to origin first if distances available
-            def sort_by_distance(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-                return sorted(
-                    items,
-                    key=lambda x: (
-                        x.get("distance_miles") is None,
-                        x.get("distance_miles") or 0.0,
-                    ),
-                )
+    # Score candidates and beam-search blocks across days for the top-K diverse plans
+    settings = get_settings()
+    with stage("optimize"):
+        plans = optimize_plans(
+            day_dates=day_dates,
+            candidates=candidates,
+            env_preference=request.preferences.environment,
+            interests=request.preferences.interests,
+            daily_weather=daily_weather,
+            origin=origin_coords,
+            max_distance_miles=request.max_distance_miles,
+            beam_width=settings.planner_beam_width,
+            top_k=settings.planner_max_options,
+        )
 
-            day_events_sorted = sort_by_distance(day_events)
-            food_all = [
-                c
-                for c in candidates
-                if c.get("category") == "food"
-                and c.get("name") not in used_foods
-                and c.get("name") not in global_used_food_names
+    # Per day, legs only within each option (origin plus its stops), batched under the
+    # Maps element limit; re-plans reuse known legs and estimate the rest locally.
+    with stage("travel_legs"):
+        day_legs = []
+        for i in range(len(day_dates)):
+            groups = [
+                [origin_coords] + [item.get("coordinates") for *_b, item in plan["days"][i]]
+                for plan in plans
             ]
-            food_sorted = sort_by_distance(food_all)
-
-            # Diversify options by rotating the sorted lists per option index
-            if day_events_sorted:
-                ev_off = opt_idx % len(day_events_sorted)
-                rotated_events = day_events_sorted[ev_off:] + day_events_sorted[:ev_off]
-            else:
-                rotated_events = []
-
-            if food_sorted:
-                food_off = opt_idx % len(food_sorted)
-                rotated_food = food_sorted[food_off:] + food_sorted[:food_off]
-            else:
-                rotated_food = []
-
-            day_candidates = list(rotated_events) + list(rotated_food)
-            activities = _pick_non_overlapping_blocks(
-                day=day_dt,
-                candidates=day_candidates,
-                env_preference=request.preferences.environment,
-                weather_day_info=day_weather,
+            day_legs.append(
+                build_leg_table(
+                    [p for group in groups for p in group],
+                    known=snapshot["legs"],
+                    use_provider=not replan,
+                    groups=groups,
+                )
             )
+    for legs in day_legs:
+        snapshot["legs"].update(legs)
 
-            # Track used items to diversify options
-            for a in activities:
-                if a.category != "food" and a.name:
-                    used_titles.add(a.name)
-                if a.category == "food" and a.name:
-                    used_foods.add(a.name)
-
+    options: List[ItineraryResponse] = []
+    for opt_idx, plan in enumerate(plans):
+        days: List[DayPlan] = []
+        for day_idx, (day_dt, blocks) in enumerate(zip(day_dates, plan["days"])):
+            # Sequence stops to shorten travel; block times stay in place
+            ordered, legs = sequence_stops(
+                origin_coords,
+                [item for *_b, item in blocks],
+                day_legs[day_idx],
+                slot_meals=[BLOCK_MEALS.get(block) for block, *_rest in blocks],
+            )
+            activities = [
+                _to_activity(item, day_dt, start_h, end_h, leg)
+                for (_block, start_h, end_h, _orig), item, leg in zip(
+                    blocks, ordered, legs
+                )
+            ]
             days.append(DayPlan(date=day_dt, activities=activities))
 
         # Skip empty plans (no activities at all)
@@ -501,14 +667,6 @@ def build_itinerary_options(request: ItineraryRequest) -> ItineraryOptionsRespon
             )
         )
 
-        # Update global usage to steer subsequent options away from previously used items
-        for d in days:
-            for a in d.activities:
-                if a.category != "food" and a.name:
-                    global_used_event_titles.add(a.name)
-                if a.category == "food" and a.name:
-                    global_used_food_names.add(a.name)
-
     # Deduplicate identical options (can occur when data is sparse)
     unique: List[ItineraryResponse] = []
     seen_signatures: set[Tuple[Tuple[str, str], ...]] = set()
@@ -525,6 +683,50 @@ def build_itinerary_options(request: ItineraryRequest) -> ItineraryOptionsRespon
     )
 
 
+def snapshot_available(snapshot_id: str) -> bool:
+    """Whether a re-plan with ``snapshot_id`` would still find its snapshot."""
+    return _SNAPSHOTS.get(snapshot_id) is not None
+
+
+def build_itinerary_options(request: ItineraryRequest) -> ItineraryOptionsResponse:
+    """Build options, reusing a prior candidate snapshot when ``snapshot_id`` allows.
+
+    The first call gathers candidates and returns a ``snapshot_id``; follow-up
+    requests with the same city, dates and address (and a radius no larger than the
+    original) only re-run filtering and option assembly.
+    """
+    warnings: List[str] = []
+    snapshot: Optional[Dict[str, Any]] = None
+    snapshot_id = request.snapshot_id
+    if snapshot_id:
+        snapshot = _SNAPSHOTS.get(snapshot_id)
+        cache_lookup("plan_snapshot", snapshot is not None)
+        if snapshot is None:
+            warnings.append("snapshot_expired: rebuilt from sources")
+        elif not _snapshot_covers(snapshot, request):
+            warnings.append("snapshot_mismatch: rebuilt from sources")
+            snapshot = None
+
+    replan = snapshot is not None
+    if snapshot is None:
+        with stage("gather"):
+            snapshot = _gather_snapshot(request)
+        snapshot_id = uuid.uuid4().hex
+
+    # Cached values are shared (in process, the very object), so assemble on a copy and
+    # set it back when it learned new legs: every worker then sees them
+    known_legs = len(snapshot["legs"])
+    snapshot = dict(snapshot, legs=dict(snapshot["legs"]))
+    with stage("assemble"):
+        response = _assemble_options(
+            request, snapshot, list(snapshot["warnings"]) + warnings, replan=replan
+        )
+    if not replan or len(snapshot["legs"]) > known_legs:
+        _SNAPSHOTS.set(snapshot_id, snapshot)
+    response.snapshot_id = snapshot_id
+    return response
+
+
 def build_itinerary(request: ItineraryRequest) -> ItineraryResponse:
     """Backward-compatible single-plan builder.
 
@@ -534,7 +736,9 @@ def build_itinerary(request: ItineraryRequest) -> ItineraryResponse:
     """
     options = build_itinerary_options(request)
     if options.options:
-        return options.options[0]
+        best = options.options[0]
+        best.snapshot_id = options.snapshot_id
+        return best
 
     # Final fallback: minimal non-empty itinerary to avoid breaking existing smoke test
     days: List[DayPlan] = []
@@ -558,4 +762,5 @@ def build_itinerary(request: ItineraryRequest) -> ItineraryResponse:
         summary="Some data sources were unavailable; showing minimal plan.",
         warnings=options.warnings,
         sources=options.used_sources,
+        snapshot_id=options.snapshot_id,
     )
@@ -0,0 +1,226 @@
+"""
+Title: Day Route Sequencing
+Team: Purple Turtles — Gwen Li, Aadya Agarwal, Emma Peng, Noah Hicks
+Date: 2026-10-18
+Summary: Builds a per-day travel leg table (origin + each option's stops, requested in
+        tiles under the provider's element limit) and orders the flexible stops with nearest
+        neighbor + 2-opt (a stop only moves to a slot of its kind and, for meals, one it
+        serves), returning real leg times.
+Disclaimer: This file includes AI-assisted content (GPT-5); reviewed and approved by the Purple Turtles team.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+from .maps_client import _haversine_miles, distance_matrix_miles
+from .optimizer import ASSUMED_SPEED_MPH
+
+
+logger = logging.getLogger(__name__)
+
+# Google's Distance Matrix answers at most 100 elements (origins × destinations) per call
+MATRIX_MAX_ELEMENTS = 100
+_TILE = 10  # origins and destinations per call: 10 × 10 stays within the limit
+
+CoordKey = Tuple[float, float]
+LegTable = Dict[Tuple[CoordKey, CoordKey], Dict[str, Any]]
+
+
+def _key(coords: Dict[str, float]) -> CoordKey:
+    return (round(float(coords["lat"]), 6), round(float(coords["lon"]), 6))
+
+
+def build_leg_table(
+    points: Sequence[Optional[Dict[str, float]]],
+    known: Optional[LegTable] = None,
+    use_provider: bool = True,
+    groups: Optional[Sequence[Sequence[Optional[Dict[str, float]]]]] = None,
+) -> LegTable:
+    """Compute travel legs between the points, in as few matrix calls as fit the limit.
+
+    Points without coordinates are ignored. With ``groups`` (e.g. the origin plus one
+    plan's stops), only pairs within the same group are computed; otherwise every pair.
+    Pairs already in ``known`` are reused; if every pair is known, or ``use_provider`` is
+    False, no provider call is made. Unknown pairs are requested in tiles of at most
+    ``MATRIX_MAX_ELEMENTS`` origin × destination elements, skipping tiles that hold none.
+    Elements the provider cannot answer fall back to haversine at the optimizer's
+    assumed speed (logged) so sequencing always has a cost to work with.
+    """
+    known = known or {}
+    unique: Dict[CoordKey, Dict[str, float]] = {}
+    needed: List[Tuple[CoordKey, CoordKey]] = []
+    for group in groups if groups is not None else [points]:
+        group_keys: List[CoordKey] = []
+        for p in group:
+            if p and _key(p) not in group_keys:
+                group_keys.append(_key(p))
+                unique.setdefault(_key(p), p)
+        needed.extend((a, b) for a in group_keys for b in group_keys if a != b)
+    needed = list(dict.fromkeys(needed))
+    if not needed:
+        return {}
+
+    todo = {pair for pair in needed if pair not in known}
+    fetched: LegTable = {}
+    if use_provider and todo:
+        keys = list(unique.keys())
+        for r in range(0, len(keys), _TILE):
+            rows = keys[r : r + _TILE]
+            for c in range(0, len(keys), _TILE):
+                cols = keys[c : c + _TILE]
+                if not any((a, b) in todo for a in rows for b in cols):
+                    continue
+                matrix = distance_matrix_miles(
+                    [unique[k] for k in rows], [unique[k] for k in cols]
+                )
+                for a, row in zip(rows, matrix):
+                    for b, leg in zip(cols, row):
+                        if (a, b) in todo and leg.get("duration_minutes") is not None:
+                            fetched[(a, b)] = leg
+
+    table: LegTable = {}
+    estimated = 0
+    for a, b in needed:
+        leg = known.get((a, b)) or fetched.get((a, b))
+        if leg is None:
+            estimated += 1
+            miles = _haversine_miles(a[0], a[1], b[0], b[1])
+            leg = {
+                "distance_miles": miles,
+                "duration_minutes": int(round((miles / ASSUMED_SPEED_MPH) * 60)),
+            }
+        table[(a, b)] = leg
+    if use_provider and estimated:
+        logger.warning(
+            "travel legs: %d of %d pairs estimated from straight-line distance",
+            estimated, len(todo),
+        )
+    return table
+
+
+def leg_between(
+    legs: LegTable,
+    a: Optional[Dict[str, float]],
+    b: Optional[Dict[str, float]],
+) -> Optional[Dict[str, Any]]:
+    if not a or not b:
+        return None
+    ka, kb = _key(a), _key(b)
+    if ka == kb:
+        return {"distance_miles": 0.0, "duration_minutes": 0}
+    return legs.get((ka, kb))
+
+
+def _kind(stop: Dict[str, Any]) -> str:
+    return "food" if stop.get("category") == "food" else "event"
+
+
+def _route_cost(
+    legs: LegTable,
+    origin: Optional[Dict[str, float]],
+    stops: List[Dict[str, Any]],
+    order: List[int],
+) -> float:
+    total = 0.0
+    prev = origin
+    for idx in order:
+        cur = stops[idx].get("coordinates")
+        leg = leg_between(legs, prev, cur)
+        if leg is not None:
+            total += float(leg.get("duration_minutes") or 0)
+        prev = cur or prev
+    return total
+
+
+def _fits(
+    stop: Dict[str, Any], idx: int, pos: int, slot_kinds: List[str],
+    slot_meals: Sequence[Optional[str]], pinned: Set[int],
+) -> bool:
+    """Whether stop ``idx`` may take slot ``pos`` (its own slot always fits)."""
+    if idx == pos:
+        return True
+    if idx in pinned or pos in pinned or _kind(stop) != slot_kinds[pos]:
+        return False
+    # A tagged food stop only moves to a slot whose meal it serves
+    meal = slot_meals[pos] if pos < len(slot_meals) else None
+    return meal is None or not stop.get("meals") or meal in stop["meals"]
+
+
+def _valid(
+    order: List[int], stops: List[Dict[str, Any]], slot_kinds: List[str],
+    slot_meals: Sequence[Optional[str]], pinned: Set[int],
+) -> bool:
+    return all(
+        _fits(stops[idx], idx, pos, slot_kinds, slot_meals, pinned)
+        for pos, idx in enumerate(order)
+    )
+
+
+def sequence_stops(
+    origin: Optional[Dict[str, float]],
+    stops: List[Dict[str, Any]],
+    legs: LegTable,
+    pinned: Optional[Set[int]] = None,
+    slot_meals: Optional[Sequence[Optional[str]]] = None,
+) -> Tuple[List[Dict[str, Any]], List[Optional[Dict[str, Any]]]]:
+    """Order a day's stops to shorten total travel and return per-stop legs.
+
+    Stops keep the slot kinds of the incoming order (e.g. food → event → food), so a
+    stop only moves into a slot of its own kind. ``slot_meals`` names the meal served in
+    each slot (e.g. breakfast, None, dinner); food stops with ``meals`` tags only move
+    into slots whose meal they serve. Indexes in ``pinned`` never move. Nearest neighbor
+    builds the route and 2-opt improves it. Returns the reordered stops and, aligned
+    with them, the leg from the previous stop (or origin).
+    """
+    pinned = pinned or set()
+    slot_meals = list(slot_meals or [])
+    n = len(stops)
+    slot_kinds = [_kind(s) for s in stops]
+
+    # Nearest neighbor: fill slots in order with the closest unvisited stop that fits
+    order: List[int] = []
+    remaining = set(range(n))
+    prev = origin
+    for pos in range(n):
+        options = [
+            i for i in remaining if _fits(stops[i], i, pos, slot_kinds, slot_meals, pinned)
+        ]
+        if not options:  # an earlier greedy pick took the only stop for this slot
+            order = list(range(n))
+            break
+
+        def cost(i: int) -> float:
+            leg = leg_between(legs, prev, stops[i].get("coordinates"))
+            if leg is None:
+                return float("inf")
+            return float(leg.get("duration_minutes") or 0)
+
+        choice = min(options, key=lambda i: (cost(i), i))
+        order.append(choice)
+        remaining.discard(choice)
+        prev = stops[choice].get("coordinates") or prev
+
+    # 2-opt: reverse segments while every stop still fits its slot and travel drops
+    best_cost = _route_cost(legs, origin, stops, order)
+    improved = True
+    while improved:
+        improved = False
+        for i in range(n - 1):
+            for j in range(i + 1, n):
+                trial = order[:i] + order[i : j + 1][::-1] + order[j + 1 :]
+                if not _valid(trial, stops, slot_kinds, slot_meals, pinned):
+                    continue
+                trial_cost = _route_cost(legs, origin, stops, trial)
+                if trial_cost < best_cost - 1e-9:
+                    order, best_cost, improved = trial, trial_cost, True
+
+    ordered = [stops[i] for i in order]
+    leg_list: List[Optional[Dict[str, Any]]] = []
+    prev = origin
+    for stop in ordered:
+        cur = stop.get("coordinates")
+        leg_list.append(leg_between(legs, prev, cur))
+        prev = cur or prev
+    return ordered, leg_list
@@ -3,7 +3,7 @@ Title: Ticketmaster Discovery API Client
 Team: Purple Turtles — Gwen Li, Aadya Agarwal, Emma Peng, Noah Hicks
 Date: 2025-09-12
 Summary: Lightweight client for Ticketmaster Discovery API to fetch events by city
-         and date range for Pittsburgh planning.
+         and date range for Pittsburgh planning, one page at a time or a whole window.
 Disclaimer: This file includes AI-assisted content (GPT-5); reviewed and approved by the Purple Turtles team.
 """
 
@@ -12,12 +12,13 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
-import httpx
-
 from ..core.config import get_settings
+from ..core.http import http_client
+from ..core.metrics import upstream
 
 
 TM_BASE_URL = "https://app.ticketmaster.com/discovery/v2/events.json"
+TM_MAX_RESULTS = 1000  # the Discovery API refuses pages past size * page >= 1000
 
 
 def _format_iso_z(dt: datetime) -> str:
@@ -35,10 +36,13 @@ def fetch_events_ticketmaster(
     start: Optional[datetime] = None,
     end: Optional[datetime] = None,
     size: int = 50,
+    page: int = 0,
 ) -> Dict[str, Any]:
-    """Fetch events via Ticketmaster Discovery API.
+    """Fetch one page of events via Ticketmaster Discovery API.
 
-    Returns simplified list: [{title, details, url, start_datetime, venue, coordinates}]
+    Returns simplified list:
+    [{id, title, details, url, start_datetime, start_local, venue, coordinates}]
+    plus ``page`` ({number, total_pages, total_elements}) for paging.
     """
     settings = get_settings()
     if not settings.ticketmaster_api_key or settings.ticketmaster_api_key.startswith("changeme"):
@@ -49,6 +53,8 @@ def fetch_events_ticketmaster(
         "size": min(max(size, 1), 200),
         "sort": "date,asc",
     }
+    if page:
+        params["page"] = page
 
     if start:
         params["startDateTime"] = _format_iso_z(start)
@@ -63,8 +69,8 @@ def fetch_events_ticketmaster(
     elif city:
         params["city"] = city
 
-    with httpx.Client(timeout=10) as client:
-        resp = client.get(TM_BASE_URL, params=params)
+    with upstream("ticketmaster"), http_client(timeout=10) as client:
+        resp = client.get(settings.ticketmaster_base_url or TM_BASE_URL, params=params)
         resp.raise_for_status()
         data = resp.json()
 
@@ -75,6 +81,10 @@ def fetch_events_ticketmaster(
         url = e.get("url")
         dates = e.get("dates", {})
         start_dt = dates.get("start", {}).get("dateTime")
+        # Venue wall-clock date/time ("2025-09-13T19:05:00"), used for day matching
+        local_date = dates.get("start", {}).get("localDate")
+        local_time = dates.get("start", {}).get("localTime")
+        start_local = f"{local_date}T{local_time}" if local_date and local_time else local_date
         venues = (e.get("_embedded", {}) or {}).get("venues", [])
         venue_name = venues[0].get("name") if venues else None
         coords = None
@@ -89,16 +99,77 @@ def fetch_events_ticketmaster(
         info = e.get("info") or e.get("pleaseNote") or None
         events.append(
             {
+                "id": e.get("id"),
                 "title": title,
                 "details": info,
                 "url": url,
                 "start_datetime": start_dt,
+                "start_local": start_local,
                 "venue": venue_name,
                 "coordinates": coords,
                 "source": "ticketmaster",
             }
         )
 
-    return {"source": TM_BASE_URL, "events": events}
+    page_info = data.get("page") or {}
+    return {
+        "source": TM_BASE_URL,
+        "events": events,
+        "page": {
+            "number": int(page_info.get("number", page) or 0),
+            "total_pages": int(page_info.get("totalPages", 1) or 0),
+            "total_elements": int(page_info.get("totalElements", len(events)) or 0),
+        },
+    }
+
+
+def fetch_all_events_ticketmaster(
+    city: Optional[str] = "Pittsburgh",
+    lat: Optional[float] = None,
+    lon: Optional[float] = None,
+    radius_miles: Optional[int] = 25,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    page_size: Optional[int] = None,
+    max_pages: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Page through every event in the window (up to the API's deep-paging limit).
+
+    Events are de-duplicated by Ticketmaster id; ``pages`` counts the upstream calls and
+    ``complete`` is False when the page budget ran out before the last page.
+    """
+    settings = get_settings()
+    size = min(max(page_size or settings.ticketmaster_page_size, 1), 200)
+    max_pages = max(1, max_pages or settings.ticketmaster_max_pages)
+
+    events: List[Dict[str, Any]] = []
+    seen: set = set()
+    pages = 0
+    page = 0
+    complete = False
+    while page < max_pages and (page + 1) * size <= TM_MAX_RESULTS:
+        data = fetch_events_ticketmaster(
+            city=city,
+            lat=lat,
+            lon=lon,
+            radius_miles=radius_miles,
+            start=start,
+            end=end,
+            size=size,
+            page=page,
+        )
+        pages += 1
+        batch = data.get("events", [])
+        for e in batch:
+            key = e.get("id") or e.get("url") or e.get("title")
+            if key not in seen:
+                seen.add(key)
+                events.append(e)
+        total_pages = (data.get("page") or {}).get("total_pages", 0)
+        if not batch or page + 1 >= total_pages:
+            complete = True
+            break
+        page += 1
+    return {"source": TM_BASE_URL, "events": events, "pages": pages, "complete": complete}
 
 
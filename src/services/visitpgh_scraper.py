@@ -6,25 +6,143 @@ Summary: Scrapes 'This Week in Pittsburgh' events from VisitPittsburgh.
 Disclaimer: This file includes AI-assisted content (GPT-5); reviewed and approved by the Purple Turtles team.
 """
 
-from typing import Any, Dict, List
-import httpx
-from bs4 import BeautifulSoup
+import hashlib
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+from ..core.config import get_settings
+from ..core.http import http_client
+from ..core.metrics import cache_lookup, upstream
+
+if TYPE_CHECKING:  # pragma: no cover
+    import httpx
 
 
 VISIT_PGH_URL = (
     "https://www.visitpittsburgh.com/events-festivals/this-week-in-pittsburgh/"
 )
 
+# Last successful fetch: HTTP validators, body hash and parsed events
+_PAGE_STATE: Dict[str, Any] = {}
+_PAGE_LOCK = threading.Lock()
 
-def fetch_this_week_events() -> Dict[str, Any]:
-    """Scrape VisitPittsburgh's 'This Week' page and return a list of event dicts.
 
-    This is best-effort scraping and may need adjustments if the page structure changes.
+# Headings containing any of these are page chrome, not events
+_SKIP_HEADINGS = (
+    "navigation",
+    "happening this week",
+    "ongoing",
+    "get the details",
+    "contact",
+    "privacy",
+    "start planning",
+)
+_MAX_EVENTS = 25
+_DETAIL_TAGS = frozenset({"p", "strong", "span"})
+_DETAIL_LOOKAHEAD = 5
+# Text under these tags is not a plain string for bs4's get_text (Script, Stylesheet, ...)
+_NON_TEXT_TAGS = frozenset({"script", "style", "template", "rt", "rp"})
+
+
+def _is_event_title(title: str) -> bool:
+    lowered = title.lower()
+    return bool(title) and not any(k in lowered for k in _SKIP_HEADINGS)
+
+
+def _dedupe(events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    # De-dup on title
+    seen = set()
+    unique: List[Dict[str, Any]] = []
+    for e in events:
+        t = e.get("title")
+        if t and t not in seen:
+            unique.append(e)
+            seen.add(t)
+    return unique[:_MAX_EVENTS]
+
+
+def _strings(el: Any, hidden: bool = False):
+    """Yield the text nodes under ``el`` in document order, like bs4's ``_all_strings``."""
+    hidden = hidden or el.tag in _NON_TEXT_TAGS
+    if el.text and not hidden:
+        yield el.text
+    for child in el:
+        if isinstance(child.tag, str):  # comments / PIs carry no visible text
+            yield from _strings(child, hidden)
+        if child.tail and not hidden:
+            yield child.tail
+
+
+def _text(el: Any, sep: str = "") -> str:
+    hidden = any(a.tag in _NON_TEXT_TAGS for a in el.iterancestors())
+    return sep.join(t for t in (s.strip() for s in _strings(el, hidden)) if t)
+
+
+def parse_events_html(html: str) -> List[Dict[str, Any]]:
+    """Extract de-duplicated event dicts ({title, details, url}) from the page HTML.
+
+    Single forward walk over the lxml tree: each event heading stays "open" until it has
+    seen its first link and up to five detail candidates (p/strong/span), so the page is
+    visited once instead of rescanning the rest of the document per heading. Output is
+    identical to :func:`parse_events_html_bs4`.
     """
-    with httpx.Client(timeout=15) as client:
-        resp = client.get(VISIT_PGH_URL, headers={"User-Agent": "weekender/1.0"})
-        resp.raise_for_status()
-        html = resp.text
+    if not html or not html.strip():
+        return []
+    from lxml import etree  # imported on first parse, not at app start
+
+    # Push-parse like bs4's lxml builder does; libxml2 recovers from broken markup
+    # (e.g. an unterminated <script>) differently in one-shot mode.
+    parser = etree.HTMLParser()
+    parser.feed(html)
+    root = parser.close()
+    if root is None:
+        return []
+
+    main = next(root.iter("main"), root)
+    headings = {id(h): h for h in main.iter("h2", "h3")}
+
+    events: List[Dict[str, Any]] = []
+    want_details: List[List[Any]] = []  # [event, candidates seen so far]
+    want_link: List[Dict[str, Any]] = []
+    titles = set()
+
+    for el in root.iter(etree.Element):
+        if len(titles) >= _MAX_EVENTS and not want_details and not want_link:
+            break  # later headings can only be cut by the de-dup/limit below
+        tag = el.tag
+        if want_details and tag in _DETAIL_TAGS:
+            txt = _text(el, " ")
+            still_open = []
+            for pending in want_details:
+                pending[1] += 1
+                if txt and len(txt) > 6:
+                    pending[0]["details"] = txt
+                elif pending[1] < _DETAIL_LOOKAHEAD:
+                    still_open.append(pending)
+            want_details = still_open
+        elif want_link and tag == "a":
+            href = el.get("href") or None
+            for event in want_link:
+                event["url"] = href
+            want_link = []
+
+        if id(el) in headings:
+            title = _text(el)
+            if not _is_event_title(title):
+                continue
+            event = {"title": title, "details": None, "url": None}
+            events.append(event)
+            titles.add(title)
+            want_details.append([event, 0])
+            want_link.append(event)
+
+    return _dedupe(events)
+
+
+def parse_events_html_bs4(html: str) -> List[Dict[str, Any]]:
+    """Reference BeautifulSoup implementation (kept for parity tests and benchmarks)."""
+    from bs4 import BeautifulSoup
 
     soup = BeautifulSoup(html, "lxml")
 
@@ -37,22 +155,8 @@ def fetch_this_week_events() -> Dict[str, Any]:
     # Collect h2/h3 headings that look like event titles
     for heading in main.select("h2, h3"):
         title = heading.get_text(strip=True)
-        if not title:
-            continue
         # Skip obvious non-event headings
-        lowered = title.lower()
-        if any(
-            k in lowered
-            for k in [
-                "navigation",
-                "happening this week",
-                "ongoing",
-                "get the details",
-                "contact",
-                "privacy",
-                "start planning",
-            ]
-        ):
+        if not _is_event_title(title):
             continue
 
         # Try to locate a nearby date/venue text in the next sibling(s)
@@ -70,13 +174,68 @@ def fetch_this_week_events() -> Dict[str, Any]:
 
         events.append({"title": title, "details": info_text, "url": link})
 
-    # De-dup on title
-    seen = set()
-    unique: List[Dict[str, Any]] = []
-    for e in events:
-        t = e.get("title")
-        if t and t not in seen:
-            unique.append(e)
-            seen.add(t)
+    return _dedupe(events)
+
+
+def fetch_this_week_events(client: Optional["httpx.Client"] = None) -> Dict[str, Any]:
+    """Scrape VisitPittsburgh's 'This Week' page and return a list of event dicts.
+
+    This is best-effort scraping and may need adjustments if the page structure changes.
+    Results are reused for VISITPGH_TTL_SECONDS; after that the page is revalidated with
+    a conditional GET (ETag / Last-Modified) and only re-parsed when its body changed.
+    """
+    settings = get_settings()
+    with _PAGE_LOCK:
+        state = dict(_PAGE_STATE)
+    fresh = bool(state) and time.monotonic() - state["checked_at"] < settings.visitpgh_ttl_seconds
+    cache_lookup("visitpgh_page", fresh)
+    if fresh:
+        return _payload(state["events"])
+
+    headers = {"User-Agent": "weekender/1.0"}
+    if state.get("etag"):
+        headers["If-None-Match"] = state["etag"]
+    if state.get("last_modified"):
+        headers["If-Modified-Since"] = state["last_modified"]
+
+    url = settings.visitpgh_url or VISIT_PGH_URL
+    with upstream("visitpgh"):
+        if client is None:
+            with http_client(timeout=15) as own_client:
+                resp = own_client.get(url, headers=headers)
+        else:
+            resp = client.get(url, headers=headers)
+        if resp.status_code != 304:
+            resp.raise_for_status()
+
+    if resp.status_code == 304 and state:
+        events = state["events"]
+        body_hash = state["body_hash"]
+    else:
+        body_hash = hashlib.sha256(resp.content).hexdigest()
+        if state and body_hash == state.get("body_hash"):
+            events = state["events"]  # server ignored validators but nothing changed
+        else:
+            events = parse_events_html(resp.text)
+
+    with _PAGE_LOCK:
+        _PAGE_STATE.update(
+            {
+                "etag": resp.headers.get("ETag") or state.get("etag"),
+                "last_modified": resp.headers.get("Last-Modified") or state.get("last_modified"),
+                "body_hash": body_hash,
+                "events": events,
+                "checked_at": time.monotonic(),
+            }
+        )
+    return _payload(events)
+
+
+def _payload(events: List[Dict[str, Any]]) -> Dict[str, Any]:
+    # Copies keep callers from mutating the cached events
+    return {"source": VISIT_PGH_URL, "events": [dict(e) for e in events]}
+
 
-    return {"source": VISIT_PGH_URL, "events": unique[:25]}
+def reset_page_state() -> None:
+    with _PAGE_LOCK:
+        _PAGE_STATE.clear()
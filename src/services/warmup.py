@@ -0,0 +1,50 @@
+"""
+Title: Startup Pre-warming
+Team: Purple Turtles — Gwen Li, Aadya Agarwal, Emma Peng, Noah Hicks
+Date: 2026-10-18
+Summary: Heavy dependencies load on first use so workers import quickly; the app lifespan
+        calls prewarm() before serving so the first requests do not pay for them either.
+        Everything here is local (no upstream calls): the shared TLS context, the HTML parser,
+        the SQLite event store and, when a key is configured, the OpenAI SDK.
+Disclaimer: This file includes AI-assisted content (GPT-5); reviewed and approved by the Purple Turtles team.
+"""
+
+from __future__ import annotations
+
+from importlib import import_module
+import logging
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+from ..core.config import get_settings
+from ..core.http import ssl_context
+from .event_store import get_event_store
+
+
+logger = logging.getLogger(__name__)
+
+
+def _steps() -> List[Tuple[str, Callable[[], Any]]]:
+    steps: List[Tuple[str, Callable[[], Any]]] = [
+        ("tls_context", ssl_context),
+        ("html_parser", lambda: import_module("lxml.etree")),
+        ("event_store", get_event_store),
+    ]
+    key = get_settings().openai_api_key
+    if key and not key.startswith("changeme"):
+        steps.append(("openai_sdk", lambda: import_module("openai")))
+    return steps
+
+
+def prewarm() -> Dict[str, float]:
+    """Run each warm-up step; returns seconds per step (failures are logged, not raised)."""
+    timings: Dict[str, float] = {}
+    for name, step in _steps():
+        t0 = time.perf_counter()
+        try:
+            step()
+        except Exception as exc:  # a cold start is still better than no start
+            logger.warning("prewarm %s failed: %s", name, exc)
+        timings[name] = round(time.perf_counter() - t0, 4)
+    logger.info("prewarm done: %s", timings)
+    return timings
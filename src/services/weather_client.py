@@ -2,83 +2,268 @@
 Title: Weather Client Service
 Team: Purple Turtles — Gwen Li, Aadya Agarwal, Emma Peng, Noah Hicks
 Date: 2025-09-11
-Summary: Fetches weather forecast and provides an outdoor suitability score.
+Summary: Fetches weather forecast (cached per city) and provides an outdoor suitability score,
+        per day and per itinerary time block (interpolated from the 3-hourly feed).
 Disclaimer: This file includes AI-assisted content (GPT-5); reviewed and approved by the Purple Turtles team.
 """
 
 from __future__ import annotations
 
-from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, List, Optional
-
-import httpx
+from bisect import bisect_left
+import copy
+from datetime import date, datetime, timedelta, timezone
+import threading
+from typing import Any, Dict, List, Optional, Tuple
 
+from ..core.cache import make_cache
 from ..core.config import get_settings
+from ..core.http import http_client
+from ..core.metrics import cache_lookup, coalesced, upstream
+from .maps_client import resolve_city
+from .optimizer import DAY_BLOCKS
 
 
 OPENWEATHER_URL = "https://api.openweathermap.org/data/2.5/forecast"  # 3-hourly 5-day
 
+COORD_DECIMALS = 2  # ~1 km; every spelling of a city shares one forecast
 
-def _geocode_city_to_coords(city: str) -> Optional[Dict[str, float]]:
-    # Minimal mapping for Pittsburgh; could be expanded or use Maps API.
-    lowered = city.lower()
-    if "pittsburgh" in lowered:
-        return {"lat": 40.4406, "lon": -79.9959}
-    return None
+# Raw feed + derived views per rounded location; one upstream call per place per TTL
+_FORECASTS = make_cache("forecast", 64, get_settings().weather_ttl_seconds)
+_FETCH_LOCKS: Dict[str, threading.Lock] = {}
+_FETCH_LOCKS_GUARD = threading.Lock()
 
 
-def fetch_forecast(city: str, now: Optional[datetime] = None) -> Dict[str, Any]:
+def _location(city: str) -> Tuple[str, Dict[str, Any]]:
+    """(cache key, OpenWeather query params) for a city, by coordinates when resolvable."""
+    coords = resolve_city(city)
+    if coords is not None:
+        lat = round(coords["lat"], COORD_DECIMALS)
+        lon = round(coords["lon"], COORD_DECIMALS)
+        return f"geo:{lat:.{COORD_DECIMALS}f},{lon:.{COORD_DECIMALS}f}", {"lat": lat, "lon": lon}
+    # Unknown place without a geocoder: let OpenWeather resolve the name
+    return "q:" + " ".join(city.lower().replace(",", " ").split()), {"q": city}
+
+
+def _fetch_raw(location: Dict[str, Any]) -> Dict[str, Any]:
     settings = get_settings()
+    key = settings.weather_api_key
+    if not key or key.startswith("changeme"):
+        raise RuntimeError("WEATHER_API_KEY not configured")
 
     params = {
-        "q": city,
-        "appid": settings.weather_api_key,
-        "units": "imperial",  # 华氏温度
+        **location,
+        "appid": key,
+        "units": "imperial",  # Fahrenheit
     }
 
-    with httpx.Client(timeout=10) as client:
-        resp = client.get(OPENWEATHER_URL, params=params)
+    with upstream("openweather"), http_client(timeout=10) as client:
+        resp = client.get(settings.openweather_url or OPENWEATHER_URL, params=params)
         resp.raise_for_status()
-        data = resp.json()
+        return resp.json()
 
-    # 按小时数据处理（每3小时一条）
-    hourly_forecast = []
-    for item in data["list"][:8]:  # 未来24小时（每3小时）
-        hourly_forecast.append(
-            {
-                "time": item["dt_txt"],
-                "temp": item["main"]["temp"],
-                "humidity": item["main"]["humidity"],
-                "description": item["weather"][0]["description"],
-            }
+
+def summarize_forecast(
+    raw: Dict[str, Any], city: str
+) -> Tuple[Dict[str, Any], Dict[str, Dict[str, Any]]]:
+    """One pass over the 3-hourly feed -> (dashboard view, per-day planner summary).
+
+    Days are grouped by the city's local date (the feed's ``city.timezone`` offset).
+    """
+    city_info = raw.get("city") if isinstance(raw.get("city"), dict) else {}
+    offset = timedelta(seconds=int(city_info.get("timezone") or 0))
+    hourly: List[Dict[str, Any]] = []
+    acc: Dict[str, Dict[str, List[Any]]] = {}
+    # Local-time series (seconds since epoch, shifted by the offset) for block interpolation
+    series: Dict[str, Tuple[List[float], List[float]]] = {
+        "temp": ([], []),
+        "wind": ([], []),
+        "pop": ([], []),
+    }
+    last_local = None
+
+    for item in raw.get("list", []):
+        ts = item.get("dt")
+        if ts is None:
+            continue
+        main = item.get("main") or {}
+        wind = item.get("wind") or {}
+        weather = (item.get("weather") or [{}])[0] or {}
+
+        # Next 24 hours (3-hourly rows) for the dashboard
+        if len(hourly) < 8:
+            hourly.append(
+                {
+                    "time": item.get("dt_txt"),
+                    "temp": main.get("temp"),
+                    "humidity": main.get("humidity"),
+                    "description": weather.get("description"),
+                }
+            )
+
+        local_ts = ts + offset.total_seconds()
+        if last_local is None or local_ts > last_local:  # the feed is ordered; keep it so
+            last_local = local_ts
+            if main.get("temp") is not None:
+                series["temp"][0].append(local_ts)
+                series["temp"][1].append(main["temp"])
+            series["wind"][0].append(local_ts)
+            series["wind"][1].append(wind.get("speed", 0))
+            series["pop"][0].append(local_ts)
+            series["pop"][1].append(item.get("pop", 0))
+
+        ds = (datetime.fromtimestamp(ts, tz=timezone.utc) + offset).date().isoformat()
+        day = acc.setdefault(
+            ds, {"temps": [], "humidities": [], "winds": [], "pops": [], "descriptions": []}
         )
+        if main.get("temp") is not None:
+            day["temps"].append(main["temp"])
+        if main.get("humidity") is not None:
+            day["humidities"].append(main["humidity"])
+        day["winds"].append(wind.get("speed", 0))
+        day["pops"].append(item.get("pop", 0))
+        if weather.get("description"):
+            day["descriptions"].append(weather["description"])
 
-    # 按天汇总（未来7天平均温度）
-    daily_dict = {}
-    for item in data["list"]:
-        date_str = item["dt_txt"].split(" ")[0]
-        if date_str not in daily_dict:
-            daily_dict[date_str] = {"temps": [], "humidities": []}
-        daily_dict[date_str]["temps"].append(item["main"]["temp"])
-        daily_dict[date_str]["humidities"].append(item["main"]["humidity"])
-
-    daily_forecast = []
-    for date_str, values in daily_dict.items():
-        avg_temp = sum(values["temps"]) / len(values["temps"])
-        avg_hum = sum(values["humidities"]) / len(values["humidities"])
-        daily_forecast.append(
+    blocks = _block_weather(list(acc), series)
+    daily: List[Dict[str, Any]] = []
+    summary: Dict[str, Dict[str, Any]] = {}
+    for ds, values in acc.items():
+        temp_avg = _mean(values["temps"])
+        hum_avg = _mean(values["humidities"])
+        wind_avg = _mean(values["winds"]) or 0
+        pop_avg = _mean(values["pops"]) or 0
+        daily.append(
             {
-                "date": date_str,
-                "temp": round(avg_temp, 1),
-                "humidity": round(avg_hum, 1),
+                "date": ds,
+                "temp": round(temp_avg, 1) if temp_avg is not None else None,
+                "humidity": round(hum_avg, 1) if hum_avg is not None else None,
+                # Most frequent condition of the day (the dashboard headline)
+                "description": (
+                    max(values["descriptions"], key=values["descriptions"].count)
+                    if values["descriptions"]
+                    else None
+                ),
             }
         )
+        summary[ds] = {
+            "temp_avg_f": temp_avg,
+            "wind_avg_mph": wind_avg,
+            "precip_prob_avg": pop_avg,
+            "suitability": outdoor_suitability(
+                {"temp_f": temp_avg, "wind_mph": wind_avg, "precip_prob": pop_avg}
+            ),
+            "blocks": blocks.get(ds, {}),
+        }
 
-    return {
+    dashboard = {
         "city": city,
-        "daily": daily_forecast[:7],  # 7天
-        "hourly": hourly_forecast,  # 24小时（每3小时）
+        "daily": daily[:7],
+        "hourly": hourly,
     }
+    return dashboard, summary
+
+
+def _mean(values: List[float]) -> Optional[float]:
+    return sum(values) / len(values) if values else None
+
+
+def _interpolate(xs: List[float], ys: List[float], samples: List[float]) -> List[Optional[float]]:
+    """Linear interpolation of ``ys`` at sorted ``samples``; ``None`` outside ``xs``."""
+    out: List[Optional[float]] = []
+    if not xs:
+        return [None] * len(samples)
+    i = bisect_left(xs, samples[0]) if samples else 0
+    for x in samples:
+        while i < len(xs) and xs[i] < x:
+            i += 1
+        if i == len(xs) or (i == 0 and xs[0] > x):
+            out.append(None)
+        elif xs[i] == x:
+            out.append(float(ys[i]))
+        else:
+            x0, x1 = xs[i - 1], xs[i]
+            out.append(ys[i - 1] + (ys[i] - ys[i - 1]) * (x - x0) / (x1 - x0))
+    return out
+
+
+def _block_weather(
+    dates: List[str], series: Dict[str, Tuple[List[float], List[float]]]
+) -> Dict[str, Dict[str, Dict[str, Any]]]:
+    """Per-date, per-block conditions interpolated hourly across each DAY_BLOCKS window.
+
+    Temperature and wind are averaged over the block's hours; precipitation takes the
+    block's worst hour so an afternoon storm is not diluted by a dry morning. Blocks the
+    feed does not reach (already past, or beyond the last row) are left out.
+    """
+    samples: List[float] = []
+    for ds in sorted(dates):
+        midnight = datetime.combine(date.fromisoformat(ds), datetime.min.time())
+        base = midnight.replace(tzinfo=timezone.utc).timestamp()
+        for _block, start_h, end_h, _kind in DAY_BLOCKS:
+            samples.extend(base + h * 3600 for h in range(start_h, end_h + 1))
+    values = {name: _interpolate(xs, ys, samples) for name, (xs, ys) in series.items()}
+
+    out: Dict[str, Dict[str, Dict[str, Any]]] = {}
+    pos = 0
+    for ds in sorted(dates):
+        for block, start_h, end_h, _kind in DAY_BLOCKS:
+            n = end_h - start_h + 1
+            temps = [v for v in values["temp"][pos : pos + n] if v is not None]
+            winds = [v for v in values["wind"][pos : pos + n] if v is not None]
+            pops = [v for v in values["pop"][pos : pos + n] if v is not None]
+            pos += n
+            if not temps:
+                continue
+            temp_f = _mean(temps)
+            wind_mph = _mean(winds) or 0
+            precip = max(pops) if pops else 0
+            out.setdefault(ds, {})[block] = {
+                "temp_f": round(temp_f, 1),
+                "wind_mph": round(wind_mph, 1),
+                "precip_prob": round(precip, 2),
+                "suitability": outdoor_suitability(
+                    {"temp_f": temp_f, "wind_mph": wind_mph, "precip_prob": precip}
+                ),
+            }
+    return out
+
+
+def _cached_forecast(city: str) -> Dict[str, Any]:
+    """Raw feed plus both derived views, fetched once per place per WEATHER_TTL_SECONDS."""
+    key, location = _location(city)
+    entry = _FORECASTS.get(key)
+    cache_lookup("weather", entry is not None)
+    if entry is not None:
+        return entry
+    with _FETCH_LOCKS_GUARD:
+        lock = _FETCH_LOCKS.setdefault(key, threading.Lock())
+    with lock:  # concurrent misses for one place share a single upstream call
+        entry = _FORECASTS.get(key)
+        if entry is not None:
+            coalesced("weather")
+        else:
+            raw = _fetch_raw(location)
+            dashboard, days = summarize_forecast(raw, city)
+            entry = {"raw": raw, "dashboard": dashboard, "days": days}
+            _FORECASTS.set(key, entry, ttl_seconds=get_settings().weather_ttl_seconds)
+    return entry
+
+
+def fetch_forecast(city: str, now: Optional[datetime] = None) -> Dict[str, Any]:
+    """Dashboard view ({city, daily, hourly}) served from the cached forecast."""
+    dashboard = copy.deepcopy(_cached_forecast(city)["dashboard"])
+    dashboard["city"] = city  # the cached entry may have been filled by another spelling
+    return dashboard
+
+
+def forecast_days(city: str) -> Dict[str, Dict[str, Any]]:
+    """Per-day planner summary (date -> temp/wind/precip averages, suitability and
+    per-block ``blocks`` conditions)."""
+    return copy.deepcopy(_cached_forecast(city)["days"])
+
+
+def clear_forecast_cache() -> None:
+    _FORECASTS.clear()
 
 
 def outdoor_suitability(score_inputs: Dict[str, Any]) -> float:
@@ -113,49 +298,9 @@ def outdoor_suitability(score_inputs: Dict[str, Any]) -> float:
 
 
 def map_forecast_to_days(forecast: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
-    """Aggregate 3-hourly forecast into per-day summary with outdoor suitability.
+    """Aggregate a raw 3-hourly forecast into per-day summary with outdoor suitability.
 
-    Returns mapping date_str -> { temp_avg_f, wind_avg_mph, precip_prob_avg, suitability }
+    Returns mapping date_str -> { temp_avg_f, wind_avg_mph, precip_prob_avg, suitability,
+    blocks: {block_name: {temp_f, wind_mph, precip_prob, suitability}} }
     """
-    buckets: Dict[str, List[Dict[str, Any]]] = {}
-
-    for item in forecast.get("list", []):
-        ts = item.get("dt")
-        if ts is None:
-            continue
-        dt = datetime.fromtimestamp(ts, tz=timezone.utc)
-        ds = dt.date().isoformat()
-        main = item.get("main", {})
-        wind = item.get("wind", {})
-        weather = item.get("weather", [{}])[0] or {}
-        pop = item.get("pop", 0)
-        buckets.setdefault(ds, []).append(
-            {
-                "temp_f": main.get("temp"),
-                "wind_mph": wind.get("speed", 0),
-                "precip_prob": pop,
-                "weather": weather.get("main"),
-            }
-        )
-
-    summary: Dict[str, Dict[str, Any]] = {}
-    for ds, items in buckets.items():
-        if not items:
-            continue
-        temp_vals = [i.get("temp_f") for i in items if i.get("temp_f") is not None]
-        wind_vals = [i.get("wind_mph", 0) for i in items]
-        pop_vals = [i.get("precip_prob", 0) for i in items]
-        temp_avg = sum(temp_vals) / len(temp_vals) if temp_vals else None
-        wind_avg = sum(wind_vals) / len(wind_vals) if wind_vals else 0
-        pop_avg = sum(pop_vals) / len(pop_vals) if pop_vals else 0
-        suitability = outdoor_suitability(
-            {"temp_f": temp_avg, "wind_mph": wind_avg, "precip_prob": pop_avg}
-        )
-        summary[ds] = {
-            "temp_avg_f": temp_avg,
-            "wind_avg_mph": wind_avg,
-            "precip_prob_avg": pop_avg,
-            "suitability": suitability,
-        }
-
-    return summary
+    return summarize_forecast(forecast, "")[1]
@@ -2,16 +2,55 @@
 Title: Yelp Client Service
 Team: Purple Turtles — Gwen Li, Aadya Agarwal, Emma Peng, Noah Hicks
 Date: 2025-09-11
-Summary: Lightweight Yelp Fusion API client for food business search.
+Summary: Lightweight Yelp Fusion API client for food business search. An area-wide restaurant
+        pool is pulled once per YELP_TTL_SECONDS (paged via offset), tagged by meal from
+        categories and hours, and answers planner and proxy searches locally.
 Disclaimer: This file includes AI-assisted content (GPT-5); reviewed and approved by the Purple Turtles team.
 """
 
-from typing import Any, Dict, List, Optional
-import httpx
+from __future__ import annotations
+
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..core.cache import make_cache
 from ..core.config import get_settings
+from ..core.http import http_client
+from ..core.metrics import cache_lookup, coalesced, upstream
+from .maps_client import resolve_city
 
 
 YELP_BASE_URL = "https://api.yelp.com/v3"
+YELP_MAX_RESULTS = 240  # Yelp rejects offset + limit beyond this
+PAGE_LIMIT = 50
+
+# (label, categories) pulled for every pool; breakfast places rarely rank in the top
+# general results, so they get a pull of their own
+_POOL_QUERIES: List[Tuple[str, str]] = [
+    ("restaurants", "restaurants,food"),
+    ("breakfast", "breakfast_brunch,cafes,coffee,bakeries,diners,bagels"),
+]
+
+MEALS = ("breakfast", "lunch", "dinner")
+_MEAL_WORDS = {"breakfast": "breakfast", "brunch": "breakfast", "lunch": "lunch",
+               "dinner": "dinner", "supper": "dinner"}
+_BREAKFAST_CATEGORIES = {
+    "breakfast_brunch", "cafes", "coffee", "bakeries", "diners", "bagels", "donuts",
+    "juicebars", "creperies", "waffles", "pancakes",
+}
+# Categories that rarely serve a sit-down lunch or dinner
+_NOT_MEAL_CATEGORIES = {"coffee", "bakeries", "donuts", "juicebars", "bagels", "icecream",
+                        "desserts", "bubbletea"}
+
+# Area pools and live fallbacks, keyed by location; refreshed every YELP_TTL_SECONDS
+_POOLS = make_cache("yelp_pool", 32, get_settings().yelp_ttl_seconds)
+_LIVE = make_cache("yelp_live", 256, get_settings().yelp_ttl_seconds)
+_POOL_LOCKS: Dict[str, threading.Lock] = {}
+_POOL_LOCKS_GUARD = threading.Lock()
+
+
+def _base_url() -> str:
+    return get_settings().yelp_base_url or YELP_BASE_URL
 
 
 def _auth_headers() -> Dict[str, str]:
@@ -19,47 +58,188 @@ def _auth_headers() -> Dict[str, str]:
     return {"Authorization": f"Bearer {settings.yelp_api_key}"}
 
 
-def search_food(
-    query: str,
-    location: str = "Pittsburgh, PA",
-    limit: int = 5,
+def _simplify(b: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "id": b.get("id"),
+        "name": b.get("name"),
+        "rating": b.get("rating"),
+        "price": b.get("price"),
+        "phone": b.get("display_phone"),
+        "url": b.get("url"),
+        "categories": [c.get("title") for c in b.get("categories", [])],
+        "location": ", ".join(filter(None, b.get("location", {}).get("display_address", []))),
+        "coordinates": b.get("coordinates"),
+        "review_count": b.get("review_count"),
+        "photo": b.get("image_url"),
+        "meals": meal_tags(b),
+    }
+
+
+def _open_intervals(b: Dict[str, Any]) -> List[Tuple[int, int]]:
+    """Regular opening intervals as (start, end) minutes of the day; overnight ends past 1440."""
+    intervals = []
+    for block in b.get("business_hours") or b.get("hours") or []:
+        if block.get("hours_type", "REGULAR") != "REGULAR":
+            continue
+        for slot in block.get("open") or []:
+            try:
+                start = int(slot["start"][:2]) * 60 + int(slot["start"][2:])
+                end = int(slot["end"][:2]) * 60 + int(slot["end"][2:])
+            except (KeyError, ValueError, TypeError):
+                continue
+            if slot.get("is_overnight") or end <= start:
+                end += 24 * 60
+            intervals.append((start, end))
+    return intervals
+
+
+def meal_tags(b: Dict[str, Any]) -> List[str]:
+    """Meals a raw Yelp business suits: from its opening hours when Yelp lists them,
+    otherwise from its categories."""
+    aliases = {c.get("alias") for c in b.get("categories", []) if c.get("alias")}
+    serves_meals = not (aliases and aliases <= _NOT_MEAL_CATEGORIES)
+    intervals = _open_intervals(b)
+    if intervals:
+        def open_at(minute: int) -> bool:
+            return any(s <= minute < e for s, e in intervals)
+
+        tags = {
+            "breakfast": open_at(9 * 60),
+            "lunch": open_at(12 * 60 + 30) and serves_meals,
+            "dinner": open_at(19 * 60) and serves_meals,
+        }
+    else:
+        breakfast_only = bool(aliases) and aliases <= _BREAKFAST_CATEGORIES
+        tags = {
+            "breakfast": bool(aliases & _BREAKFAST_CATEGORIES),
+            "lunch": serves_meals,
+            "dinner": serves_meals and not breakfast_only,
+        }
+    return [meal for meal in MEALS if tags[meal]]
+
+
+def _search_page(
+    location: str,
+    term: Optional[str] = None,
+    categories: str = "food,restaurants",
+    limit: int = PAGE_LIMIT,
+    offset: int = 0,
     price: Optional[str] = None,
 ) -> Dict[str, Any]:
-    """Search Yelp businesses for food-related queries.
-
-    Returns a simplified payload with selected fields for each business.
-    """
     params: Dict[str, Any] = {
-        "term": query,
         "location": location,
-        "limit": max(1, min(limit, 50)),
-        "categories": "food,restaurants",
+        "limit": max(1, min(limit, PAGE_LIMIT)),
+        "categories": categories,
     }
+    if term:
+        params["term"] = term
+    if offset:
+        params["offset"] = offset
     if price:
         params["price"] = price  # e.g., "1,2" (Yelp's $..$$$ mapping)
 
-    with httpx.Client(timeout=10) as client:
-        resp = client.get(f"{YELP_BASE_URL}/businesses/search", params=params, headers=_auth_headers())
+    with upstream("yelp"), http_client(timeout=10) as client:
+        resp = client.get(f"{_base_url()}/businesses/search", params=params, headers=_auth_headers())
         resp.raise_for_status()
-        data = resp.json()
-
-    simplified: List[Dict[str, Any]] = []
-    for b in data.get("businesses", []):
-        simplified.append(
-            {
-                "name": b.get("name"),
-                "rating": b.get("rating"),
-                "price": b.get("price"),
-                "phone": b.get("display_phone"),
-                "url": b.get("url"),
-                "categories": [c.get("title") for c in b.get("categories", [])],
-                "location": ", ".join(filter(None, b.get("location", {}).get("display_address", []))),
-                "coordinates": b.get("coordinates"),
-                "review_count": b.get("review_count"),
-                "photo": b.get("image_url"),
-            }
-        )
-
-    return {"query": query, "location": location, "results": simplified}
+        return resp.json()
 
 
+def _location_key(location: str) -> str:
+    coords = resolve_city(location)
+    if coords is not None:
+        return "geo:{:.2f},{:.2f}".format(coords["lat"], coords["lon"])
+    return "q:" + " ".join(location.lower().replace(",", " ").split())
+
+
+def _pull_pool(location: str) -> List[Dict[str, Any]]:
+    pool_size = max(PAGE_LIMIT, get_settings().yelp_pool_size)
+    seen: Dict[str, Dict[str, Any]] = {}
+    for label, categories in _POOL_QUERIES:
+        target = min(pool_size if label == "restaurants" else PAGE_LIMIT, YELP_MAX_RESULTS)
+        offset = 0
+        while offset < target:
+            data = _search_page(location, categories=categories, offset=offset,
+                                limit=min(PAGE_LIMIT, target - offset))
+            businesses = data.get("businesses", [])
+            for b in businesses:
+                key = b.get("id") or b.get("url") or b.get("name")
+                if key not in seen:
+                    seen[key] = _simplify(b)
+            offset += len(businesses)
+            if not businesses or offset >= int(data.get("total") or 0):
+                break
+    return list(seen.values())
+
+
+def food_pool(location: str = "Pittsburgh, PA") -> List[Dict[str, Any]]:
+    """Area-wide pool of simplified businesses (in Yelp's best-match order), one pull per
+    area per YELP_TTL_SECONDS; concurrent misses share the pull."""
+    key = _location_key(location)
+    pool = _POOLS.get(key)
+    cache_lookup("yelp_pool", pool is not None)
+    if pool is not None:
+        return pool
+    with _POOL_LOCKS_GUARD:
+        lock = _POOL_LOCKS.setdefault(key, threading.Lock())
+    with lock:
+        pool = _POOLS.get(key)
+        if pool is not None:
+            coalesced("yelp_pool")
+        else:
+            pool = _pull_pool(location)
+            _POOLS.set(key, pool, ttl_seconds=get_settings().yelp_ttl_seconds)
+    return pool
+
+
+def clear_food_cache() -> None:
+    _POOLS.clear()
+    _LIVE.clear()
+
+
+def _price_levels(price: Optional[str]) -> Optional[set]:
+    if not price:
+        return None
+    return {int(p) for p in price.split(",") if p.strip().isdigit()}
+
+
+def _matches(business: Dict[str, Any], words: List[str], meal: Optional[str],
+             levels: Optional[set]) -> bool:
+    if levels is not None and len(business.get("price") or "") not in levels:
+        return False
+    if meal is not None and meal not in business.get("meals", []):
+        return False
+    text = " ".join([business.get("name") or "", *business.get("categories", [])]).lower()
+    return all(w in text for w in words)
+
+
+def search_food(
+    query: str,
+    location: str = "Pittsburgh, PA",
+    limit: int = 5,
+    price: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Search Yelp businesses for food-related queries.
+
+    Meal words ("breakfast", "dinner", ...) match the pool's meal tags and every other
+    word must appear in a business name or category, so "vegan breakfast" is vegan
+    breakfast spots. Queries the pool has no hits for cost one live search, cached for
+    YELP_TTL_SECONDS. Returns a simplified payload with selected fields for
+    each business.
+    """
+    limit = max(1, min(limit, PAGE_LIMIT))
+    words = [w for w in query.lower().split() if w]
+    meal = next((_MEAL_WORDS[w] for w in words if w in _MEAL_WORDS), None)
+    terms = [w for w in words if w not in _MEAL_WORDS]
+    levels = _price_levels(price)
+    hits = [b for b in food_pool(location) if _matches(b, terms, meal, levels)]
+    if hits:
+        return {"query": query, "location": location, "results": [dict(b) for b in hits[:limit]]}
+
+    live_key = (_location_key(location), " ".join(words), price, limit)
+    results = _LIVE.get(live_key)
+    cache_lookup("yelp_live", results is not None)
+    if results is None:
+        data = _search_page(location, term=query, limit=limit, price=price)
+        results = [_simplify(b) for b in data.get("businesses", [])]
+        _LIVE.set(live_key, results)
+    return {"query": query, "location": location, "results": [dict(b) for b in results]}
@@ -3,12 +3,15 @@ Title: Pytest Configuration
 Team: Purple Turtles — Gwen Li, Aadya Agarwal, Emma Peng, Noah Hicks
 Date: 2025-09-12
 Summary: Ensure project root is on sys.path for `from src...` imports and load .env for tests.
+        Each test gets its own SQLite event store so stored events never leak between tests.
 Disclaimer: This file includes AI-assisted content (GPT-5); reviewed and approved by the Purple Turtles team.
 """
 
 from pathlib import Path
 import sys
 
+import pytest
+
 try:
     from dotenv import load_dotenv
 except Exception:  # pragma: no cover
@@ -31,3 +34,16 @@ if load_dotenv is not None:
         pass
 
 
+
+
+@pytest.fixture(autouse=True)
+def _isolated_event_store(tmp_path, monkeypatch):
+    from src.core.config import get_settings
+    from src.services.event_store import reset_event_store
+
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path / 'events.sqlite3'}")
+    get_settings.cache_clear()
+    reset_event_store()
+    yield
+    reset_event_store()
+    get_settings.cache_clear()
@@ -0,0 +1,114 @@
+"""
+Title: Planner Admission Control Tests
+Team: Purple Turtles — Gwen Li, Aadya Agarwal, Emma Peng, Noah Hicks
+Date: 2026-10-18
+Summary: Slots and bounded queue (FIFO, full, timeout), 503 + Retry-After when saturated,
+        cache hits served while saturated, and queue depth in /api/metrics.
+Disclaimer: This file includes AI-assisted content (GPT-5); reviewed and approved by the Purple Turtles team.
+"""
+
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.api import routes
+from src.api.admission import AdmissionLimiter, Overloaded
+from src.api.response_cache import clear_response_cache
+from src.core.config import get_settings
+from src.core.metrics import ADMISSION_QUEUE_DEPTH, ADMISSION_REJECTED, reset_metrics
+from src.main import app
+from src.models.itinerary import ItineraryOptionsResponse
+
+
+client = TestClient(app)
+
+
+@pytest.fixture(autouse=True)
+def _fresh_state():
+    clear_response_cache()
+    reset_metrics()
+    yield
+    clear_response_cache()
+    reset_metrics()
+
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "condition not reached"
+        time.sleep(0.01)
+
+
+def test_limiter_queues_in_order_and_sheds_when_full():
+    limiter = AdmissionLimiter(limit=1, queue_size=1, timeout_seconds=5, retry_after=3)
+    assert limiter.acquire() is False
+    queued = []
+    waiter = threading.Thread(target=lambda: queued.append(limiter.acquire()))
+    waiter.start()
+    _wait_for(lambda: limiter.waiting == 1)
+    assert ADMISSION_QUEUE_DEPTH.value() == 1
+
+    with pytest.raises(Overloaded) as shed:
+        limiter.acquire()
+    assert shed.value.status_code == 503 and shed.value.headers["Retry-After"] == "3"
+    assert ADMISSION_REJECTED.value("queue_full") == 1
+
+    limiter.release()
+    waiter.join(timeout=5)
+    assert queued == [True] and limiter.in_flight == 1 and limiter.waiting == 0
+    limiter.release()
+    assert ADMISSION_QUEUE_DEPTH.value() == 0
+
+
+def test_limiter_times_out_queued_callers():
+    limiter = AdmissionLimiter(limit=1, queue_size=4, timeout_seconds=0.05, retry_after=1)
+    with limiter.slot():
+        with pytest.raises(Overloaded) as shed:
+            limiter.acquire()
+    assert shed.value.reason == "queue_timeout"
+    assert limiter.in_flight == 0 and limiter.waiting == 0
+
+
+def test_saturated_planner_sheds_misses_but_serves_cache_hits(monkeypatch):
+    monkeypatch.setenv("ADMISSION_MAX_CONCURRENCY", "1")
+    monkeypatch.setenv("ADMISSION_QUEUE_SIZE", "0")
+    get_settings.cache_clear()
+    release = threading.Event()
+    building = threading.Event()
+
+    def fake_build(payload):
+        if payload.max_distance_miles == 2:
+            building.set()
+            release.wait(timeout=10)
+        return ItineraryOptionsResponse(options=[], used_sources={"yelp": 1})
+
+    monkeypatch.setattr(routes, "build_itinerary_options", fake_build)
+    cached = {"city": "Pittsburgh, PA", "max_distance_miles": 1}
+    assert client.post("/api/itinerary/options", json=cached).status_code == 200
+
+    slow = threading.Thread(
+        target=client.post,
+        args=("/api/itinerary/options",),
+        kwargs={"json": {"city": "Pittsburgh, PA", "max_distance_miles": 2}},
+    )
+    slow.start()
+    try:
+        assert building.wait(timeout=10)
+        shed = client.post(
+            "/api/itinerary/options", json={"city": "Pittsburgh, PA", "max_distance_miles": 3}
+        )
+        assert shed.status_code == 503
+        assert shed.headers["retry-after"] == "2"
+
+        hit = client.post("/api/itinerary/options", json=cached)
+        assert hit.status_code == 200 and hit.headers["x-cache"] == "hit"
+
+        metrics = client.get("/api/metrics").text
+        assert "weekender_admission_in_flight 1" in metrics
+        assert "weekender_admission_queue_depth 0" in metrics
+        assert 'weekender_admission_rejected_total{reason="queue_full"} 1' in metrics
+    finally:
+        release.set()
+        slow.join(timeout=10)
@@ -0,0 +1,99 @@
+"""
+Title: Benchmark Harness Tests
+Team: Purple Turtles — Gwen Li, Aadya Agarwal, Emma Peng, Noah Hicks
+Date: 2026-10-18
+Summary: The recorded-upstream replay pages and date-shifts fixtures like the real APIs, feeds
+        a full offline plan, and the baseline comparison flags slow or allocation-heavy cases
+        (slowdowns only when a re-measurement confirms them), and baseline refreshes keep
+        slowdowns nobody accepted.
+Disclaimer: This file includes AI-assisted content (GPT-5); reviewed and approved by the Purple Turtles team.
+"""
+
+from datetime import date
+
+from benchmarks import bench_suite
+from benchmarks.harness import compare, measure, relative
+from benchmarks.replay import bench_window, replay_upstreams, shift_days
+from src.models.itinerary import ItineraryRequest
+from src.services import planner
+from src.services.yelp_client import food_pool
+
+
+def test_shift_lands_on_the_coming_weekend_in_whole_weeks():
+    assert shift_days(date(2025, 9, 12)) == 0
+    assert shift_days(date(2025, 9, 13)) == 7  # Saturday rolls to the next Friday
+    start, end = bench_window(date(2026, 10, 18))
+    assert (start.isoformat(), end.isoformat()) == ("2026-10-24T09:00:00", "2026-10-25T21:00:00")
+
+
+def test_replay_feeds_a_full_plan_without_network():
+    start, end = bench_window()
+    with replay_upstreams(scale=10) as replay:
+        assert len(food_pool("Pittsburgh, PA")) == 200  # YELP_POOL_SIZE, paged 50 at a time
+        response = planner.build_itinerary_options(
+            ItineraryRequest(
+                city="Pittsburgh, PA",
+                start_date=start,
+                end_date=end,
+                user_address="5000 Forbes Ave, Pittsburgh, PA 15213",
+                max_distance_miles=10,
+            )
+        )
+    assert response.options and not response.warnings
+    assert response.used_sources["ticketmaster"] > 0
+    assert replay.calls["app.ticketmaster.com"] == 2  # 240 events in 200-event pages
+    assert replay.calls["api.openweathermap.org"] == 1
+
+
+def test_compare_flags_speed_and_allocation_regressions():
+    timing = measure(lambda: sum(range(1000)), repeat=3)
+    assert timing["ops_per_sec"] > 0 and timing["peak_kib"] >= 0
+    # Paired with the calibration loop, a tiny function runs many loops' worth per second
+    assert timing["calibration"] > 0 and relative(timing) > 1
+
+    baseline = {
+        "plan": {"ops_per_sec": 10.0, "calibration": 100.0, "relative": 0.1, "peak_kib": 1000.0}
+    }
+    steady = {"plan": {"ops_per_sec": 20.0, "calibration": 200.0, "relative": 0.1,
+                       "peak_kib": 1100.0}}
+    assert compare(steady, baseline) == []  # twice as fast machine, same relative speed
+
+    slower = {"plan": {"ops_per_sec": 6.0, "calibration": 100.0, "relative": 0.06,
+                       "peak_kib": 2000.0}}
+    problems = compare(slower, baseline, tolerance=0.3)
+    assert len(problems) == 2
+    assert problems[0].startswith("plan: 60% of baseline speed")
+    assert "peak allocation" in problems[1]
+
+
+def test_gate_fails_only_when_a_slowdown_reproduces(monkeypatch):
+    baseline = {"plan": {"relative": 0.1, "peak_kib": 100.0}}
+    case = bench_suite.Case("plan", 1, 3, lambda replay: None)
+    reruns = iter([0.05, 0.09, 0.05, 0.06])
+    def rerun(cases, repeat=None):
+        return {"plan": {"ops_per_sec": 1.0, "relative": next(reruns), "peak_kib": 100.0}}
+
+    monkeypatch.setattr(bench_suite, "run_cases", rerun)
+
+    noisy = {"plan": {"ops_per_sec": 1.0, "relative": 0.05, "peak_kib": 100.0}}
+    assert bench_suite.confirm([case], noisy, baseline, 0.3) == []
+    assert noisy["plan"]["relative"] == 0.09  # the fastest measurement is kept
+
+    slow = {"plan": {"ops_per_sec": 1.0, "relative": 0.05, "peak_kib": 100.0}}
+    problems = bench_suite.confirm([case], slow, baseline, 0.3)
+    assert len(problems) == 1 and problems[0].startswith("plan: 60% of baseline speed")
+
+
+def test_baseline_refresh_keeps_unacknowledged_slowdowns():
+    baseline = {"fast": {"relative": 1.0}, "slow": {"relative": 1.0}, "idle": {"relative": 1.0}}
+    results = {"fast": {"relative": 1.2}, "slow": {"relative": 0.5}}
+    problems = ["slow: 50% of baseline speed (1.0 ops/s; allowed down to 70%)"]
+
+    merged, held = bench_suite.baseline_update(results, baseline, problems)
+    assert held == ["slow"]
+    assert merged == {"fast": {"relative": 1.2}, "slow": {"relative": 1.0},
+                      "idle": {"relative": 1.0}}
+
+    merged, held = bench_suite.baseline_update(results, baseline, problems, accept="slow")
+    assert held == [] and merged["slow"] == {"relative": 0.5}
+    assert bench_suite.baseline_update(results, baseline, problems, accept="all")[1] == []
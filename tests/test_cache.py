@@ -0,0 +1,131 @@
+"""
+Title: Cache Backend Tests
+Team: Purple Turtles — Gwen Li, Aadya Agarwal, Emma Peng, Noah Hicks
+Date: 2026-10-18
+Summary: The SQLite backend shares entries across processes with wall-clock expiry and a size
+        bound and treats unreadable entries as misses, CACHE_BACKEND selects (or falls back
+        from) a backend, OpenAI labels are reused from the cache, an incomplete shared backend
+        fails at construction, and the production serving profile parses into uvicorn options.
+Disclaimer: This file includes AI-assisted content (GPT-5); reviewed and approved by the Purple Turtles team.
+"""
+
+import asyncio
+import importlib.util
+from pathlib import Path
+import pickle
+import subprocess
+import sys
+import time
+
+import pytest
+
+from src.core.cache import (
+    RedisTTLCache,
+    SharedTTLCache,
+    SQLiteTTLCache,
+    TTLCache,
+    make_cache,
+)
+from src.core.config import get_settings
+from src.serve import load_profile
+from src.services import classifier
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def test_sqlite_cache_is_shared_between_processes(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    writer = (
+        "from src.core.cache import SQLiteTTLCache;"
+        f"SQLiteTTLCache({path!r}, 'geocode').set(('5000 forbes', 3), {{'lat': 40.44}}, 60)"
+    )
+    subprocess.run([sys.executable, "-c", writer], cwd=ROOT, check=True, timeout=60)
+
+    cache = SQLiteTTLCache(path, "geocode")
+    assert cache.get(("5000 forbes", 3)) == {"lat": 40.44}
+    assert SQLiteTTLCache(path, "response").get(("5000 forbes", 3)) is None  # namespaced
+
+
+def test_sqlite_cache_expires_and_stays_bounded(tmp_path):
+    cache = SQLiteTTLCache(str(tmp_path / "cache.sqlite3"), "response", maxsize=3)
+    cache.set("short", "gone", ttl_seconds=0.05)
+    time.sleep(0.1)
+    assert SQLiteTTLCache(cache.path, "response").get("short") is None
+
+    for i in range(63):  # the size check runs on every 64th write
+        cache.set(f"k{i}", i)
+    assert len(cache) == 3
+    assert SQLiteTTLCache(cache.path, "response").get("k0") is None
+    assert cache.pop("k62") == 62 and SQLiteTTLCache(cache.path, "response").get("k62") is None
+
+
+def test_unreadable_shared_entry_is_a_miss(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    writer = SQLiteTTLCache(path, "response")
+    writer.set("good", {"ok": True}, 60)
+    writer._store("bad", pickle.dumps({"ok": True})[:-3], time.time() + 60)  # truncated
+
+    reader = SQLiteTTLCache(path, "response")
+    assert reader.get("bad", "miss") == "miss"
+    assert reader.get("good") == {"ok": True}
+
+
+def test_incomplete_shared_backend_fails_at_construction():
+    class NoLen(SharedTTLCache):
+        def _load(self, key):
+            return None
+
+        def _store(self, key, blob, expires_at):
+            pass
+
+        def _delete(self, key):
+            pass
+
+        def _delete_all(self):
+            pass
+
+    with pytest.raises(TypeError, match="__len__"):
+        NoLen("x")
+
+
+def test_backend_selection_and_fallbacks(monkeypatch, tmp_path):
+    assert isinstance(make_cache("x"), TTLCache)
+    monkeypatch.setenv("CACHE_BACKEND", "sqlite")
+    monkeypatch.setenv("CACHE_URL", f"sqlite:///{tmp_path / 'c.sqlite3'}")
+    get_settings.cache_clear()
+    assert isinstance(make_cache("x"), SQLiteTTLCache)
+
+    monkeypatch.setenv("CACHE_BACKEND", "redis")
+    monkeypatch.setenv("CACHE_URL", "redis://127.0.0.1:1/0")
+    get_settings.cache_clear()
+    cache = make_cache("x")
+    if importlib.util.find_spec("redis") is None:
+        assert type(cache) is TTLCache  # optional package missing
+    else:
+        assert isinstance(cache, RedisTTLCache)
+        assert cache.get("k", "miss") == "miss"  # unreachable server degrades to misses
+
+
+def test_openai_labels_are_served_from_the_cache(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    get_settings.cache_clear()
+    text = "Saturday pop-up by the river"  # the heuristic cannot tell
+    assert classifier.classify_environment_heuristic(text) == "unknown"
+    classifier._LABELS.set(classifier._label_key(get_settings().openai_model, text), "outdoor")
+    try:
+        assert asyncio.run(classifier.classify_environment_batch([text, text])) == [
+            "outdoor",
+            "outdoor",
+        ]
+        assert classifier.classify_environment(text) == "outdoor"
+    finally:
+        classifier._LABELS.clear()
+
+
+def test_production_profile_runs_workers_on_a_shared_cache():
+    server, env = load_profile(str(ROOT / "config" / "uvicorn.prod.ini"))
+    assert server["workers"] > 1 and server["reload"] is False
+    assert server["access_log"] is False and server["port"] == 8000
+    assert env["CACHE_BACKEND"] == "sqlite"
+    dev, _ = load_profile(str(ROOT / "config" / "uvicorn.ini"))
+    assert dev["reload"] is True and "factory" not in dev
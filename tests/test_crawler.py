@@ -0,0 +1,173 @@
+"""
+Title: Event Crawler Tests
+Team: Purple Turtles — Gwen Li, Aadya Agarwal, Emma Peng, Noah Hicks
+Date: 2026-10-18
+Summary: Offline crawl of a fake site: canonical URL de-dup, detail/next-week discovery,
+        robots.txt, page budget, per-host concurrency limits, and crawling only claimed rounds.
+Disclaimer: This file includes AI-assisted content (GPT-5); reviewed and approved by the Purple Turtles team.
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from src.core.config import get_settings
+from src.services import crawler
+
+
+SITE = "https://example.test"
+
+PAGES = {
+    "/this-week/": """
+        <html><body><main>
+          <h3><a href="/events/jazz/?utm_source=home#top">Jazz Night</a></h3>
+          <p>Thursday at the New Granada Theater</p>
+          <h3><a href="https://EXAMPLE.test:443/events/jazz/">Jazz Night Encore</a></h3>
+          <p>Same page, different spelling of the URL</p>
+          <h3><a href="/events/market/">Arts Market</a></h3>
+          <p>Point State Park plaza</p>
+          <a href="/next-week/">Next week</a>
+          <a href="/private/secret/">Calendar (private)</a>
+          <a href="https://elsewhere.test/week/">Other host week</a>
+        </main></body></html>
+    """,
+    "/next-week/": """
+        <html><body><main>
+          <h2><a href="/events/pirates/">Pirates vs. Cubs</a></h2>
+          <p>Sunday at PNC Park</p>
+        </main></body></html>
+    """,
+    "/events/jazz/": """
+        <html><head><meta property="og:description" content="Live jazz."></head>
+        <body><main><h1>Jazz Night</h1>
+          <time datetime="2025-09-18T19:00:00-04:00">Thu, Sep 18 · 7 PM</time>
+        </main></body></html>
+    """,
+    "/events/market/": "<html><body><main><h1>Arts Market</h1></main></body></html>",
+    "/events/pirates/": "<html><body><main><h1>Pirates vs. Cubs</h1></main></body></html>",
+    "/robots.txt": "User-agent: *\nDisallow: /private/\n",
+}
+
+
+@pytest.fixture(autouse=True)
+def _fast_polite_settings(monkeypatch):
+    monkeypatch.setenv("CRAWLER_DELAY_SECONDS", "0")
+    monkeypatch.setenv("CRAWLER_PER_HOST_CONCURRENCY", "2")
+    monkeypatch.setenv("CRAWLER_CONCURRENCY", "4")
+    get_settings.cache_clear()
+    yield
+    get_settings.cache_clear()
+
+
+def _run(handler, **kwargs):
+    batches = []
+
+    async def go():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            return await crawler.crawl_events(
+                seeds=[SITE + "/this-week/"], sink=batches.append, client=client, **kwargs
+            )
+
+    return asyncio.run(go()), batches
+
+
+def _site_handler(requested):
+    async def handler(request: httpx.Request) -> httpx.Response:
+        requested.append(request.url.path)
+        await asyncio.sleep(0.01)
+        body = PAGES.get(request.url.path)
+        if request.url.host != "example.test" or body is None:
+            return httpx.Response(404)
+        return httpx.Response(200, text=body)
+
+    return handler
+
+
+def test_canonical_url_normalizes_variants():
+    a = crawler.canonical_url("/events/jazz/?utm_source=x&b=2&a=1#top", SITE + "/this-week/")
+    b = crawler.canonical_url("HTTPS://Example.TEST:443//events/jazz/?a=1&b=2")
+    assert a == b == "https://example.test/events/jazz/?a=1&b=2"
+    assert crawler.canonical_url("mailto:hi@example.test") is None
+    assert crawler.canonical_url("http://example.test:8080") == "http://example.test:8080/"
+
+
+def test_crawl_follows_details_and_listings_once():
+    requested = []
+    stats, batches = _run(_site_handler(requested))
+
+    pages = [p for p in requested if p != "/robots.txt"]
+    assert sorted(pages) == sorted(
+        ["/this-week/", "/next-week/", "/events/jazz/", "/events/market/", "/events/pirates/"]
+    )
+    assert "/private/secret/" not in requested  # robots.txt
+    assert requested.count("/robots.txt") == 1
+
+    latest = {}
+    for batch in batches:
+        for e in batch:
+            latest[e["url"]] = e
+    jazz = latest[SITE + "/events/jazz/"]
+    assert jazz["start"] == "2025-09-18T19:00:00-04:00"  # detail page enriched the listing
+    assert jazz["source"] == "visitpgh"
+    assert SITE + "/events/pirates/" in latest  # found via the next-week listing
+    assert stats["fetched"] == 5 and stats["events"] == len(latest) == 3
+
+
+def test_crawl_respects_page_budget_and_depth():
+    requested = []
+    stats, _ = _run(_site_handler(requested), max_depth=0)
+    assert [p for p in requested if p != "/robots.txt"] == ["/this-week/"]
+
+    requested.clear()
+    stats, _ = _run(_site_handler(requested), max_pages=2)
+    assert stats["pages"] == 2
+    assert len([p for p in requested if p != "/robots.txt"]) == 2
+
+
+def test_per_host_concurrency_is_bounded(monkeypatch):
+    monkeypatch.setenv("CRAWLER_PER_HOST_CONCURRENCY", "1")
+    get_settings.cache_clear()
+    state = {"active": 0, "peak": 0}
+    requested = []
+    inner = _site_handler(requested)
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        state["active"] += 1
+        state["peak"] = max(state["peak"], state["active"])
+        try:
+            return await inner(request)
+        finally:
+            state["active"] -= 1
+
+    stats, _ = _run(handler)
+    assert stats["fetched"] == 5
+    assert state["peak"] == 1
+
+
+def test_crawl_forever_only_crawls_rounds_it_claims(monkeypatch):
+    answers = [False, True, False]
+    claims = []
+    crawls = []
+
+    def claim(interval):
+        claims.append(interval)
+        return answers[len(claims) - 1] if len(claims) <= len(answers) else False
+
+    async def fake_crawl(sink=None):
+        crawls.append(sink)
+        return {}
+
+    monkeypatch.setattr(crawler, "crawl_events", fake_crawl)
+    monkeypatch.setattr(crawler, "CLAIM_POLL_SECONDS", 0)
+
+    async def go():
+        task = asyncio.create_task(crawler.crawl_forever(claim=claim))
+        while len(claims) < len(answers):
+            await asyncio.sleep(0.01)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    asyncio.run(go())
+    assert len(crawls) == 1
+    assert claims[0] == max(60, get_settings().crawler_interval_seconds)
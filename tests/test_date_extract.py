@@ -0,0 +1,77 @@
+"""
+Title: Date Extraction Tests
+Team: Purple Turtles — Gwen Li, Aadya Agarwal, Emma Peng, Noah Hicks
+Date: 2026-10-18
+Summary: Weekday/date/range extraction from VisitPittsburgh-style event text (offline).
+Disclaimer: This file includes AI-assisted content (GPT-5); reviewed and approved by the Purple Turtles team.
+"""
+
+from datetime import date
+
+from src.services import date_extract
+from src.services.date_extract import extract_event_days
+
+
+TODAY = date(2025, 9, 10)
+
+
+def _days(text):
+    return extract_event_days(text, today=TODAY)
+
+
+def test_date_ranges_expand_to_every_day():
+    fest = _days("Picklesburgh Friday – Sunday, Sep 12–14")
+    assert fest.dates == (date(2025, 9, 12), date(2025, 9, 13), date(2025, 9, 14))
+    assert fest.weekdays == ("friday", "saturday", "sunday")
+
+    assert _days("Sep 13 – Sep 14, Point State Park").weekdays == ("saturday", "sunday")
+    assert _days("Sep 30–2").dates[-1] == date(2025, 10, 2)
+    assert _days("Dec 30 - Jan 2").dates[-1] == date(2026, 1, 2)
+    assert _days("September 12-14, 2025").dates[0] == date(2025, 9, 12)
+
+
+def test_weekday_mentions_and_ranges_without_dates():
+    assert _days("Friday – Sunday").weekdays == ("friday", "saturday", "sunday")
+    assert _days("Fri-Sun at PNC").weekdays == ("friday", "saturday", "sunday")
+    assert _days("Thursdays at the New Granada").weekdays == ("thursday",)
+    assert _days("Sun 1:35 PM").weekdays == ("sunday",)
+    assert _days("Weekends in the park").weekdays == ("saturday", "sunday")
+    assert _days("Sun Country Airlines lounge").weekdays == ()
+
+
+def test_single_dates_numeric_and_open_ended():
+    assert _days("Saturday, Sep 13 · Gallery opening").dates == (date(2025, 9, 13),)
+    assert _days("Show on 9/14/2025").weekdays == ("sunday",)
+    through = _days("Daily through Oct 26 in the glasshouse")
+    assert through.dates[0] == TODAY and through.dates[-1] == date(2025, 10, 26)
+    # Year-less dates well in the past roll over to next year
+    assert _days("Jan 5").dates == (date(2026, 1, 5),)
+
+
+def test_no_false_positives_and_dateutil_is_last_resort(monkeypatch):
+    calls = {"n": 0}
+    real = date_extract.date_parser.parse
+
+    def counting(*args, **kwargs):
+        calls["n"] += 1
+        return real(*args, **kwargs)
+
+    monkeypatch.setattr(date_extract.date_parser, "parse", counting)
+    for text in ["Call 412-281-7711", "Open 24/7", "The Carnegie Museum"]:
+        assert extract_event_days(text + " #fp", today=TODAY).dates == ()
+    _days("Sep 20 at the Warhol")
+    assert calls["n"] == 0
+
+    # A month name with only a time: dateutil is consulted but finds no day
+    assert _days("Doors May 5:30 #fp").dates == ()
+
+    assert _days("14 September 2025 at the park #x").dates == (date(2025, 9, 14),)
+    assert calls["n"] > 0
+
+
+def test_results_are_memoized():
+    text = "Jazz Night Thursdays #memo"
+    first = _days(text)
+    hits = date_extract._extract_cached.cache_info().hits
+    assert _days(text) is first
+    assert date_extract._extract_cached.cache_info().hits == hits + 1
@@ -0,0 +1,364 @@
+"""
+Title: Event Store Tests
+Team: Purple Turtles — Gwen Li, Aadya Agarwal, Emma Peng, Noah Hicks
+Date: 2026-10-18
+Summary: SQLite event store window/weekday/geo queries, expiry, ingest coverage and windowed
+        delta syncs (truncated listings record no coverage), run claims shared across
+        processes, plus the planner answering repeat candidate collection from the store
+        without upstream calls and resuming a Ticketmaster week cut off at the result cap.
+Disclaimer: This file includes AI-assisted content (GPT-5); reviewed and approved by the Purple Turtles team.
+"""
+
+from datetime import datetime, timedelta
+import time
+
+from src.core.config import get_settings
+from src.services import planner
+from src.services.event_store import EventStore, get_event_store
+
+
+SAT = datetime(2025, 9, 13, 9, 0)
+SUN = datetime(2025, 9, 14, 21, 0)
+
+
+def _event(title, **extra):
+    item = {"title": title, "category": "event", "source": "ticketmaster"}
+    item.update(extra)
+    return item
+
+
+def test_query_matches_dates_weekdays_and_undated(tmp_path):
+    store = EventStore(str(tmp_path / "store.sqlite3"))
+    now = datetime(2025, 9, 10).timestamp()
+    store.upsert(
+        "ticketmaster",
+        "test",
+        [
+            _event("Saturday Game", start_at="2025-09-13T19:05:00"),
+            _event("Next Week Show", start_at="2025-09-20T20:00:00"),
+            _event("Arts Fest", start_at="2025-09-11T10:00:00", end_at="2025-09-14T18:00:00"),
+            _event("Sunday Brunch Walk", day_name="sunday"),
+            _event("Thursday Jazz", day_name="thursday"),
+            _event("Anytime Tour"),
+        ],
+        now=now,
+    )
+    titles = [e["title"] for e in store.query(SAT, SUN, now=now)]
+    assert titles == ["Saturday Game", "Arts Fest", "Sunday Brunch Walk", "Anytime Tour"]
+
+    # Dated rows expire after their last day; undated ones after the undated TTL
+    later = datetime(2025, 9, 16).timestamp()
+    assert [e["title"] for e in store.query(SAT, SUN, now=later)] == [
+        "Sunday Brunch Walk",
+        "Anytime Tour",
+    ]
+    store.close()
+
+
+def test_upsert_is_idempotent_and_geo_filter_keeps_unlocated(tmp_path):
+    store = EventStore(str(tmp_path / "store.sqlite3"))
+    now = datetime(2025, 9, 10).timestamp()
+    near = _event("Oakland Lecture", url="u1", coordinates={"lat": 40.444, "lon": -79.943})
+    far = _event("Erie Concert", url="u2", coordinates={"lat": 42.129, "lon": -80.085})
+    store.upsert("ticketmaster", "a", [near, far, _event("Somewhere")], now=now)
+    near["notes"] = "Updated details"
+    store.upsert("ticketmaster", "b", [near], now=now)
+    assert store.count() == 3
+
+    origin = {"lat": 40.4406, "lon": -79.9959}
+    found = store.query(SAT, SUN, near=origin, radius_miles=10, now=now)
+    assert [e["title"] for e in found] == ["Oakland Lecture", "Somewhere"]
+    assert found[0]["notes"] == "Updated details"
+    store.close()
+
+
+def test_ingest_windows_cover_sub_ranges_until_stale(tmp_path):
+    store = EventStore(str(tmp_path / "store.sqlite3"))
+    now = time.time()
+    store.ingest("visitpgh", "this-week", datetime(2025, 9, 12), SUN, [], now=now)
+    assert store.covers("visitpgh", "this-week", SAT, SUN, 600, now=now + 10)
+    assert not store.covers("visitpgh", "this-week", SAT, datetime(2025, 9, 15), 600, now=now)
+    assert not store.covers("visitpgh", "other", SAT, SUN, 600, now=now)
+    assert not store.covers("visitpgh", "this-week", SAT, SUN, 600, now=now + 601)
+    store.close()
+
+
+def test_run_claims_grant_one_round_per_interval_across_processes(tmp_path):
+    path = str(tmp_path / "store.sqlite3")
+    first, second = EventStore(path), EventStore(path)  # two server workers
+    now = time.time()
+    assert first.claim_run("crawler", 600, holder="a", now=now)
+    assert not second.claim_run("crawler", 600, holder="b", now=now + 1)
+    assert not first.claim_run("crawler", 600, holder="a", now=now + 599)
+    assert second.claim_run("crawler", 600, holder="b", now=now + 600)
+    assert first.claim_run("other-job", 600, holder="a", now=now + 1)
+    first.close()
+    second.close()
+
+
+def test_sync_converts_and_writes_only_deltas(tmp_path):
+    store = EventStore(str(tmp_path / "store.sqlite3"))
+    now = datetime(2025, 9, 10).timestamp()
+    week = (datetime(2025, 9, 8), datetime(2025, 9, 14, 23, 59, 59))
+    converted = []
+
+    def convert(raws):
+        converted.append([r["id"] for r in raws])
+        return [
+            _event(r["title"], external_id=r["id"], start_at=r["start"], url=r.get("url"))
+            for r in raws
+        ]
+
+    listing = [
+        {"id": "a", "title": "Pirates vs. Cubs", "start": "2025-09-13T19:05:00"},
+        {"id": "b", "title": "Symphony", "start": "2025-09-12T20:00:00"},
+        {"id": "c", "title": "Comedy Night", "start": "2025-09-14T21:00:00"},
+    ]
+    first = store.sync("ticketmaster", "metro", *week, listing, convert, now=now)
+    assert first == {"added": 3, "updated": 0, "unchanged": 0, "removed": 0}
+
+    # "b" moved to a new title, "c" was cancelled, "d" is new
+    listing = [
+        listing[0],
+        {"id": "b", "title": "Symphony (new program)", "start": "2025-09-12T20:00:00"},
+        {"id": "d", "title": "Jazz Brunch", "start": "2025-09-14T11:00:00"},
+    ]
+    second = store.sync("ticketmaster", "metro", *week, listing, convert, now=now + 60)
+    assert second == {"added": 1, "updated": 1, "unchanged": 1, "removed": 1}
+    assert converted == [["a", "b", "c"], ["b", "d"]]
+    titles = {e["title"] for e in store.query(*week, now=now + 60)}
+    assert titles == {"Pirates vs. Cubs", "Symphony (new program)", "Jazz Brunch"}
+    assert store.covers("ticketmaster", "metro", SAT, SUN, 600, now=now + 60)
+
+    # A truncated listing never deletes what it did not reach
+    third = store.sync("ticketmaster", "metro", *week, listing[:1], convert, complete=False,
+                       now=now + 120)
+    assert third["removed"] == 0 and store.count() == 3
+    assert not store.covers("ticketmaster", "metro", SAT, SUN, 600, now=now + 700)
+    store.close()
+
+
+def test_planner_answers_repeat_collection_from_store(monkeypatch):
+    calls = {"visitpgh": 0, "ticketmaster": 0}
+    today = datetime.now().replace(hour=9, minute=0, second=0, microsecond=0)
+    sat = today + timedelta(days=(5 - today.weekday()) % 7 + 7)
+    sun = sat + timedelta(days=1, hours=12)
+
+    def fake_visit():
+        calls["visitpgh"] += 1
+        return {
+            "events": [
+                {"title": "Museum Night Saturday", "details": "Gallery"},
+                {"title": "Thursday Trivia", "details": "Pub quiz"},
+            ]
+        }
+
+    def fake_tm(**kwargs):
+        calls["ticketmaster"] += 1
+        return {
+            "events": [
+                {
+                    "title": "Pirates vs. Cubs",
+                    "url": "https://tm.example/pirates",
+                    "start_datetime": f"{sat.date()}T23:05:00Z",
+                    "start_local": f"{sat.date()}T19:05:00",
+                    "coordinates": {"lat": 40.4469, "lon": -80.0057},
+                }
+            ]
+        }
+
+    monkeypatch.setattr(planner, "fetch_this_week_events", fake_visit)
+    monkeypatch.setattr(planner, "fetch_all_events_ticketmaster", fake_tm)
+    monkeypatch.setattr(planner, "search_food", lambda **kw: {"results": []})
+    origin = {"lat": 40.4439, "lon": -79.9430}
+
+    first, _, sources = planner._collect_candidates("Pittsburgh, PA", sat, sun, origin, 5)
+    second, _, _ = planner._collect_candidates("Pittsburgh, PA", sat, sun, origin, 5)
+
+    assert calls == {"visitpgh": 1, "ticketmaster": 1}
+    assert first == second
+    assert [c["title"] for c in first] == ["Museum Night Saturday", "Pirates vs. Cubs"]
+    assert sources == {"visitpgh": 1, "yelp": 0, "ticketmaster": 1}
+    assert get_event_store().count() == 3  # Thursday Trivia stored, just not this weekend
+
+
+def test_visitpgh_refresh_drops_events_no_longer_listed(monkeypatch):
+    listing = [
+        {"title": "Museum Night Saturday", "details": "Gallery", "url": "https://v/museum"},
+        {"title": "Saturday Jazz Brunch", "details": "Live music", "url": "https://v/jazz"},
+    ]
+    monkeypatch.setattr(planner, "fetch_this_week_events", lambda: {"events": list(listing)})
+    today = datetime.now().replace(hour=9, minute=0, second=0, microsecond=0)
+    sat = today + timedelta(days=(5 - today.weekday()) % 7 + 7)
+    sun = sat + timedelta(days=1, hours=12)
+
+    def titles():
+        found = planner._stored_or_fetched(
+            "visitpgh", planner.VISITPGH_SCOPE, sat, sun, -1,  # TTL -1: always refetch
+            lambda: planner._visitpgh_candidates(planner.fetch_this_week_events()["events"]),
+        )
+        return [c["title"] for c in found]
+
+    assert titles() == ["Museum Night Saturday", "Saturday Jazz Brunch"]
+    get_event_store().upsert("visitpgh", planner.CRAWL_SCOPE, [_event("Crawled Saturday Fair")])
+    listing.pop(0)  # last week's listing is gone from the page
+    assert titles() == ["Saturday Jazz Brunch", "Crawled Saturday Fair"]
+
+
+def test_scraped_and_crawled_copies_of_an_event_share_one_row(monkeypatch):
+    monkeypatch.setattr(
+        planner,
+        "fetch_this_week_events",
+        lambda: {"events": [{"title": "Jazz Night Saturday", "url": "/events/jazz/"}]},
+    )
+    today = datetime.now().replace(hour=9, minute=0, second=0, microsecond=0)
+    sat = today + timedelta(days=(5 - today.weekday()) % 7 + 7)
+    sun = sat + timedelta(days=1, hours=12)
+
+    # The crawler resolves the same href and strips tracking parameters
+    planner.ingest_crawled_events(
+        [{"title": "Jazz Night Saturday", "details": "Live quartet",
+          "url": "https://WWW.visitpittsburgh.com/events/jazz/?utm_source=home"}]
+    )
+    found = planner._stored_or_fetched(
+        "visitpgh", planner.VISITPGH_SCOPE, sat, sun, 3600,
+        lambda: planner._visitpgh_candidates(planner.fetch_this_week_events()["events"]),
+    )
+    assert [c["title"] for c in found] == ["Jazz Night Saturday"]
+    assert found[0]["url"] == "https://www.visitpittsburgh.com/events/jazz/"
+    assert get_event_store().count() == 1
+
+    # Writers that skip the planner still key on the canonical URL
+    get_event_store().upsert(
+        "visitpgh", planner.CRAWL_SCOPE,
+        [_event("Jazz Night", url="https://www.visitpittsburgh.com//events/jazz/#tickets")],
+    )
+    assert get_event_store().count() == 1
+
+
+def test_ticketmaster_is_synced_per_metro_week_not_per_user(monkeypatch):
+    calls = []
+    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    sat = today + timedelta(days=(5 - today.weekday()) % 7 + 7)
+
+    def fake_tm(**kwargs):
+        calls.append(kwargs)
+        day = sat.date()
+        return {
+            "complete": True,
+            "events": [
+                {
+                    "id": "pirates",
+                    "title": "Pirates vs. Cubs",
+                    "start_local": f"{day}T19:05:00",
+                    "coordinates": {"lat": 40.4469, "lon": -80.0057},
+                },
+                {
+                    "id": "brunch",
+                    "title": "Jazz Brunch",
+                    "start_local": f"{day + timedelta(days=1)}T11:00:00",
+                    "coordinates": {"lat": 40.4469, "lon": -80.0057},
+                },
+                {
+                    "id": "erie",
+                    "title": "Erie Concert",
+                    "start_local": f"{day}T20:00:00",
+                    "coordinates": {"lat": 40.60, "lon": -80.30},
+                },
+            ],
+        }
+
+    monkeypatch.setattr(planner, "fetch_all_events_ticketmaster", fake_tm)
+    monkeypatch.setattr(planner, "fetch_this_week_events", lambda: {"events": []})
+    monkeypatch.setattr(planner, "search_food", lambda **kw: {"results": []})
+    oakland = {"lat": 40.4439, "lon": -79.9430}
+
+    def titles(start, end, origin, radius):
+        found, _, _ = planner._collect_candidates("Pittsburgh, PA", start, end, origin, radius)
+        return [c["title"] for c in found]
+
+    # Different users, windows and radii inside one week share a single metro sync
+    assert titles(sat, sat + timedelta(hours=23), oakland, 5) == ["Pirates vs. Cubs"]
+    assert titles(sat + timedelta(hours=20), sat + timedelta(hours=47), oakland, 5) == [
+        "Jazz Brunch"
+    ]
+    assert titles(sat, sat + timedelta(hours=47), None, None) == [
+        "Pirates vs. Cubs",
+        "Jazz Brunch",
+        "Erie Concert",
+    ]
+    assert len(calls) == 1
+    assert calls[0]["radius_miles"] == 30 and calls[0]["start"].weekday() == 0
+
+
+def test_ticketmaster_radius_is_exact_locally_and_rounded_up_upstream(monkeypatch):
+    calls = []
+    sat = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    sat += timedelta(days=(5 - sat.weekday()) % 7 + 7)
+    oakland = {"lat": 40.4439, "lon": -79.9430}
+
+    def fake_tm(**kwargs):
+        calls.append(kwargs)
+        return {
+            "events": [
+                {
+                    "id": "north",  # about 2.6 miles north of Oakland
+                    "title": "Northside Show",
+                    "start_local": f"{sat.date()}T19:00:00",
+                    "coordinates": {"lat": 40.4816, "lon": -79.9430},
+                }
+            ]
+        }
+
+    monkeypatch.setattr(planner, "fetch_all_events_ticketmaster", fake_tm)
+    end = sat + timedelta(hours=23)
+
+    def titles(radius):
+        found = planner._ticketmaster_events("Pittsburgh, PA", sat, end, oakland, radius)
+        return [c["title"] for c in found]
+
+    assert titles(2.9) == ["Northside Show"]  # an int() radius of 2 missed it
+    assert titles(2) == []
+
+    monkeypatch.setenv("EVENT_STORE_ENABLED", "false")
+    get_settings.cache_clear()
+    titles(0.5)
+    assert calls[-1]["radius_miles"] == 1  # Ticketmaster's API takes whole miles
+
+
+def test_ticketmaster_week_cut_off_at_the_result_cap_is_resumed(monkeypatch):
+    calls = []
+    mon = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    mon += timedelta(days=7 - mon.weekday())
+    sat = mon + timedelta(days=5)
+    downtown = {"lat": 40.4406, "lon": -79.9959}
+
+    def listed(event_id, day, hour):
+        return {
+            "id": event_id,
+            "title": event_id.title(),
+            "start_local": f"{(mon + timedelta(days=day)).date()}T{hour:02d}:00:00",
+            "coordinates": downtown,
+        }
+
+    def fake_tm(**kwargs):
+        calls.append(kwargs["start"])
+        if kwargs["start"] == mon:  # the cap cuts the listing during Thursday
+            events = [listed("opener", 0, 19), listed("recital", 3, 12)]
+            return {"complete": False, "events": events}
+        return {
+            "complete": True,
+            "events": [listed("recital", 3, 12), listed("jazz", 3, 21), listed("pirates", 5, 19)],
+        }
+
+    monkeypatch.setattr(planner, "fetch_all_events_ticketmaster", fake_tm)
+
+    def titles(start, end):
+        found = planner._ticketmaster_events("Pittsburgh, PA", start, end, None, None)
+        return sorted(c["title"] for c in found)
+
+    assert titles(sat, sat + timedelta(hours=23)) == ["Pirates"]
+    assert calls == [mon, mon + timedelta(days=3)]
+    week = titles(mon, mon + timedelta(days=6, hours=23))
+    assert week == ["Jazz", "Opener", "Pirates", "Recital"]
+    assert len(calls) == 2  # the two pieces together cover the week
@@ -0,0 +1,38 @@
+"""
+Title: Spatial Grid Index Tests
+Team: Purple Turtles — Gwen Li, Aadya Agarwal, Emma Peng, Noah Hicks
+Date: 2026-10-18
+Summary: Radius prefilter matches brute-force haversine and never drops in-range items.
+Disclaimer: This file includes AI-assisted content (GPT-5); reviewed and approved by the Purple Turtles team.
+"""
+
+import random
+
+from src.services.geo_index import GeoGridIndex, geo_cell
+from src.services.maps_client import _haversine_miles
+
+
+def test_radius_query_matches_brute_force():
+    rng = random.Random(7)
+    origin = {"lat": 40.4439, "lon": -79.9430}
+    points = [
+        {"lat": 40.44 + rng.uniform(-0.4, 0.4), "lon": -79.94 + rng.uniform(-0.5, 0.5)}
+        for _ in range(2000)
+    ]
+    index: GeoGridIndex[int] = GeoGridIndex()
+    index.extend((p, i) for i, p in enumerate(points))
+    assert len(index) == len(points)
+
+    for radius in (0.5, 2.0, 5.0, 12.0):
+        hits = {i for i, _ in index.query_radius(origin, radius)}
+        expected = {
+            i
+            for i, p in enumerate(points)
+            if _haversine_miles(origin["lat"], origin["lon"], p["lat"], p["lon"]) <= radius
+        }
+        assert hits == expected
+
+
+def test_geo_cell_is_stable_for_nearby_points():
+    assert geo_cell(40.4439, -79.9430) == geo_cell(40.4440, -79.9431)
+    assert geo_cell(40.4439, -79.9430) != geo_cell(40.5439, -79.9430)
@@ -0,0 +1,66 @@
+"""
+Title: Import-Time Budget Tests
+Team: Purple Turtles — Gwen Li, Aadya Agarwal, Emma Peng, Noah Hicks
+Date: 2026-10-18
+Summary: Importing the app (as every worker does at boot) must not load the heavy clients and
+        parsers that are only needed per request, must stay quiet, and our own modules must
+        import within a time budget measured with ``python -X importtime``.
+Disclaimer: This file includes AI-assisted content (GPT-5); reviewed and approved by the Purple Turtles team.
+"""
+
+from pathlib import Path
+import subprocess
+import sys
+from typing import Dict, Tuple
+
+from src.services.warmup import prewarm
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Loaded on first use (or by the lifespan prewarm), never by `import src.main`
+LAZY_MODULES = (
+    "httpx",
+    "httpcore",
+    "bs4",
+    "lxml.etree",
+    "jinja2",
+    "openai",
+    "src.services.crawler",
+)
+
+# Self time of src.* modules (pydantic models and settings dominate); ~0.1 s on a dev laptop
+OWN_MODULES_BUDGET_MS = 400.0
+
+
+def _importtime(module: str) -> Tuple[str, Dict[str, Tuple[int, int]]]:
+    """stdout and {module: (self_us, cumulative_us)} for a fresh interpreter importing it."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        timeout=120,
+        check=True,
+    )
+    modules: Dict[str, Tuple[int, int]] = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        own, cumulative, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = (int(own), int(cumulative))
+    return proc.stdout, modules
+
+
+def test_app_import_is_lazy_quiet_and_within_budget():
+    stdout, modules = _importtime("src.main")
+    assert "src.main" in modules
+    assert stdout == ""  # no prints on import
+    assert [m for m in LAZY_MODULES if m in modules] == []
+    own_ms = sum(own for name, (own, _) in modules.items() if name.split(".")[0] == "src") / 1000
+    assert own_ms < OWN_MODULES_BUDGET_MS, f"src.* modules took {own_ms:.0f} ms to import"
+
+
+def test_prewarm_loads_the_lazy_dependencies():
+    timings = prewarm()
+    assert set(timings) >= {"tls_context", "html_parser", "event_store"}
+    assert "httpx" in sys.modules and "lxml.etree" in sys.modules
@@ -0,0 +1,57 @@
+"""
+Title: Load Test Driver Tests
+Team: Purple Turtles — Gwen Li, Aadya Agarwal, Emma Peng, Noah Hicks
+Date: 2026-10-18
+Summary: The request mix is seeded and valid, percentiles and the scaling knee are computed as
+        documented, and (with -m loadtest) a short ladder against the local stack stays clean.
+Disclaimer: This file includes AI-assisted content (GPT-5); reviewed and approved by the Purple Turtles team.
+"""
+
+import random
+
+import pytest
+
+from loadtest.driver import (
+    choose_kind,
+    find_knee,
+    format_report,
+    local_stack,
+    make_request,
+    percentile,
+    run_ladder,
+    summarize,
+)
+from src.models.itinerary import ItineraryRequest
+
+
+def test_request_mix_is_seeded_and_valid():
+    first = [make_request(random.Random(7), choose_kind(random.Random(i))) for i in range(50)]
+    again = [make_request(random.Random(7), choose_kind(random.Random(i))) for i in range(50)]
+    assert first == again
+    assert {shape["kind"] for shape in first} >= {"itinerary_default", "options", "weather"}
+    for shape in first:
+        if shape["method"] == "POST":
+            ItineraryRequest(**shape["json"])  # bodies must pass the API's own validation
+
+
+def test_percentiles_errors_and_knee():
+    values = sorted(float(v) for v in range(1, 101))
+    assert (percentile(values, 50), percentile(values, 99), percentile([], 95)) == (50, 99, 0.0)
+
+    step = summarize([("weather", 200, 0.01), ("plan", 503, 0.03), ("plan", 0, 0.02)], 2, 1.0)
+    assert step["rps"] == 3.0 and step["error_rate"] == pytest.approx(2 / 3, abs=1e-4)
+    assert step["shed_rate"] == pytest.approx(1 / 3, abs=1e-4)
+    assert step["by_kind"]["plan"] == {"requests": 2, "errors": 2, "p95_ms": 30.0}
+
+    steps = [{"concurrency": c, "rps": r} for c, r in ((1, 10.0), (2, 19.0), (4, 20.0))]
+    assert find_knee(steps) == 2
+    assert find_knee(steps[:2]) is None
+
+
+@pytest.mark.loadtest
+def test_short_ladder_against_local_stack():
+    with local_stack(latency="*=fixed:5") as api_url:
+        steps = run_ladder(api_url, [1, 4], duration=2.0)
+    assert all(step["requests"] > 0 for step in steps)
+    assert all(step["error_rate"] == 0.0 for step in steps)
+    assert "p99 ms" in format_report(steps)
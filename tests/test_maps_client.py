@@ -2,14 +2,16 @@
 Title: Maps Client Tests
 Team: Purple Turtles — Gwen Li, Aadya Agarwal, Emma Peng, Noah Hicks
 Date: 2025-09-12
-Summary: Verifies haversine fallback works without Maps API; optional external test with key.
+Summary: Verifies haversine fallback and the shared city resolver work without Maps API;
+        optional external test with key.
 Disclaimer: This file includes AI-assisted content (GPT-5); reviewed and approved by the Purple Turtles team.
 """
 
 import os
 import pytest
 
-from src.services.maps_client import geocode_address, distance_matrix_miles
+from src.services import maps_client
+from src.services.maps_client import geocode_address, distance_matrix_miles, resolve_city
 from src.core.config import get_settings
 
 
@@ -27,6 +29,17 @@ def test_haversine_fallback_matrix():
     print("Google Maps: haversine fallback active (no API distance call) — set MAPS_API_KEY to enable external test")
 
 
+def test_resolve_city_handles_spelling_variants(monkeypatch):
+    looked_up = []
+    monkeypatch.setattr(maps_client, "geocode_address", lambda a: looked_up.append(a))
+    center = resolve_city("Pittsburgh, PA")
+    assert center == {"lat": 40.4406, "lon": -79.9959}
+    assert resolve_city("pittsburgh") == resolve_city("Pittsburgh PA 15213") == center
+    assert looked_up == []  # known cities never hit the geocoder
+    assert resolve_city("Springfield, IL") is None
+    assert looked_up == ["Springfield, IL"]
+
+
 @pytest.mark.external
 def test_geocode_with_google_key_optional():
     # Accept key from env or .env-backed settings
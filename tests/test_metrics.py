@@ -0,0 +1,162 @@
+"""
+Title: Metrics Tests
+Team: Purple Turtles — Gwen Li, Aadya Agarwal, Emma Peng, Noah Hicks
+Date: 2026-10-18
+Summary: Stage/upstream timers, cache counters, the disabled no-op path, the Prometheus
+        text served at /api/metrics, and per-request traces (Server-Timing, debug_timings).
+Disclaimer: This file includes AI-assisted content (GPT-5); reviewed and approved by the Purple Turtles team.
+"""
+
+from datetime import datetime
+
+from fastapi.testclient import TestClient
+import pytest
+
+from src.core import metrics
+from src.core.config import get_settings
+from src.main import app
+from src.services import planner
+
+
+@pytest.fixture(autouse=True)
+def _fresh_metrics():
+    metrics.reset_metrics()
+    yield
+    metrics.reset_metrics()
+
+
+def test_histogram_renders_cumulative_buckets():
+    hist = metrics.Histogram("demo_seconds", "Demo.", ("stage",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.7, 3.0):
+        hist.observe(value, 'we"ird')
+    lines = hist.samples()
+    assert lines == [
+        'demo_seconds_bucket{stage="we\\"ird",le="0.1"} 1',
+        'demo_seconds_bucket{stage="we\\"ird",le="1"} 3',
+        'demo_seconds_bucket{stage="we\\"ird",le="+Inf"} 4',
+        'demo_seconds_sum{stage="we\\"ird"} 4.25',
+        'demo_seconds_count{stage="we\\"ird"} 4',
+    ]
+
+
+def test_timers_and_counters_record_errors_and_hits():
+    with metrics.stage("weather"):
+        pass
+    with pytest.raises(RuntimeError):
+        with metrics.upstream("yelp"):
+            raise RuntimeError("boom")
+    metrics.cache_lookup("weather", True)
+    metrics.cache_lookup("weather", False)
+    metrics.cache_lookup("weather", True)
+
+    assert metrics.STAGE_SECONDS.count("weather") == 1
+    assert metrics.UPSTREAM_SECONDS.count("yelp") == 1
+    assert metrics.UPSTREAM_ERRORS.value("yelp") == 1
+    assert metrics.CACHE_LOOKUPS.value("weather", "hit") == 2
+    assert metrics.CACHE_LOOKUPS.value("weather", "miss") == 1
+
+
+def test_disabled_metrics_are_no_ops(monkeypatch):
+    monkeypatch.setenv("METRICS_ENABLED", "false")
+    get_settings.cache_clear()
+    assert metrics.stage("weather") is metrics.stage("optimize")  # shared null context
+    with metrics.upstream("yelp"):
+        pass
+    metrics.cache_lookup("weather", True)
+    assert metrics.UPSTREAM_SECONDS.count("yelp") == 0
+    assert metrics.CACHE_LOOKUPS.value("weather", "hit") == 0
+    assert TestClient(app).get("/api/metrics").status_code == 404
+
+
+def test_metrics_endpoint_reports_plan_stages(monkeypatch):
+    def boom(**kwargs):
+        with metrics.upstream("ticketmaster"):
+            raise RuntimeError("upstream down")
+
+    monkeypatch.setattr(planner, "fetch_this_week_events", lambda: {"events": []})
+    monkeypatch.setattr(planner, "search_food", lambda **kw: {"results": []})
+    monkeypatch.setattr(planner, "fetch_all_events_ticketmaster", boom)
+    monkeypatch.setattr(planner, "forecast_days", lambda city: {})
+    request = planner.ItineraryRequest(
+        city="Pittsburgh, PA",
+        start_date=datetime(2025, 9, 13, 9, 0),
+        end_date=datetime(2025, 9, 14, 21, 0),
+    )
+    planner.build_itinerary_options(request)
+
+    resp = TestClient(app).get("/api/metrics")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = resp.text
+    assert "# TYPE weekender_stage_seconds histogram" in body
+    for stage in ("weather", "visitpgh", "yelp", "ticketmaster", "gather", "optimize"):
+        assert f'weekender_stage_seconds_count{{stage="{stage}"}} 1' in body
+    assert 'weekender_upstream_errors_total{upstream="ticketmaster"} 1' in body
+    # Cold store: both VisitPgh and the Ticketmaster week miss
+    assert 'weekender_cache_lookups_total{cache="event_store",result="miss"} 2' in body
+
+
+def test_trace_spans_nest_and_keep_the_strongest_status():
+    with metrics.trace() as spans:
+        with metrics.stage("gather"):
+            with metrics.stage("weather"):
+                metrics.coalesced("weather")
+            with metrics.stage("yelp"):
+                metrics.cache_lookup("yelp_pool", True)
+                with metrics.upstream("yelp"):
+                    pass
+            with metrics.stage("optimize"):
+                pass
+    timings = {t["name"]: t for t in metrics.trace_timings(spans)}
+    assert timings["weather"]["status"] == "coalesced"
+    assert timings["yelp"]["status"] == "fetched"  # a fetch outranks a cache hit
+    assert timings["optimize"]["status"] is None
+    assert timings["gather"]["status"] == "fetched"
+    assert timings["weather"]["parent"] == "gather"
+    assert metrics.CACHE_LOOKUPS.value("weather", "coalesced") == 1
+    header = metrics.server_timing(spans, 12.0, "miss")
+    assert 'weather;dur=' in header and 'upstream.yelp;dur=' in header
+    assert header.endswith('total;dur=12.0;desc="miss"')
+
+
+def test_itinerary_responses_carry_server_timing_and_debug_timings(monkeypatch):
+    from src.api.response_cache import clear_response_cache
+
+    def pooled_food(**kwargs):
+        metrics.cache_lookup("yelp_pool", True)
+        return {"results": []}
+
+    def tm_fetch(**kwargs):
+        with metrics.upstream("ticketmaster"):
+            return {"events": [], "pages": 1, "complete": True}
+
+    monkeypatch.setattr(planner, "fetch_this_week_events", lambda: {"events": []})
+    monkeypatch.setattr(planner, "search_food", pooled_food)
+    monkeypatch.setattr(planner, "fetch_all_events_ticketmaster", tm_fetch)
+    monkeypatch.setattr(planner, "forecast_days", lambda city: {})
+    clear_response_cache()
+    client = TestClient(app)
+    payload = {
+        "city": "Pittsburgh, PA",
+        "start_date": "2031-05-10T09:00:00",
+        "end_date": "2031-05-11T21:00:00",
+    }
+
+    first = client.post("/api/itinerary/options", json=payload)
+    header = first.headers["Server-Timing"]
+    assert 'yelp;dur=' in header and 'desc="cache"' in header
+    assert 'upstream.ticketmaster;dur=' in header
+    assert header.endswith('desc="miss"')
+    assert first.json()["debug_timings"] is None
+
+    again = client.post("/api/itinerary/options", json=payload)
+    assert again.headers["X-Cache"] == "hit"
+    assert again.headers["Server-Timing"].startswith("total;dur=")
+
+    debug = client.post("/api/itinerary/options?debug_timings=true", json=payload)
+    assert debug.headers["X-Cache"] == "miss"  # debug requests bypass the response cache
+    timings = {t["name"]: t for t in debug.json()["debug_timings"]}
+    assert timings["yelp"]["status"] == "cache" and timings["yelp"]["parent"] == "gather"
+    assert timings["ticketmaster"]["status"] in ("cache", "fetched")
+    assert timings["assemble"]["ms"] >= 0
+    clear_response_cache()
@@ -0,0 +1,77 @@
+"""
+Title: Mock Upstream Tests
+Team: Purple Turtles — Gwen Li, Aadya Agarwal, Emma Peng, Noah Hicks
+Date: 2026-10-18
+Summary: Latency/fault profile parsing, injected 429/503 responses, and the real service
+        clients reaching the mock over HTTP through the base-URL settings.
+Disclaimer: This file includes AI-assisted content (GPT-5); reviewed and approved by the Purple Turtles team.
+"""
+
+import asyncio
+import random
+
+from fastapi.testclient import TestClient
+import pytest
+
+from loadtest.mock_upstream import (
+    build_profile,
+    create_app,
+    parse_latency,
+    serve_in_thread,
+    upstream_env,
+)
+from src.core.config import get_settings
+from src.services.classifier import classify_environment_batch
+from src.services.maps_client import distance_matrix_miles, geocode_address
+from src.services.ticketmaster_client import fetch_all_events_ticketmaster
+from src.services.weather_client import clear_forecast_cache, forecast_days
+from src.services.yelp_client import clear_food_cache, search_food
+
+
+def test_latency_specs_sample_in_range():
+    rnd = random.Random(3)
+    assert parse_latency("fixed:40")(rnd) == 0.04
+    assert all(0.01 <= parse_latency("uniform:10:30")(rnd) <= 0.03 for _ in range(50))
+    samples = sorted(parse_latency("lognormal:100:0.5")(rnd) for _ in range(400))
+    assert 0.08 < samples[200] < 0.12  # median near 100 ms
+    with pytest.raises(ValueError):
+        parse_latency("gamma:1")
+    with pytest.raises(ValueError):
+        build_profile("yelpp=fixed:1")
+
+
+def test_injected_throttling_and_errors():
+    profile = build_profile("*=fixed:0", errors="ticketmaster=1", throttle="yelp=1")
+    client = TestClient(create_app(profile, seed=1))
+    throttled = client.get("/yelp/v3/businesses/search")
+    assert throttled.status_code == 429 and throttled.headers["Retry-After"] == "1"
+    assert client.get("/ticketmaster/discovery/v2/events.json").status_code == 503
+    assert client.get("/openweather/data/2.5/forecast").status_code == 200
+    stats = client.get("/__stats").json()["stats"]
+    assert stats["yelp"] == {"429": 1} and stats["openweather"] == {"200": 1}
+
+
+def test_clients_reach_the_mock_through_base_url_settings(monkeypatch):
+    app = create_app(build_profile("*=fixed:5"), scale=2, seed=1)
+    with serve_in_thread(app) as base_url:
+        for key, value in upstream_env(base_url).items():
+            monkeypatch.setenv(key, value)
+        get_settings.cache_clear()
+        clear_food_cache()
+        clear_forecast_cache()
+        try:
+            assert search_food(query="dinner", location="Pittsburgh, PA")["results"]
+            events = fetch_all_events_ticketmaster(city="Pittsburgh", page_size=20)
+            assert len(events["events"]) == 48 and events["pages"] == 3
+            assert forecast_days("Pittsburgh, PA")
+            origin = geocode_address("123 Mock St, Pittsburgh, PA")
+            assert origin is not None
+            row = distance_matrix_miles([origin], [{"lat": 40.45, "lon": -79.99}])[0]
+            assert row[0]["distance_miles"] > 0
+            labels = asyncio.run(classify_environment_batch(["Quiet evening thing"]))
+            assert labels[0] in ("indoor", "outdoor")  # refined by the mock chat endpoint
+            stats = TestClient(app).get("/__stats").json()["stats"]
+            assert stats["openai"] == {"200": 1} and stats["ticketmaster"] == {"200": 3}
+        finally:
+            clear_food_cache()
+            clear_forecast_cache()
@@ -0,0 +1,144 @@
+"""
+Title: Plan Session (Snapshot Re-planning) Tests
+Team: Purple Turtles — Gwen Li, Aadya Agarwal, Emma Peng, Noah Hicks
+Date: 2026-10-18
+Summary: Verifies snapshot_id re-plans skip every upstream call and fall back when stale or
+        when they widen the radius events were fetched within, and that travel legs learned
+        while assembling reach other workers through the shared snapshot cache.
+Disclaimer: This file includes AI-assisted content (GPT-5); reviewed and approved by the Purple Turtles team.
+"""
+
+from datetime import datetime
+
+import pytest
+
+from src.core.cache import SQLiteTTLCache
+from src.models.itinerary import ItineraryRequest, Preference
+from src.services import planner, routing
+
+
+@pytest.fixture
+def upstream_calls(monkeypatch):
+    calls = {"count": 0}
+
+    def counted(result):
+        def fn(*args, **kwargs):
+            calls["count"] += 1
+            return result(*args, **kwargs) if callable(result) else result
+
+        return fn
+
+    def fake_matrix(origins, destinations):
+        return [
+            [{"distance_miles": 1.0, "duration_minutes": 4} for _ in destinations]
+            for _ in origins
+        ]
+
+    events = {
+        "events": [
+            {"title": "Museum of Art Saturday", "details": "Gallery exhibit"},
+            {"title": "Riverfront Park Festival", "details": "Outdoor market"},
+        ]
+    }
+    food = {
+        "results": [
+            {"name": "Diner A", "location": "1 Main St", "url": "a"},
+            {"name": "Bistro B", "location": "2 Main St", "url": "b"},
+        ]
+    }
+    monkeypatch.setattr(planner, "fetch_this_week_events", counted(events))
+    monkeypatch.setattr(planner, "search_food", counted(food))
+    monkeypatch.setattr(planner, "fetch_all_events_ticketmaster", counted({"events": []}))
+    monkeypatch.setattr(planner, "forecast_days", counted({}))
+    monkeypatch.setattr(
+        planner, "geocode_address", counted({"lat": 40.4439, "lon": -79.9430})
+    )
+    monkeypatch.setattr(planner, "distance_matrix_miles", counted(fake_matrix))
+    monkeypatch.setattr(routing, "distance_matrix_miles", counted(fake_matrix))
+    planner._SNAPSHOTS.clear()
+    return calls
+
+
+def _request(**overrides) -> ItineraryRequest:
+    base = dict(
+        city="Pittsburgh, PA",
+        start_date=datetime(2025, 9, 13, 9, 0),
+        end_date=datetime(2025, 9, 14, 21, 0),
+        preferences=Preference(interests=["museum"]),
+        user_address="Hamburg Hall, 4800 Forbes Ave, Pittsburgh, PA 15213",
+        max_distance_miles=5,
+    )
+    base.update(overrides)
+    return ItineraryRequest(**base)
+
+
+def test_replan_reuses_snapshot_without_upstream_calls(upstream_calls):
+    first = planner.build_itinerary_options(_request())
+    assert first.snapshot_id
+    assert upstream_calls["count"] > 0
+
+    upstream_calls["count"] = 0
+    again = planner.build_itinerary_options(
+        _request(
+            snapshot_id=first.snapshot_id,
+            preferences=Preference(interests=["festival"], environment="outdoor"),
+            max_distance_miles=3,
+        )
+    )
+    assert upstream_calls["count"] == 0
+    assert again.snapshot_id == first.snapshot_id
+    assert again.options
+    assert not any(w.startswith("snapshot_") for w in again.warnings)
+
+
+def test_snapshot_mismatch_or_unknown_rebuilds(upstream_calls):
+    first = planner.build_itinerary_options(_request())
+
+    upstream_calls["count"] = 0
+    wider = planner.build_itinerary_options(
+        _request(snapshot_id=first.snapshot_id, max_distance_miles=25)
+    )
+    assert upstream_calls["count"] > 0
+    assert "snapshot_mismatch: rebuilt from sources" in wider.warnings
+    assert wider.snapshot_id != first.snapshot_id
+
+    unknown = planner.build_itinerary_options(_request(snapshot_id="does-not-exist"))
+    assert "snapshot_expired: rebuilt from sources" in unknown.warnings
+
+
+def test_unbounded_snapshot_only_covers_the_default_event_radius(upstream_calls):
+    first = planner.build_itinerary_options(_request(max_distance_miles=None))
+
+    upstream_calls["count"] = 0
+    narrower = planner.build_itinerary_options(
+        _request(snapshot_id=first.snapshot_id, max_distance_miles=3)
+    )
+    assert upstream_calls["count"] == 0
+    assert narrower.snapshot_id == first.snapshot_id
+
+    wider = planner.build_itinerary_options(
+        _request(snapshot_id=first.snapshot_id, max_distance_miles=25)
+    )
+    assert "snapshot_mismatch: rebuilt from sources" in wider.warnings
+
+
+def test_snapshot_legs_are_written_back_not_mutated_in_place(
+    upstream_calls, monkeypatch, tmp_path
+):
+    spots = {"1 Main St": {"lat": 40.45, "lon": -79.95}, "2 Main St": {"lat": 40.46, "lon": -79.96}}
+    monkeypatch.setattr(
+        planner, "geocode_address", lambda a: spots.get(a, {"lat": 40.4439, "lon": -79.9430})
+    )
+    path = str(tmp_path / "cache.sqlite3")
+    monkeypatch.setattr(planner, "_SNAPSHOTS", SQLiteTTLCache(path, "plan_snapshot"))
+    first = planner.build_itinerary_options(_request())
+    local = planner._SNAPSHOTS.get(first.snapshot_id)
+
+    other_worker = SQLiteTTLCache(path, "plan_snapshot")
+    assert other_worker.get(first.snapshot_id)["legs"] == local["legs"] != {}
+
+    known = dict(local["legs"])
+    planner.build_itinerary_options(
+        _request(snapshot_id=first.snapshot_id, preferences=Preference(interests=["festival"]))
+    )
+    assert local["legs"] == known  # the cached object itself is never changed
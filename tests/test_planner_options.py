@@ -2,13 +2,15 @@
 Title: Planner Options Tests
 Team: Purple Turtles — Gwen Li, Aadya Agarwal, Emma Peng, Noah Hicks
 Date: 2025-09-11
-Summary: Tests for POST /api/itinerary/options, fallback behavior, and schema.
+Summary: Tests for POST /api/itinerary/options, fallback behavior, and schema; a Yelp spot
+        listed for both meals becomes one food candidate.
 Disclaimer: This file includes AI-assisted content (GPT-5); reviewed and approved by the Purple Turtles team.
 """
 
 from datetime import datetime, timedelta, UTC
 from fastapi.testclient import TestClient
 from src.main import app
+from src.services import planner
 
 
 client = TestClient(app)
@@ -45,3 +47,18 @@ def test_single_plan_endpoint_backwards_compat():
     data = resp.json()
     assert "days" in data and isinstance(data["days"], list)
 
+
+
+def test_spot_listed_for_both_meals_is_one_candidate(monkeypatch):
+    diner = {"id": "d1", "name": "All Day Diner", "meals": ["breakfast", "dinner"]}
+    cafe = {"id": "c1", "name": "Morning Cafe", "meals": ["breakfast"]}
+    bistro = {"id": "b1", "name": "Bistro", "meals": ["dinner"]}
+    results = {"breakfast": [diner, cafe], "dinner": [diner, bistro]}
+    monkeypatch.setattr(planner, "search_food", lambda query, **kw: {"results": results[query]})
+    monkeypatch.setattr(planner, "fetch_this_week_events", lambda: {"events": []})
+    monkeypatch.setattr(planner, "fetch_all_events_ticketmaster", lambda **kw: {"events": []})
+
+    start = datetime.now() + timedelta(days=7)
+    found, _, _ = planner._collect_candidates("Pittsburgh, PA", start, start + timedelta(days=1))
+    food = [c["name"] for c in found if c["category"] == "food"]
+    assert food == ["All Day Diner", "Morning Cafe", "Bistro"]
@@ -0,0 +1,86 @@
+"""
+Title: Request Profiling Tests
+Team: Purple Turtles — Gwen Li, Aadya Agarwal, Emma Peng, Noah Hicks
+Date: 2026-10-18
+Summary: The sampler attributes stacks only to threads bound to a request, the on-disk ring
+        buffer keeps the newest profiles under ids that differ across workers, and slow or
+        sampled requests show up at /api/debug/profiles (which is 404 while profiling is off).
+Disclaimer: This file includes AI-assisted content (GPT-5); reviewed and approved by the Purple Turtles team.
+"""
+
+import os
+import threading
+import time
+
+from fastapi.testclient import TestClient
+
+from src.core.config import get_settings
+from src.core.profiling import _SAMPLER, ProfileStore, RequestProfile
+
+
+def _spin(seconds: float) -> None:
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+def test_sampler_records_only_bound_threads():
+    profile = RequestProfile("GET", "/x")
+    bystander = threading.Thread(target=_spin, args=(0.3,))
+    bystander.start()
+
+    def bound() -> None:
+        profile.bind(threading.get_ident())
+        _spin(0.3)
+
+    worker = threading.Thread(target=bound)
+    _SAMPLER.start(profile)
+    worker.start()
+    worker.join()
+    _SAMPLER.stop(profile)
+    bystander.join()
+
+    assert profile.samples
+    assert all(any("bound (tests/" in frame for frame in stack) for stack in profile.samples)
+    assert "_spin (tests/test_profiling.py" in profile.top_functions()[0]["function"]
+    assert profile.folded().splitlines()[0].rsplit(" ", 1)[1].isdigit()
+
+
+def test_store_is_a_bounded_ring_buffer(tmp_path):
+    store = ProfileStore(str(tmp_path), keep=2)
+    ids = [store.save({"path": f"/p{i}", "started": 1_700_000_000 + i}) for i in range(3)]
+    assert [p["id"] for p in store.list()] == [ids[2], ids[1]]
+    assert store.get(ids[0]) is None
+    assert store.get("../../etc/passwd") is None
+
+
+def test_slow_requests_are_kept_and_served(monkeypatch, tmp_path):
+    from src.main import create_app
+
+    assert TestClient(create_app()).get("/api/debug/profiles").status_code == 404
+
+    monkeypatch.setenv("PROFILE_SLOW_MS", "0.001")
+    monkeypatch.setenv("PROFILE_INTERVAL_MS", "1")
+    monkeypatch.setenv("PROFILE_DIR", str(tmp_path))
+    get_settings.cache_clear()
+    client = TestClient(create_app())
+    assert client.get("/api/health").status_code == 200
+
+    listed = client.get("/api/debug/profiles").json()["profiles"]
+    assert len(listed) == 1  # the debug endpoint itself is never profiled
+    entry = listed[0]
+    assert (entry["path"], entry["status"], entry["reason"]) == ("/api/health", 200, "slow")
+    full = client.get(f"/api/debug/profiles/{entry['id']}").json()
+    assert full["samples"] == sum(int(line.rsplit(" ", 1)[1]) for line in
+                                  full["folded"].splitlines())
+    folded = client.get(f"/api/debug/profiles/{entry['id']}", params={"format": "folded"})
+    assert folded.headers["content-type"].startswith("text/plain")
+
+
+def test_profile_ids_from_different_workers_never_collide(tmp_path, monkeypatch):
+    record = {"path": "/p", "started": 1_700_000_000}
+    first = ProfileStore(str(tmp_path), keep=10).save(record)
+    monkeypatch.setattr(os, "getpid", lambda: 424242)
+    second = ProfileStore(str(tmp_path), keep=10).save(record)  # same ms, same counter
+    assert first != second and "-424242-" in second
+    assert {p["id"] for p in ProfileStore(str(tmp_path), keep=10).list()} == {first, second}
@@ -0,0 +1,118 @@
+"""
+Title: Itinerary Response Cache Tests
+Team: Purple Turtles — Gwen Li, Aadya Agarwal, Emma Peng, Noah Hicks
+Date: 2026-10-18
+Summary: Canonical request keys, single build per key, TTL from sources, ETag/304, and
+        rebuilds once a cached response's snapshot_id has expired.
+Disclaimer: This file includes AI-assisted content (GPT-5); reviewed and approved by the Purple Turtles team.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.api import routes
+from src.api.response_cache import _ttl_for, clear_response_cache, request_cache_key
+from src.main import app
+from src.models.itinerary import ItineraryOptionsResponse, ItineraryRequest, Preference
+from src.services import maps_client, planner
+
+
+client = TestClient(app)
+
+
+@pytest.fixture(autouse=True)
+def _fresh_response_cache():
+    clear_response_cache()
+    yield
+    clear_response_cache()
+
+
+def test_cache_key_normalizes_equivalent_requests():
+    start = datetime(2025, 9, 13, 9, 0, 12, tzinfo=timezone.utc)
+    a = ItineraryRequest(
+        city="Pittsburgh, PA",
+        start_date=start,
+        end_date=start + timedelta(days=1),
+        preferences=Preference(interests=["museums", "food"]),
+        user_address="Hamburg Hall, 4800 Forbes Ave, Pittsburgh, PA 15213",
+    )
+    b = ItineraryRequest(
+        city="pittsburgh  pa",
+        start_date=start.astimezone(timezone(timedelta(hours=-4))).replace(second=40),
+        end_date=start + timedelta(days=1),
+        preferences=Preference(interests=["Food", "museums"]),
+        user_address="hamburg hall  4800 Forbes Ave, Pittsburgh PA 15213",
+    )
+    c = a.model_copy(update={"max_distance_miles": 9})
+    assert request_cache_key("options", a) == request_cache_key("options", b)
+    assert request_cache_key("options", a) != request_cache_key("options", c)
+    assert request_cache_key("options", a) != request_cache_key("options", a, compact=True)
+
+
+def test_repeat_request_with_ungeocodable_address_never_reaches_the_geocoder(monkeypatch):
+    geocodes = []
+    monkeypatch.setattr(maps_client, "_geocode_uncached", lambda a: geocodes.append(a))
+    monkeypatch.setattr(
+        routes, "build_itinerary_options", lambda payload: ItineraryOptionsResponse(options=[])
+    )
+    body = {"city": "Pittsburgh, PA", "user_address": "Nowhere Lane 99, Atlantis"}
+    first = client.post("/api/itinerary/options", json=body)
+    second = client.post("/api/itinerary/options", json=body)
+    assert (first.headers["x-cache"], second.headers["x-cache"]) == ("miss", "hit")
+    assert geocodes == []
+
+
+def test_ttl_uses_minimum_source_ttl_and_short_ttl_when_degraded():
+    assert _ttl_for({"yelp": 3, "ticketmaster": 2}, []) == 900
+    assert _ttl_for({}, ["yelp_unavailable: boom"]) == 60
+
+
+def test_repeat_requests_hit_cache_and_support_etag(monkeypatch):
+    calls = {"n": 0}
+
+    def fake_build(payload):
+        calls["n"] += 1
+        return ItineraryOptionsResponse(options=[], used_sources={"yelp": 1})
+
+    monkeypatch.setattr(routes, "build_itinerary_options", fake_build)
+    first = client.post("/api/itinerary/options", json={"city": "Pittsburgh, PA"})
+    second = client.post("/api/itinerary/options", json={"city": "Pittsburgh, PA"})
+    assert calls["n"] == 1
+    assert first.headers["x-cache"] == "miss" and second.headers["x-cache"] == "hit"
+    etag = first.headers["etag"]
+    assert second.headers["etag"] == etag
+
+    not_modified = client.post(
+        "/api/itinerary/options",
+        json={"city": "Pittsburgh, PA"},
+        headers={"If-None-Match": etag},
+    )
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    assert calls["n"] == 1
+
+
+def test_cached_response_is_rebuilt_once_its_snapshot_expires(monkeypatch):
+    builds = []
+
+    def fake_build(payload):
+        builds.append(payload)
+        snapshot_id = f"snap-{len(builds)}"
+        planner._SNAPSHOTS.set(snapshot_id, {"candidates": []})
+        return ItineraryOptionsResponse(options=[], snapshot_id=snapshot_id)
+
+    monkeypatch.setattr(routes, "build_itinerary_options", fake_build)
+    planner._SNAPSHOTS.clear()
+    body = {"city": "Pittsburgh, PA"}
+    first = client.post("/api/itinerary/options", json=body)
+    hit = client.post("/api/itinerary/options", json=body)
+    assert hit.headers["x-cache"] == "hit"
+    assert hit.json()["snapshot_id"] == first.json()["snapshot_id"] == "snap-1"
+
+    planner._SNAPSHOTS.clear()
+    rebuilt = client.post("/api/itinerary/options", json=body)
+    assert rebuilt.headers["x-cache"] == "miss"
+    assert rebuilt.json()["snapshot_id"] == "snap-2" and planner.snapshot_available("snap-2")
+    planner._SNAPSHOTS.clear()
@@ -0,0 +1,70 @@
+"""
+Title: Response Serialization Tests
+Team: Purple Turtles — Gwen Li, Aadya Agarwal, Emma Peng, Noah Hicks
+Date: 2026-10-18
+Summary: Checks the fast JSON path, the compact (null-free) shape, and gzip negotiation.
+Disclaimer: This file includes AI-assisted content (GPT-5); reviewed and approved by the Purple Turtles team.
+"""
+
+from datetime import datetime, time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.api import routes
+from src.api.response_cache import clear_response_cache
+from src.main import app
+from src.models.itinerary import (
+    Activity,
+    DayPlan,
+    ItineraryOptionsResponse,
+    ItineraryResponse,
+)
+
+
+client = TestClient(app)
+
+
+@pytest.fixture(autouse=True)
+def _fresh_response_cache():
+    clear_response_cache()
+    yield
+    clear_response_cache()
+
+
+def _options() -> ItineraryOptionsResponse:
+    acts = [
+        Activity(name=f"Stop {i}", category="event", start_time=time(13, 0), source="visitpgh")
+        for i in range(40)
+    ]
+    plan = ItineraryResponse(
+        title="Plan 1: Pittsburgh, PA",
+        days=[DayPlan(date=datetime(2025, 9, 13, 9, 0), activities=acts)],
+    )
+    return ItineraryOptionsResponse(options=[plan], snapshot_id="abc")
+
+
+def test_options_compact_drops_nulls_and_matches_full(monkeypatch):
+    monkeypatch.setattr(routes, "build_itinerary_options", lambda payload: _options())
+
+    full = client.post("/api/itinerary/options", json={})
+    compact = client.post("/api/itinerary/options?compact=true", json={})
+    assert full.status_code == compact.status_code == 200
+    assert full.headers["content-type"] == "application/json"
+
+    full_act = full.json()["options"][0]["days"][0]["activities"][0]
+    compact_act = compact.json()["options"][0]["days"][0]["activities"][0]
+    assert full_act["address"] is None
+    assert "address" not in compact_act
+    assert {k: v for k, v in full_act.items() if v is not None} == compact_act
+    assert len(compact.content) < len(full.content)
+
+
+def test_large_responses_are_gzipped(monkeypatch):
+    monkeypatch.setattr(routes, "build_itinerary_options", lambda payload: _options())
+    resp = client.post(
+        "/api/itinerary/options", json={}, headers={"Accept-Encoding": "gzip"}
+    )
+    assert resp.status_code == 200
+    assert resp.headers.get("content-encoding") == "gzip"
+    assert resp.json()["snapshot_id"] == "abc"
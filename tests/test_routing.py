@@ -0,0 +1,110 @@
+"""
+Title: Route Sequencing Tests
+Team: Purple Turtles — Gwen Li, Aadya Agarwal, Emma Peng, Noah Hicks
+Date: 2026-10-18
+Summary: Offline checks for the per-day leg table (per-option pairs, calls batched under the
+        element limit, logged fallback) and nearest neighbor + 2-opt ordering (slot kinds, meal
+        fit, pinned stops).
+Disclaimer: This file includes AI-assisted content (GPT-5); reviewed and approved by the Purple Turtles team.
+"""
+
+import logging
+
+from src.core.config import get_settings
+from src.services import routing
+from src.services.routing import MATRIX_MAX_ELEMENTS, build_leg_table, sequence_stops
+
+
+ORIGIN = {"lat": 40.4439, "lon": -79.9430}
+
+
+def _stop(name: str, category: str, lat: float, lon: float) -> dict:
+    return {"name": name, "category": category, "coordinates": {"lat": lat, "lon": lon}}
+
+
+def test_sequence_swaps_meals_to_shorten_route(monkeypatch):
+    monkeypatch.setenv("MAPS_PROVIDER", "none")
+    get_settings.cache_clear()
+    try:
+        # Dinner spot sits next to the origin, breakfast spot next to the event
+        breakfast = _stop("Far Cafe", "food", 40.4800, -79.9430)
+        event = _stop("Museum", "event", 40.4790, -79.9430)
+        dinner = _stop("Near Bistro", "food", 40.4445, -79.9430)
+        stops = [breakfast, event, dinner]
+        legs = build_leg_table([ORIGIN] + [s["coordinates"] for s in stops])
+
+        ordered, leg_list = sequence_stops(ORIGIN, stops, legs)
+    finally:
+        get_settings.cache_clear()
+
+    assert [s["name"] for s in ordered] == ["Near Bistro", "Museum", "Far Cafe"]
+    assert [s["category"] for s in ordered] == ["food", "event", "food"]
+    assert len(leg_list) == 3 and all(leg is not None for leg in leg_list)
+    # First leg is from origin; later legs are between consecutive stops
+    assert leg_list[0]["distance_miles"] < 0.1
+    assert leg_list[2]["distance_miles"] < 0.2
+
+
+def test_sequence_keeps_pinned_and_handles_missing_coords():
+    stops = [
+        _stop("A", "food", 40.50, -79.94),
+        {"name": "No coords", "category": "event"},
+        _stop("B", "food", 40.445, -79.943),
+    ]
+    legs = build_leg_table([ORIGIN] + [s.get("coordinates") for s in stops])
+    ordered, leg_list = sequence_stops(ORIGIN, stops, legs, pinned={0})
+    assert ordered[0]["name"] == "A"
+    assert leg_list[1] is None
+
+
+def test_sequence_only_moves_meals_into_slots_they_serve(monkeypatch):
+    monkeypatch.setenv("MAPS_PROVIDER", "none")
+    get_settings.cache_clear()
+    try:
+        event = _stop("Museum", "event", 40.4790, -79.9430)
+        cafe = dict(_stop("Far Cafe", "food", 40.4800, -79.9430), meals=["breakfast"])
+        bistro = dict(_stop("Near Bistro", "food", 40.4445, -79.9430), meals=["dinner"])
+        diner = dict(_stop("Near Diner", "food", 40.4445, -79.9430),
+                     meals=["breakfast", "lunch", "dinner"])
+        points = [ORIGIN] + [s["coordinates"] for s in (cafe, event, bistro)]
+        legs = build_leg_table(points)
+        meals = ["breakfast", None, "dinner"]
+
+        # Swapping would shorten the route, but the cafe serves no dinner
+        ordered, _ = sequence_stops(ORIGIN, [cafe, event, bistro], legs, slot_meals=meals)
+        assert [s["name"] for s in ordered] == ["Far Cafe", "Museum", "Near Bistro"]
+
+        # An all-day diner and a cafe open for dinner can trade places
+        late_cafe = dict(cafe, meals=["breakfast", "dinner"])
+        ordered, _ = sequence_stops(ORIGIN, [late_cafe, event, diner], legs, slot_meals=meals)
+        assert [s["name"] for s in ordered] == ["Near Diner", "Museum", "Far Cafe"]
+    finally:
+        get_settings.cache_clear()
+
+
+def test_leg_table_batches_calls_and_skips_cross_option_pairs(monkeypatch, caplog):
+    calls = []
+
+    def fake_matrix(origins, destinations):
+        calls.append((len(origins), len(destinations)))
+        return [[{"distance_miles": 1.0, "duration_minutes": 7} for _ in destinations]
+                for _ in origins]
+
+    monkeypatch.setattr(routing, "distance_matrix_miles", fake_matrix)
+    groups = [
+        [ORIGIN] + [{"lat": 40.40 + 0.01 * plan, "lon": -79.90 - 0.01 * i} for i in range(6)]
+        for plan in range(3)
+    ]
+    legs = build_leg_table([p for g in groups for p in g], groups=groups)
+
+    assert calls and all(o * d <= MATRIX_MAX_ELEMENTS for o, d in calls)
+    assert len(legs) == 3 * 7 * 6
+    assert all(leg["duration_minutes"] == 7 for leg in legs.values())
+    cross = (routing._key(groups[0][1]), routing._key(groups[1][1]))
+    assert cross not in legs
+
+    monkeypatch.setattr(routing, "distance_matrix_miles", lambda o, d: [])
+    with caplog.at_level(logging.WARNING, logger=routing.__name__):
+        legs = build_leg_table(groups[0])
+    assert all(leg["duration_minutes"] is not None for leg in legs.values())
+    assert "42 of 42 pairs estimated" in caplog.text
@@ -2,12 +2,19 @@
 Title: VisitPittsburgh Scraper Test
 Team: Purple Turtles — Gwen Li, Aadya Agarwal, Emma Peng, Noah Hicks
 Date: 2025-09-12
-Summary: Integration test that exercises the VisitPittsburgh scraper and prints a short summary.
+Summary: Integration test that exercises the VisitPittsburgh scraper and prints a short summary,
+        plus offline checks of conditional refreshes against a saved HTML fixture.
 Disclaimer: This file includes AI-assisted content (GPT-5); reviewed and approved by the Purple Turtles team.
 
 Test Script: python -c "from src.services.visitpgh_scraper import fetch_this_week_events; import json; d=fetch_this_week_events(); print('events:', len(d.get('events', []))); print(json.dumps(d.get('events', [])[:5], indent=2))"
 """
 
+from pathlib import Path
+
+import httpx
+
+from src.core.config import get_settings
+from src.services import visitpgh_scraper as scraper
 from src.services.visitpgh_scraper import fetch_this_week_events
 
 
@@ -49,3 +56,105 @@ def test_visitpgh_scraper_print_results():
         details = e.get("details") or ""
         snippet = details[:100].replace("\n", " ")
         print(f"- {title} | {url} | {snippet}")
+
+
+FIXTURE_HTML = (Path(__file__).parent / "fixtures" / "visitpgh_this_week.html").read_text(
+    encoding="utf-8"
+)
+
+
+def test_conditional_refresh_skips_parsing_on_304(monkeypatch):
+    """Offline: validators are replayed and a 304 reuses the parsed events."""
+    seen_headers = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen_headers.append(dict(request.headers))
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(
+            200,
+            text=FIXTURE_HTML,
+            headers={"ETag": '"v1"', "Last-Modified": "Fri, 12 Sep 2025 08:00:00 GMT"},
+        )
+
+    parses = {"n": 0}
+    real_parse = scraper.parse_events_html
+
+    def counting_parse(html):
+        parses["n"] += 1
+        return real_parse(html)
+
+    monkeypatch.setattr(scraper, "parse_events_html", counting_parse)
+    monkeypatch.setenv("VISITPGH_TTL_SECONDS", "0")
+    get_settings.cache_clear()
+    scraper.reset_page_state()
+    try:
+        with httpx.Client(transport=httpx.MockTransport(handler)) as client:
+            first = fetch_this_week_events(client=client)
+            second = fetch_this_week_events(client=client)
+    finally:
+        scraper.reset_page_state()
+        get_settings.cache_clear()
+
+    assert parses["n"] == 1
+    assert first == second and first["events"]
+    assert seen_headers[1]["if-none-match"] == '"v1"'
+    assert seen_headers[1]["if-modified-since"] == "Fri, 12 Sep 2025 08:00:00 GMT"
+
+
+def test_unchanged_body_hash_skips_parsing(monkeypatch):
+    """Offline: servers without validators still avoid re-parsing identical bodies."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, text=FIXTURE_HTML)
+
+    parses = {"n": 0}
+    real_parse = scraper.parse_events_html
+
+    def counting_parse(html):
+        parses["n"] += 1
+        return real_parse(html)
+
+    monkeypatch.setattr(scraper, "parse_events_html", counting_parse)
+    monkeypatch.setenv("VISITPGH_TTL_SECONDS", "0")
+    get_settings.cache_clear()
+    scraper.reset_page_state()
+    try:
+        with httpx.Client(transport=httpx.MockTransport(handler)) as client:
+            fetch_this_week_events(client=client)
+            data = fetch_this_week_events(client=client)
+    finally:
+        scraper.reset_page_state()
+        get_settings.cache_clear()
+
+    assert parses["n"] == 1
+    assert [e["title"] for e in data["events"]][:2] == [
+        "Picklesburgh",
+        "Carnegie Museum of Art: New Exhibit",
+    ]
+
+
+def test_lxml_parser_matches_bs4_reference():
+    """Offline: the single-pass lxml parser reproduces the BeautifulSoup output exactly."""
+    events = scraper.parse_events_html(FIXTURE_HTML)
+    assert events == scraper.parse_events_html_bs4(FIXTURE_HTML)
+    assert [e["title"] for e in events] == [
+        "Picklesburgh",
+        "Carnegie Museum of Art: New Exhibit",
+        "Pittsburgh Pirates vs. Cubs",
+        "Three Rivers Arts Market",
+        "JazzNight",
+        "Phipps Conservatory Fall Flower Show",
+    ]
+
+    awkward = [
+        "",
+        "<p>no headings</p>",
+        "<h2>Outside Main Event</h2><main><h3>Inside <!-- x -->Main</h3><p>Short</p></main>"
+        "<p>Details after main count too</p><a href='/late'>late</a>",
+        "<main><h2>Unclosed <script>var a = '<p>x</p>';</h2><p>Sat 7pm downtown</p>",
+        "<main><h3><ruby>Kanji<rt>reading</rt></ruby> Fest</h3><template><p>hidden</p></template>"
+        "<span>Sat <b>Sep 13</b> all day</span><a href=''>x</a></main>",
+    ]
+    for html in awkward:
+        assert scraper.parse_events_html(html) == scraper.parse_events_html_bs4(html), html
@@ -2,7 +2,8 @@
 Title: Ticketmaster Client Tests
 Team: Purple Turtles — Gwen Li, Aadya Agarwal, Emma Peng, Noah Hicks
 Date: 2025-09-12
-Summary: Verifies behavior without an API key, and structure with a key (skipped if not set).
+Summary: Verifies behavior without an API key, offline window paging, and structure with a
+        key (skipped if not set).
 Disclaimer: This file includes AI-assisted content (GPT-5); reviewed and approved by the Purple Turtles team.
 
 Warning: This test requires a valid Ticketmaster API key to run.
@@ -15,7 +16,11 @@ from datetime import datetime, timedelta
 
 import pytest
 
-from src.services.ticketmaster_client import fetch_events_ticketmaster
+from src.services import ticketmaster_client
+from src.services.ticketmaster_client import (
+    fetch_all_events_ticketmaster,
+    fetch_events_ticketmaster,
+)
 from src.core.config import get_settings
 
 
@@ -40,6 +45,28 @@ def test_ticketmaster_no_key_returns_empty():
         get_settings.cache_clear()
 
 
+def test_fetch_all_pages_through_the_window(monkeypatch):
+    calls = []
+
+    def fake_page(size, page, **kwargs):
+        calls.append((page, size))
+        events = [{"id": f"tm{page}-{i}", "title": f"Show {page}-{i}"} for i in range(2)]
+        if page == 1:
+            events.append({"id": "tm0-0", "title": "Show 0-0"})  # repeated across pages
+        return {"events": events, "page": {"number": page, "total_pages": 3}}
+
+    monkeypatch.setattr(ticketmaster_client, "fetch_events_ticketmaster", fake_page)
+
+    data = fetch_all_events_ticketmaster(lat=40.44, lon=-80.0, page_size=2, max_pages=5)
+    assert calls == [(0, 2), (1, 2), (2, 2)]
+    assert data["pages"] == 3 and data["complete"] is True
+    assert len(data["events"]) == len({e["id"] for e in data["events"]}) == 6
+
+    calls.clear()
+    data = fetch_all_events_ticketmaster(lat=40.44, lon=-80.0, page_size=2, max_pages=2)
+    assert len(calls) == 2 and data["complete"] is False
+
+
 @pytest.mark.external
 def test_ticketmaster_with_key_smoke():
     # Accept key from either env or .env-backed settings
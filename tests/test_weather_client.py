@@ -2,18 +2,130 @@
 Title: Weather Client Tests
 Team: Purple Turtles — Gwen Li, Aadya Agarwal, Emma Peng, Noah Hicks
 Date: 2025-09-12
-Summary: Unit tests for outdoor suitability and mapping; optional external fetch with
-        clear API key status reporting.
+Summary: Unit tests for outdoor suitability, the single-pass forecast summary and the
+        coordinate-keyed forecast cache; optional external fetch with clear API key status reporting.
 Disclaimer: This file includes AI-assisted content (GPT-5); reviewed and approved by the Purple Turtles team.
 """
 
 import os
 import pytest
 
-from src.services.weather_client import outdoor_suitability, map_forecast_to_days, fetch_forecast
+from src.services import weather_client
+from src.services.weather_client import (
+    outdoor_suitability,
+    map_forecast_to_days,
+    fetch_forecast,
+    forecast_days,
+)
 from src.core.config import get_settings
 
 
+def _raw_feed():
+    # 2025-09-13 00:00 UTC .. 2025-09-14 21:00 UTC in 3-hour steps; Pittsburgh is UTC-4
+    start = 1757721600
+    rows = []
+    for i in range(16):
+        rows.append(
+            {
+                "dt": start + i * 3 * 3600,
+                "dt_txt": f"row-{i}",
+                "main": {"temp": 60 + i, "humidity": 50},
+                "wind": {"speed": 5},
+                "pop": 0.1,
+                "weather": [{"description": "clear sky" if i % 4 else "light rain"}],
+            }
+        )
+    return {"list": rows, "city": {"name": "Pittsburgh", "timezone": -4 * 3600}}
+
+
+@pytest.fixture(autouse=True)
+def _fresh_forecast_cache():
+    weather_client.clear_forecast_cache()
+    yield
+    weather_client.clear_forecast_cache()
+
+
+def _count_fetches(monkeypatch):
+    calls = []
+
+    def fake_fetch(location):
+        calls.append(location)
+        return _raw_feed()
+
+    monkeypatch.setattr(weather_client, "_fetch_raw", fake_fetch)
+    return calls
+
+
+def test_summarize_groups_rows_by_local_date():
+    dashboard, days = weather_client.summarize_forecast(_raw_feed(), "Pittsburgh, PA")
+
+    # The first two UTC rows (00:00, 03:00) fall on the previous local evening
+    assert list(days) == ["2025-09-12", "2025-09-13", "2025-09-14"]
+    assert [d["date"] for d in dashboard["daily"]] == list(days)
+    assert days["2025-09-12"]["temp_avg_f"] == 60.5
+    assert dashboard["daily"][1]["temp"] == 65.5
+    assert dashboard["daily"][1]["description"] == "clear sky"
+    assert len(dashboard["hourly"]) == 8
+    assert 0.0 <= days["2025-09-13"]["suitability"] <= 1.0
+    assert map_forecast_to_days(_raw_feed()) == days
+
+
+def test_blocks_interpolate_the_feed_and_catch_afternoon_storms():
+    raw = _raw_feed()
+    # Rows 6 and 7 are 2 PM and 5 PM local on Saturday 2025-09-13: a passing storm
+    raw["list"][6]["pop"] = raw["list"][7]["pop"] = 0.9
+    _, days = weather_client.summarize_forecast(raw, "Pittsburgh, PA")
+    saturday = days["2025-09-13"]
+    blocks = saturday["blocks"]
+
+    assert set(blocks) == {"morning", "afternoon", "evening"}
+    # 9-11 AM local sits between the 8 AM (64F) and 11 AM (65F) rows
+    assert blocks["morning"]["temp_f"] == 64.7
+    assert blocks["afternoon"]["precip_prob"] == 0.9
+    assert blocks["afternoon"]["suitability"] < 0.5 < blocks["morning"]["suitability"]
+    assert saturday["suitability"] > blocks["afternoon"]["suitability"]
+    # Friday's local rows are 8 PM and 11 PM, so only the evening block is covered
+    assert set(days["2025-09-12"]["blocks"]) == {"evening"}
+
+
+def test_dashboard_and_planner_share_one_upstream_call(monkeypatch):
+    calls = _count_fetches(monkeypatch)
+
+    dashboard = fetch_forecast("Pittsburgh, PA")
+    days = forecast_days("Pittsburgh, PA")
+    dashboard["daily"].clear()  # callers get copies, never the cached views
+
+    assert calls == [{"lat": 40.44, "lon": -80.0}]
+    assert set(days) == {d["date"] for d in fetch_forecast("Pittsburgh, PA")["daily"]}
+
+
+def test_city_spellings_share_one_forecast_by_coordinates(monkeypatch):
+    calls = _count_fetches(monkeypatch)
+
+    for city in ("Pittsburgh, PA", "pittsburgh", "Pittsburgh PA 15213"):
+        assert fetch_forecast(city)["city"] == city
+    assert len(calls) == 1
+
+    # A place nobody can geocode still works, keyed by its normalized name
+    monkeypatch.setattr(weather_client, "resolve_city", lambda city: None)
+    forecast_days("Springfield, Nowhere")
+    forecast_days("springfield nowhere")
+    assert calls[1:] == [{"q": "Springfield, Nowhere"}]
+
+
+def test_expired_forecast_is_refetched(monkeypatch):
+    calls = _count_fetches(monkeypatch)
+    monkeypatch.setenv("WEATHER_TTL_SECONDS", "0")
+    get_settings.cache_clear()
+    try:
+        forecast_days("Pittsburgh, PA")
+        forecast_days("Pittsburgh, PA")
+    finally:
+        monkeypatch.delenv("WEATHER_TTL_SECONDS")
+        get_settings.cache_clear()
+    assert len(calls) == 2
+
+
 def test_outdoor_suitability_scoring():
     good = outdoor_suitability({"temp_f": 72, "wind_mph": 5, "precip_prob": 0.05})
     bad = outdoor_suitability({"temp_f": 35, "wind_mph": 30, "precip_prob": 0.9})
@@ -63,11 +175,11 @@ def test_fetch_forecast_optional():
         if "401" in msg or "Unauthorized" in msg:
             pytest.skip("OpenWeather key present but unauthorized (401); verify key")
         raise
-    days = map_forecast_to_days(data)
+    days = forecast_days("Pittsburgh, PA")
     assert isinstance(days, dict)
     # Helpful runtime context when run with -s
-    list_count = len(data.get("list", [])) if isinstance(data, dict) else 0
-    print("OpenWeather success: fetched", list_count, "3-hour entries; days summarized:", len(days))
+    hourly_count = len(data.get("hourly", [])) if isinstance(data, dict) else 0
+    print("OpenWeather success: fetched", hourly_count, "3-hour entries; days summarized:", len(days))
     if days:
         first_day = sorted(days.keys())[0]
         sample = days[first_day]
@@ -2,7 +2,9 @@
 Title: Yelp Client Tests
 Team: Purple Turtles — Gwen Li, Aadya Agarwal, Emma Peng, Noah Hicks
 Date: 2025-09-12
-Summary: Verifies behavior requires API key and basic structure when a key is present (skipped if not set).
+Summary: Verifies behavior requires API key, offline area-pool paging, meal tags and local
+        answering of searches (meal words plus other terms, live fallback), and basic
+        structure when a key is present (skipped if not set).
 Disclaimer: This file includes AI-assisted content (GPT-5); reviewed and approved by the Purple Turtles team.
 
 Test Script: pytest -q tests/test_yelp_client.py -s
@@ -12,7 +14,87 @@ import os
 import pytest
 
 from src.core.config import get_settings
-from src.services.yelp_client import search_food
+from src.services import yelp_client
+from src.services.yelp_client import meal_tags, search_food
+
+
+def _biz(i, aliases, hours=None, price="$$"):
+    b = {
+        "id": f"b{i}",
+        "name": f"Place {i}",
+        "price": price,
+        "url": f"https://yelp.example/b{i}",
+        "categories": [{"alias": a, "title": a.replace("_", " ").title()} for a in aliases],
+        "coordinates": {"latitude": 40.44, "longitude": -79.99},
+        "location": {"display_address": [f"{i} Main St"]},
+    }
+    if hours is not None:
+        b["business_hours"] = [{"hours_type": "REGULAR", "open": hours}]
+    return b
+
+
+@pytest.fixture()
+def fake_yelp(monkeypatch):
+    calls = []
+    general = [_biz(i, ["italian"]) for i in range(120)]
+    general[3] = _biz(3, ["ramen"], price="$")
+    breakfast = [_biz(500 + i, ["breakfast_brunch"]) for i in range(10)]
+
+    def fake_page(location, term=None, categories="", limit=50, offset=0, price=None):
+        calls.append({"term": term, "categories": categories, "offset": offset})
+        if term:
+            return {"total": 1, "businesses": [_biz(900, ["tapas"])]}
+        rows = breakfast if "breakfast" in categories else general
+        return {"total": len(rows), "businesses": rows[offset : offset + limit]}
+
+    monkeypatch.setattr(yelp_client, "_search_page", fake_page)
+    yelp_client.clear_food_cache()
+    yield calls
+    yelp_client.clear_food_cache()
+
+
+def test_meal_tags_prefer_hours_over_categories():
+    assert meal_tags(_biz(1, ["breakfast_brunch"])) == ["breakfast", "lunch"]
+    assert meal_tags(_biz(2, ["italian"])) == ["lunch", "dinner"]
+    assert meal_tags(_biz(3, ["coffee"])) == ["breakfast"]
+    assert meal_tags(_biz(4, [])) == ["lunch", "dinner"]
+    # An "italian" place open 7 AM - 3 PM is a breakfast/lunch spot, not dinner
+    early = _biz(5, ["italian"], hours=[{"start": "0700", "end": "1500", "day": 5}])
+    assert meal_tags(early) == ["breakfast", "lunch"]
+    late = _biz(6, ["bars"], hours=[{"start": "1700", "end": "0200", "day": 5,
+                                      "is_overnight": True}])
+    assert meal_tags(late) == ["dinner"]
+
+
+def test_pool_pages_once_and_answers_searches_locally(fake_yelp):
+    breakfast = search_food("breakfast", "Pittsburgh, PA", limit=5)
+    dinner = search_food("dinner", "pittsburgh", limit=5)
+    ramen = search_food("ramen", "Pittsburgh PA 15213", price="1")
+
+    pool_calls = list(fake_yelp)
+    general = [c["offset"] for c in pool_calls if "breakfast" not in c["categories"]]
+    assert general == [0, 50, 100]  # paged until Yelp's total (120) was reached
+    assert len(pool_calls) == 4  # plus one breakfast-category page
+    assert len(breakfast["results"]) == len(dinner["results"]) == 5
+    assert all("breakfast" in b["meals"] for b in breakfast["results"])
+    assert all("dinner" in b["meals"] for b in dinner["results"])
+    assert [b["name"] for b in ramen["results"]] == ["Place 3"]
+
+    # Terms the pool cannot answer cost one live search, then hit its cache
+    assert search_food("tapas")["results"][0]["name"] == "Place 900"
+    assert search_food("tapas")["results"][0]["name"] == "Place 900"
+    assert [c["term"] for c in fake_yelp[len(pool_calls):]] == ["tapas"]
+
+
+def test_meal_queries_also_match_the_other_words(fake_yelp):
+    # Every pooled place serves dinner, but only Place 3 is ramen
+    assert [b["name"] for b in search_food("ramen dinner")["results"]] == ["Place 3"]
+    pool_calls = len(fake_yelp)
+
+    # No vegan breakfast place in the pool: a live search, not an empty answer
+    vegan = search_food("vegan breakfast")
+    assert [b["name"] for b in vegan["results"]] == ["Place 900"]
+    assert [c["term"] for c in fake_yelp[pool_calls:]] == ["vegan breakfast"]
 
 
 def test_yelp_requires_key_env_set_or_realistic_default():